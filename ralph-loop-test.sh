@@ -3,7 +3,11 @@
 # Generates comprehensive public report and saves for evaluation
 
 CSV_FILE="custom_export_2026-02-01_2026-02-15.csv"
-API_URL="http://localhost:8000/api/generate"
+API_BASE="http://localhost:8000"
+API_URL="$API_BASE/api/generate"
+POLL_SECONDS=${POLL_SECONDS:-10}
+JOB_DEADLINE_SECONDS=${JOB_DEADLINE_SECONDS:-7200}
+MAX_POLL_FAILURES=${MAX_POLL_FAILURES:-6}
 OUTPUT_DIR="ralph-loop-results"
 ITERATION=${1:-1}
 
@@ -15,7 +19,8 @@ LOGFILE="$OUTPUT_DIR/iteration-${ITERATION}.log"
 echo "[Ralph Loop] Iteration $ITERATION - $(date)" | tee "$LOGFILE"
 echo "[Ralph Loop] Generating comprehensive public report..." | tee -a "$LOGFILE"
 
-RESPONSE=$(curl -s -w "\n%{http_code}" \
+# Submit as a background job so a long run does not depend on the HTTP connection staying open
+SUBMIT=$(curl -s \
   -F "file=@${CSV_FILE}" \
   -F "report_type=public" \
   -F "report_format=comprehensive" \
@@ -24,8 +29,47 @@ RESPONSE=$(curl -s -w "\n%{http_code}" \
   -F "report_grouping=repository" \
   -F "repo_limit=0" \
   -F "include_individuals=true" \
+  -F "background=true" \
   "$API_URL")
 
+JOB_ID=$(echo "$SUBMIT" | python3 -c "import json, sys; print(json.load(sys.stdin).get('job_id', ''))" 2>/dev/null)
+if [ -z "$JOB_ID" ]; then
+  echo "$SUBMIT" > "$LOGFILE.error"
+  echo "[Ralph Loop] ❌ Could not submit report job" | tee -a "$LOGFILE"
+  exit 1
+fi
+echo "[Ralph Loop] Job $JOB_ID queued" | tee -a "$LOGFILE"
+
+DEADLINE=$(( $(date +%s) + JOB_DEADLINE_SECONDS ))
+POLL_FAILURES=0
+while true; do
+  STATUS=$(curl -s "$API_BASE/api/jobs/$JOB_ID" | python3 -c "
+import json, sys
+job = json.load(sys.stdin)
+print(job.get('status', 'unknown'), (job.get('progress') or {}).get('stage', ''))
+" 2>/dev/null)
+  echo "[Ralph Loop] ${STATUS:-no response}" | tee -a "$LOGFILE"
+  case "$STATUS" in
+    succeeded*|failed*|cancelled*) break ;;
+    queued*|running*) POLL_FAILURES=0 ;;
+    *)
+      # Server down, non-JSON reply or a job id it no longer knows
+      POLL_FAILURES=$((POLL_FAILURES + 1))
+      if [ "$POLL_FAILURES" -ge "$MAX_POLL_FAILURES" ]; then
+        echo "[Ralph Loop] ❌ No valid job status after $POLL_FAILURES attempts" | tee -a "$LOGFILE"
+        exit 1
+      fi
+      ;;
+  esac
+  if [ "$(date +%s)" -ge "$DEADLINE" ]; then
+    echo "[Ralph Loop] ❌ Job $JOB_ID did not finish within ${JOB_DEADLINE_SECONDS}s" | tee -a "$LOGFILE"
+    exit 1
+  fi
+  sleep "$POLL_SECONDS"
+done
+
+RESPONSE=$(curl -s -w "\n%{http_code}" "$API_BASE/api/jobs/$JOB_ID/result")
+
 HTTP_CODE=$(echo "$RESPONSE" | tail -1)
 BODY=$(echo "$RESPONSE" | sed '$d')
 
@@ -51,4 +95,5 @@ print(report)
 else
   echo "$BODY" > "$LOGFILE.error"
   echo "[Ralph Loop] ❌ Failed with HTTP $HTTP_CODE" | tee -a "$LOGFILE"
+  exit 1
 fi
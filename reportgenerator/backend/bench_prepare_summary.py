@@ -0,0 +1,64 @@
+"""
+Benchmark summarizing synthetic groups of 10k, 100k and 1M commits
+(aggregation plus prepare_summary).
+
+Usage:
+    python bench_prepare_summary.py [--sizes 10000,100000,1000000] [--repeat 3]
+
+Prints the best wall time per size and the time per commit; a flat
+per-commit column means summarizing scales linearly.
+"""
+
+import argparse
+import random
+import time
+
+from csv_ingest import CommitRecord, PRRecord
+from main import prepare_summary
+from summary_aggregates import SummaryAggregate
+
+WORDS = ["fix", "add", "refactor", "update", "remove", "bridge", "staking", "proof", "node", "docs", "test", "deploy"]
+
+
+def synthetic_group(size: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    members = [f"dev-{i}" for i in range(200)]
+    repos = [f"repo-{i}" for i in range(40)]
+    commits = [
+        CommitRecord(
+            rng.choice(repos),
+            " ".join(rng.choice(WORDS) for _ in range(6)) + f" #{rng.randrange(size)}",
+            f"{rng.getrandbits(32):08x}",
+            1769904000 + rng.randrange(14 * 86400),
+            rng.randrange(2000),
+            rng.randrange(800),
+            rng.choice(members),
+        )
+        for _ in range(size)
+    ]
+    prs = [
+        PRRecord(rng.choice(repos), f"PR {i}", str(i), rng.choice(["MERGED", "OPEN", "CLOSED"]), 1769904000, rng.choice(members))
+        for i in range(size // 20)
+    ]
+    return {"commits": commits, "prs": prs, "repos": set(repos)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'commits':>10} {'best (s)':>10} {'us/commit':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        group = synthetic_group(size)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            prepare_summary("bench", SummaryAggregate.from_records(group["commits"], group["prs"], group["repos"]))
+            best = min(best, time.perf_counter() - start)
+        print(f"{size:>10} {best:>10.3f} {best / size * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
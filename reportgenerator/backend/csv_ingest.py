@@ -0,0 +1,650 @@
+"""
+Columnar CSV ingestion for GitHub activity exports.
+
+Parses an export once into interned string tables and flat typed arrays.
+/api/generate, /api/classify, /api/verify and /api/infographic all read the
+same ActivityExport instead of re-running csv.DictReader over the upload.
+"""
+
+import codecs
+import csv
+import io
+import mmap
+import multiprocessing
+import os
+import re
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from member_identity import IdentityResolver
+
+KIND_COMMIT = 0
+KIND_PR = 1
+KIND_OTHER = 2
+
+# The only export columns ingestion reads; body, pr_title, review_state and comment_* are never touched
+PROJECTED_COLUMNS = (
+    "source",
+    "repository",
+    "timestamp",
+    "member_name",
+    "member_email",
+    "type",
+    "message",
+    "sha",
+    "title",
+    "pr_number",
+    "additions",
+    "deletions",
+    "state",
+)
+
+READ_CHUNK_SIZE = 1 << 20  # Bytes read from an upload per step when streaming
+PARALLEL_MIN_BYTES = 32 << 20  # Uploads smaller than this are parsed in-process
+PARALLEL_CHUNK_BYTES = 16 << 20  # Target size of each chunk handed to a parse worker
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+MISSING_TIMESTAMP = -1
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_MAX_CACHED_DAYS = 4096
+
+
+def parse_timestamp(timestamp: str) -> Optional[datetime]:
+    if not timestamp:
+        return None
+    try:
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    return int((value - _EPOCH).total_seconds())
+
+
+# "YYYY-MM-DD" -> epoch seconds at midnight, or None when it is not a valid fixed-layout date
+_day_epochs: Dict[str, Optional[int]] = {}
+
+
+def _day_epoch(prefix: str) -> Optional[int]:
+    if prefix in _day_epochs:
+        return _day_epochs[prefix]
+    seconds = None
+    if prefix[4] == "-" and prefix[7] == "-":
+        digits = prefix[:4] + prefix[5:7] + prefix[8:]
+        if digits.isascii() and digits.isdigit():
+            try:
+                day = datetime(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+            except ValueError:
+                pass
+            else:
+                seconds = to_epoch_seconds(day)
+    if len(_day_epochs) >= _MAX_CACHED_DAYS:
+        _day_epochs.clear()
+    _day_epochs[prefix] = seconds
+    return seconds
+
+
+def parse_epoch_seconds(timestamp: str) -> int:
+    """Parse a TIMESTAMP_FORMAT string straight to epoch seconds, MISSING_TIMESTAMP when invalid.
+
+    Exports use the fixed "YYYY-MM-DD HH:MM:SS" layout, so the date part is
+    resolved once per distinct day and the clock part is sliced; anything
+    else goes through strptime and gets the same result as parse_timestamp.
+    """
+    if len(timestamp) == 19 and timestamp[10] == " " and timestamp[13] == ":" and timestamp[16] == ":":
+        day = _day_epoch(timestamp[:10])
+        clock = timestamp[11:13] + timestamp[14:16] + timestamp[17:]
+        if day is not None and clock.isascii() and clock.isdigit():
+            hours, minutes, seconds = int(clock[:2]), int(clock[2:4]), int(clock[4:])
+            if hours < 24 and minutes < 60 and seconds < 60:
+                return day + hours * 3600 + minutes * 60 + seconds
+    parsed = parse_timestamp(timestamp)
+    return to_epoch_seconds(parsed) if parsed else MISSING_TIMESTAMP
+
+
+def from_epoch_seconds(seconds: int) -> datetime:
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def format_timestamp(seconds: int) -> str:
+    if seconds == MISSING_TIMESTAMP:
+        return ""
+    return from_epoch_seconds(seconds).strftime(TIMESTAMP_FORMAT)
+
+
+def format_day(day: int) -> str:
+    """Format an epoch day number (epoch seconds // SECONDS_PER_DAY) as YYYY-MM-DD."""
+    return from_epoch_seconds(day * SECONDS_PER_DAY).strftime("%Y-%m-%d")
+
+
+def normalize_member_identity(member_name: str, member_email: str) -> Tuple[str, str]:
+    name = (member_name or "").strip('"').strip()
+    email = (member_email or "").strip('"').strip()
+    email_local = email.split("@")[0] if "@" in email else ""
+
+    use_name = bool(name) and name.isascii() and re.search(r"[A-Za-z]", name)
+    label = name if use_name else (email_local or name)
+    member_id = (email_local or label).lower().replace(" ", "-")
+    return member_id, label
+
+
+def _parse_int(value: Optional[str]) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Record:
+    """Read-only, dict-style access (``rec["repo"]``, ``rec.get("sha")``) over slotted fields."""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class CommitRecord(_Record):
+    """One non-merge commit. Repo and member strings are shared with the export's string tables."""
+
+    __slots__ = ("repo", "message", "sha", "epoch", "additions", "deletions", "member_id")
+    _fields = ("repo", "message", "sha", "timestamp", "additions", "deletions", "member_id")
+    _field_set = frozenset(_fields)
+
+    def __init__(self, repo: str, message: str, sha: str, epoch: int, additions: int, deletions: int, member_id: str) -> None:
+        self.repo = repo
+        self.message = message
+        self.sha = sha
+        self.epoch = epoch
+        self.additions = additions
+        self.deletions = deletions
+        self.member_id = member_id
+
+    @property
+    def timestamp(self) -> str:
+        return format_timestamp(self.epoch)
+
+
+class PRRecord(_Record):
+    """One pull request."""
+
+    __slots__ = ("repo", "title", "pr_number", "state", "epoch", "member_id")
+    _fields = ("repo", "title", "pr_number", "state", "timestamp", "member_id")
+    _field_set = frozenset(_fields)
+
+    def __init__(self, repo: str, title: str, pr_number: str, state: str, epoch: int, member_id: str) -> None:
+        self.repo = repo
+        self.title = title
+        self.pr_number = pr_number
+        self.state = state
+        self.epoch = epoch
+        self.member_id = member_id
+
+    @property
+    def timestamp(self) -> str:
+        return format_timestamp(self.epoch)
+
+
+def record_json_default(value: Any) -> Any:
+    """``json.dumps`` default that turns commit/PR records into plain dicts at the response boundary."""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StringTable:
+    """Interns strings to dense integer ids."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._index[value] = idx
+            self.values.append(value)
+        return idx
+
+    def __getitem__(self, idx: int) -> str:
+        return self.values[idx]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ActivityExport:
+    """Column-oriented store of the github rows of an export, one slot per row.
+
+    Merge commits are kept as KIND_OTHER so they still register their repo,
+    member and timestamp but are never counted as commits.
+    """
+
+    def __init__(self) -> None:
+        self.repo_names = StringTable()
+        self.member_ids = StringTable()
+        self.member_names = StringTable()
+        self.states = StringTable()
+        self.members: Dict[str, Dict[str, str]] = {}
+        # (member_name, member_email) -> (member_id, label); a few dozen pairs cover thousands of rows
+        self.identities: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+        self.kind = array("b")
+        self.repo = array("i")
+        self.member = array("i")        # member_ids index, -1 when the identity is empty
+        self.member_name = array("i")   # member_names index (raw CSV value)
+        self.timestamp = array("q")     # epoch seconds, MISSING_TIMESTAMP when unparseable
+        # Maintained while rows are added so bounds and histograms never rescan the columns
+        self.min_timestamp: Optional[int] = None
+        self.max_timestamp: Optional[int] = None
+        self.day_counts: Dict[int, int] = {}  # epoch day -> rows with a timestamp
+        self.additions = array("q")
+        self.deletions = array("q")
+        self.state = array("i")
+        self.text: List[str] = []       # commit headline (first line, 200 chars) or PR title
+        self.ref: List[str] = []        # short commit sha or PR number
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def add_row(self, row: Dict[str, Optional[str]]) -> None:
+        """Add one csv.DictReader row."""
+        if row.get("source") != "github":
+            return
+        self.add_fields(*(row.get(column) for column in PROJECTED_COLUMNS[1:]))
+
+    def add_fields(
+        self,
+        raw_repo: Optional[str],
+        raw_timestamp: Optional[str],
+        raw_member_name: Optional[str],
+        raw_member_email: Optional[str],
+        entry_type: Optional[str],
+        raw_message: Optional[str],
+        raw_sha: Optional[str],
+        raw_title: Optional[str],
+        raw_pr_number: Optional[str],
+        raw_additions: Optional[str],
+        raw_deletions: Optional[str],
+        raw_state: Optional[str],
+    ) -> None:
+        """Add one github row from its projected columns, in PROJECTED_COLUMNS order after ``source``."""
+        repo = (raw_repo or "").strip('"')
+        if not repo:
+            return
+
+        epoch = parse_epoch_seconds(raw_timestamp or "")
+        member_name = (raw_member_name or "").strip('"')
+        member_email = (raw_member_email or "").strip('"')
+        identity = self.identities.get((member_name, member_email))
+        if identity is None:
+            identity = normalize_member_identity(member_name, member_email)
+            self.identities[(member_name, member_email)] = identity
+            member_id, member_label = identity
+            if member_id and member_id not in self.members:
+                self.members[member_id] = {
+                    "id": member_id,
+                    "label": member_label,
+                    "name": member_name,
+                    "email": member_email,
+                }
+        member_id = identity[0]
+
+        kind = KIND_OTHER
+        text = ""
+        ref = ""
+        if entry_type == "commit":
+            message = (raw_message or "").strip('"')
+            if not message.lower().startswith("merge "):
+                kind = KIND_COMMIT
+                text = message.split("\n")[0][:200]
+                sha = (raw_sha or "").strip('"')
+                ref = sha[:8] if sha else ""
+        elif entry_type == "pull_request":
+            kind = KIND_PR
+            text = (raw_title or "").strip('"')
+            ref = (raw_pr_number or "").strip('"')
+
+        self.kind.append(kind)
+        self.repo.append(self.repo_names.intern(repo))
+        self.member.append(self.member_ids.intern(member_id) if member_id else -1)
+        self.member_name.append(self.member_names.intern(raw_member_name or ""))
+        self.timestamp.append(epoch)
+        if epoch != MISSING_TIMESTAMP:
+            if self.min_timestamp is None or epoch < self.min_timestamp:
+                self.min_timestamp = epoch
+            if self.max_timestamp is None or epoch > self.max_timestamp:
+                self.max_timestamp = epoch
+            day = epoch // SECONDS_PER_DAY
+            self.day_counts[day] = self.day_counts.get(day, 0) + 1
+        self.additions.append(_parse_int(raw_additions) if kind == KIND_COMMIT else 0)
+        self.deletions.append(_parse_int(raw_deletions) if kind == KIND_COMMIT else 0)
+        self.state.append(self.states.intern((raw_state or "").strip('"')))
+        self.text.append(text)
+        self.ref.append(ref)
+
+    def extend(self, other: "ActivityExport") -> None:
+        """Append another export's rows, remapping its string ids into this export's tables.
+
+        Extending shard exports in file order yields the same export as parsing
+        the whole file in one pass.
+        """
+        repo_map = [self.repo_names.intern(value) for value in other.repo_names.values]
+        member_map = [self.member_ids.intern(value) for value in other.member_ids.values]
+        name_map = [self.member_names.intern(value) for value in other.member_names.values]
+        state_map = [self.states.intern(value) for value in other.states.values]
+        for member_id, info in other.members.items():
+            self.members.setdefault(member_id, info)
+        for pair, identity in other.identities.items():
+            self.identities.setdefault(pair, identity)
+
+        self.kind.extend(other.kind)
+        self.repo.extend(array("i", (repo_map[idx] for idx in other.repo)))
+        self.member.extend(array("i", (member_map[idx] if idx >= 0 else -1 for idx in other.member)))
+        self.member_name.extend(array("i", (name_map[idx] for idx in other.member_name)))
+        self.timestamp.extend(other.timestamp)
+        if other.min_timestamp is not None and other.max_timestamp is not None:
+            if self.min_timestamp is None or other.min_timestamp < self.min_timestamp:
+                self.min_timestamp = other.min_timestamp
+            if self.max_timestamp is None or other.max_timestamp > self.max_timestamp:
+                self.max_timestamp = other.max_timestamp
+            for day, count in other.day_counts.items():
+                self.day_counts[day] = self.day_counts.get(day, 0) + count
+        self.additions.extend(other.additions)
+        self.deletions.extend(other.deletions)
+        self.state.extend(array("i", (state_map[idx] for idx in other.state)))
+        self.text.extend(other.text)
+        self.ref.extend(other.ref)
+
+    def resolve_identities(self, resolver: Optional[IdentityResolver] = None) -> None:
+        """Merge member ids that are aliases of one person into its canonical id.
+
+        Runs once per export over the distinct identities, then remaps the
+        member column only if some id actually changed.
+        """
+        resolver = resolver or IdentityResolver()
+        for (member_name, member_email), (member_id, _) in self.identities.items():
+            resolver.add(member_id, member_name, member_email)
+        canonical = {member_id: resolver.canonical_id(member_id) for member_id in self.member_ids.values}
+        if all(member_id == canonical_id for member_id, canonical_id in canonical.items()):
+            return
+
+        member_ids = StringTable()
+        remap = [member_ids.intern(canonical[member_id]) for member_id in self.member_ids.values]
+        self.member_ids = member_ids
+        self.member = array("i", (remap[idx] if idx >= 0 else -1 for idx in self.member))
+        members: Dict[str, Dict[str, str]] = {}
+        for member_id, info in self.members.items():
+            canonical_id = canonical.get(member_id, member_id)
+            if canonical_id not in members:
+                members[canonical_id] = dict(info, id=canonical_id)
+        self.members = members
+        self.identities = {
+            pair: (canonical.get(member_id, member_id), label) for pair, (member_id, label) in self.identities.items()
+        }
+
+    def commit_entry(self, idx: int) -> CommitRecord:
+        member_idx = self.member[idx]
+        return CommitRecord(
+            self.repo_names[self.repo[idx]],
+            self.text[idx],
+            self.ref[idx],
+            self.timestamp[idx],
+            self.additions[idx],
+            self.deletions[idx],
+            self.member_ids[member_idx] if member_idx >= 0 else "",
+        )
+
+    def pr_entry(self, idx: int) -> PRRecord:
+        member_idx = self.member[idx]
+        return PRRecord(
+            self.repo_names[self.repo[idx]],
+            self.text[idx],
+            self.ref[idx],
+            self.states[self.state[idx]],
+            self.timestamp[idx],
+            self.member_ids[member_idx] if member_idx >= 0 else "",
+        )
+
+    def member_list(self) -> List[Dict[str, str]]:
+        return list(self.members.values())
+
+    def timestamp_bounds(self) -> List[datetime]:
+        """Return [earliest, latest] row timestamps, or [] when none parsed."""
+        if self.min_timestamp is None or self.max_timestamp is None:
+            return []
+        return [from_epoch_seconds(self.min_timestamp), from_epoch_seconds(self.max_timestamp)]
+
+    def daily_row_counts(self) -> Dict[str, int]:
+        """Return rows per YYYY-MM-DD day, in date order."""
+        return {format_day(day): count for day, count in sorted(self.day_counts.items())}
+
+    def repo_commit_counts(self) -> Dict[str, int]:
+        """Count commits with a message per repo (merge commits excluded)."""
+        counts = [0] * len(self.repo_names)
+        kind, repo, text = self.kind, self.repo, self.text
+        for i in range(len(kind)):
+            if kind[i] == KIND_COMMIT and text[i]:
+                counts[repo[i]] += 1
+        return {self.repo_names[idx]: count for idx, count in enumerate(counts) if count}
+
+    def repo_contributor_names(self) -> Dict[str, List[str]]:
+        """Return sorted raw member names per repo for commits with a message."""
+        pairs = set()
+        kind, repo, text, member_name = self.kind, self.repo, self.text, self.member_name
+        for i in range(len(kind)):
+            if kind[i] == KIND_COMMIT and text[i]:
+                pairs.add((repo[i], member_name[i]))
+        contributors: Dict[str, set] = {}
+        for repo_idx, name_idx in pairs:
+            name = self.member_names[name_idx].strip()
+            if name:
+                contributors.setdefault(self.repo_names[repo_idx], set()).add(name)
+        return {name: sorted(values) for name, values in contributors.items()}
+
+    def commit_messages_by_repo(self) -> Dict[str, List[str]]:
+        """Return commit headlines per repo in CSV order; repos without commits map to []."""
+        messages: List[List[str]] = [[] for _ in range(len(self.repo_names))]
+        kind, repo, text = self.kind, self.repo, self.text
+        for i in range(len(kind)):
+            if kind[i] == KIND_COMMIT and text[i]:
+                messages[repo[i]].append(text[i])
+        return {self.repo_names[idx]: values for idx, values in enumerate(messages)}
+
+
+def ingest_rows(rows: Iterable[Dict[str, str]]) -> ActivityExport:
+    export = ActivityExport()
+    for row in rows:
+        export.add_row(row)
+    export.resolve_identities()
+    return export
+
+
+def ingest_records(records: Iterator[List[str]], resolve_identities: bool = True) -> ActivityExport:
+    """Fold csv.reader records (header first) into an ActivityExport, reading only PROJECTED_COLUMNS.
+
+    Header positions are resolved once; non-github rows are dropped after
+    checking a single field, before any per-row object is built. Member
+    aliases are merged at the end unless ``resolve_identities`` is False
+    (shards of a parallel parse, which are resolved once merged).
+    """
+    export = ActivityExport()
+    header = next(records, None)
+    if header is None:
+        return export
+    # Later duplicates win, as with csv.DictReader
+    positions = {name: idx for idx, name in enumerate(header)}
+    if "source" not in positions:
+        return export
+    source_idx = positions["source"]
+    # Missing columns read from a position past every row, so they come back as None
+    missing = len(header) + 1
+    indices = [positions.get(column, missing) for column in PROJECTED_COLUMNS[1:]]
+    width = max(indices) + 1
+    add_fields = export.add_fields
+    for record in records:
+        if len(record) <= source_idx or record[source_idx] != "github":
+            continue
+        if len(record) < width:
+            record = record + [None] * (width - len(record))
+        add_fields(*[record[idx] for idx in indices])
+    if resolve_identities:
+        export.resolve_identities()
+    return export
+
+
+def ingest_csv(content: str) -> ActivityExport:
+    """Parse CSV text into an ActivityExport."""
+    return ingest_records(csv.reader(io.StringIO(content)))
+
+
+def iter_text_lines(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """Yield "\n"-terminated lines from a UTF-8 byte stream, decoding one chunk at a time.
+
+    Lines split exactly like iterating io.StringIO over the decoded text, so
+    quoted multi-line fields reach csv.reader intact.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        text = pending + decoder.decode(chunk, final=not chunk)
+        lines = text.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
+
+def ingest_stream(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> ActivityExport:
+    """Parse a UTF-8 CSV byte stream into an ActivityExport without loading it whole.
+
+    Rows are folded into the export as they are read, so memory is bounded by
+    the columnar export rather than by the size of the upload.
+    """
+    return ingest_records(csv.reader(iter_text_lines(stream, chunk_size)))
+
+
+def _next_record_start(buf: Any, pos: int, end: int, in_quotes: bool) -> int:
+    """Return the offset just past the first newline at or after ``pos`` that is outside quotes.
+
+    ``in_quotes`` is the quote state at ``pos``. Escaped quotes ("") flip the
+    state twice, so quote parity alone tracks whether a newline ends a record.
+    """
+    while True:
+        newline = buf.find(b"\n", pos, end)
+        if newline < 0:
+            return end
+        if buf[pos:newline].count(b'"') % 2:
+            in_quotes = not in_quotes
+        pos = newline + 1
+        if not in_quotes:
+            return pos
+
+
+def find_record_boundaries(buf: Any, start: int, end: int, chunk_bytes: int) -> List[int]:
+    """Split ``buf[start:end]`` into spans of about ``chunk_bytes`` that begin and end on record boundaries.
+
+    ``start`` must itself be a record start. Returns the span offsets, first
+    ``start`` and last ``end``.
+    """
+    bounds = [start]
+    pos = start
+    while end - pos > chunk_bytes:
+        target = pos + chunk_bytes
+        cut = _next_record_start(buf, target, end, buf[pos:target].count(b'"') % 2 == 1)
+        if cut >= end:
+            break
+        bounds.append(cut)
+        pos = cut
+    bounds.append(end)
+    return bounds
+
+
+def _ingest_span(header: bytes, data: bytes) -> ActivityExport:
+    """Worker entry point: parse one chunk of whole records under the CSV header."""
+    return ingest_records(csv.reader(io.StringIO((header + data).decode("utf-8"))), resolve_identities=False)
+
+
+def _process_context() -> Any:
+    # Never fork: uploads are parsed from a worker thread of the API server
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def ingest_stream_parallel(
+    stream: BinaryIO,
+    workers: int,
+    chunk_bytes: int = PARALLEL_CHUNK_BYTES,
+    min_bytes: int = PARALLEL_MIN_BYTES,
+) -> ActivityExport:
+    """Parse a large file-backed CSV upload on ``workers`` processes.
+
+    The file is memory-mapped and cut into chunks at record boundaries found
+    by a quote-parity scan, so quoted multi-line fields never straddle two
+    chunks. Chunks are parsed in a ProcessPoolExecutor and their exports are
+    merged in file order. Small, in-memory or single-worker uploads fall back
+    to ingest_stream.
+    """
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(0)
+    if workers <= 1 or size < min_bytes:
+        return ingest_stream(stream)
+    try:
+        stream.flush()
+        fileno = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return ingest_stream(stream)
+
+    export = ActivityExport()
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buf:
+        header_end = _next_record_start(buf, 0, size, False)
+        header = buf[:header_end]
+        bounds = find_record_boundaries(buf, header_end, size, chunk_bytes)
+        spans = list(zip(bounds, bounds[1:]))
+        if len(spans) < 2:
+            return ingest_stream(stream)
+
+        # Keep a bounded window of chunks in flight and merge results in file order
+        with ProcessPoolExecutor(max_workers=min(workers, len(spans)), mp_context=_process_context()) as pool:
+            pending: deque = deque()
+            for start, end in spans:
+                pending.append(pool.submit(_ingest_span, header, buf[start:end]))
+                if len(pending) >= 2 * workers:
+                    export.extend(pending.popleft().result())
+            while pending:
+                export.extend(pending.popleft().result())
+    export.resolve_identities()
+    return export
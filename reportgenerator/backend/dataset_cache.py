@@ -0,0 +1,89 @@
+"""
+Content-addressed cache of parsed CSV uploads.
+
+Uploads are keyed by the SHA-256 of their bytes, so the analyze -> generate ->
+verify -> classify -> infographic workflow parses a given export once. Follow-up
+requests can pass the returned dataset_id instead of re-uploading the file.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Hashable, Optional
+
+from csv_ingest import READ_CHUNK_SIZE, ActivityExport
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def stream_hash(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> str:
+    """SHA-256 of a seekable stream read in chunks; the stream is rewound afterwards."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class Dataset:
+    """An ingested export plus lazily computed views derived from it."""
+
+    def __init__(self, dataset_id: str, export: ActivityExport) -> None:
+        self.dataset_id = dataset_id
+        self.export = export
+        self._derived: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def memo(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it with ``factory`` on first use."""
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = factory()
+            return self._derived[key]
+
+
+class DatasetCache:
+    """Bounded LRU of Datasets keyed by content hash."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Dataset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_id: str) -> Optional[Dataset]:
+        with self._lock:
+            dataset = self._entries.get(dataset_id)
+            if dataset is not None:
+                self._entries.move_to_end(dataset_id)
+            return dataset
+
+    def put(self, dataset: Dataset) -> Dataset:
+        with self._lock:
+            existing = self._entries.get(dataset.dataset_id)
+            if existing is not None:
+                self._entries.move_to_end(dataset.dataset_id)
+                return existing
+            self._entries[dataset.dataset_id] = dataset
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return dataset
+
+    def get_or_ingest(self, content: bytes, ingest: Callable[[bytes], ActivityExport]) -> Dataset:
+        dataset_id = content_hash(content)
+        dataset = self.get(dataset_id)
+        if dataset is not None:
+            return dataset
+        return self.put(Dataset(dataset_id, ingest(content)))
+
+    def get_or_ingest_stream(self, stream: BinaryIO, ingest: Callable[[BinaryIO], ActivityExport]) -> Dataset:
+        """Like get_or_ingest for a seekable upload spool: hash it, then parse it only on a miss."""
+        dataset_id = stream_hash(stream)
+        dataset = self.get(dataset_id)
+        if dataset is not None:
+            return dataset
+        return self.put(Dataset(dataset_id, ingest(stream)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
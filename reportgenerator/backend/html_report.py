@@ -6,7 +6,6 @@ self-contained HTML file styled after reference-report-v2.html.
 """
 
 import base64
-import json
 import os
 import re
 from typing import Any, Dict, List, Optional
@@ -21,17 +20,11 @@ from infographic import (
     get_landscape_css,
     _build_blueprint_html,
 )
+from member_identity import GITHUB_MEMBERS
 
 
 LOGO_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tokamak-logos")
 
-# Load GitHub username mapping (member_id -> github_username)
-_GITHUB_MEMBERS_PATH = os.path.join(os.path.dirname(__file__), "github_members.json")
-try:
-    with open(_GITHUB_MEMBERS_PATH) as _f:
-        GITHUB_MEMBERS: Dict[str, str] = json.load(_f)
-except (FileNotFoundError, json.JSONDecodeError):
-    GITHUB_MEMBERS = {}
 GITHUB_ORG_URL = "https://github.com/tokamak-network"
 
 
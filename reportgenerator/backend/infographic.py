@@ -13,6 +13,8 @@ import base64
 from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from repo_routing import DEFAULT_CATEGORY, get_routing_table
+
 LOGO_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tokamak-logos")
 GITHUB_ORG_URL = "https://github.com/tokamak-network"
 
@@ -152,6 +154,9 @@ DEFAULT_DESCRIPTIONS = {
     "TokamakL2JS": "JavaScript library for Tokamak L2 interaction",
 }
 
+# Infographic routing only needs categories and descriptions
+_NO_PROJECT_REPOS = {}  # type: Dict[str, List[str]]
+
 
 def _load_logo_base64():
     # type: () -> str
@@ -173,49 +178,15 @@ def classify_repos_from_csv(
     # type: (...) -> Dict[str, List[Dict[str, Any]]]
     """Classify repos into categories. Returns {category: [{name, description, commits}]}."""
 
-    desc = dict(DEFAULT_DESCRIPTIONS)
-    if descriptions:
+    desc = DEFAULT_DESCRIPTIONS
+    if descriptions and descriptions is not DEFAULT_DESCRIPTIONS:
+        desc = dict(DEFAULT_DESCRIPTIONS)
         desc.update(descriptions)
 
-    if classification:
-        cat_map = classification
-    else:
-        cat_map = DEFAULT_CLASSIFICATION
-
-    # Build reverse map: repo -> category
-    repo_to_cat = {}  # type: Dict[str, str]
-    for cat, repos in cat_map.items():
-        for r in repos:
-            if r not in repo_to_cat:
-                repo_to_cat[r] = cat
-
-    # Classify remaining repos by name heuristics
-    for repo in repo_commits:
-        if repo in repo_to_cat:
-            continue
-        name_lower = repo.lower()
-        if any(k in name_lower for k in ("zk", "priv", "proof", "snark")):
-            repo_to_cat[repo] = "Privacy & ZK"
-        elif any(k in name_lower for k in ("stak", "ton-", "swap", "defi", "bridge", "airdrop")):
-            repo_to_cat[repo] = "DeFi & Staking"
-        elif any(k in name_lower for k in ("thanos", "rollup", "node", "geth", "l1", "fraud", "dispute")):
-            repo_to_cat[repo] = "Core Infrastructure"
-        elif any(k in name_lower for k in ("trh", "platform", "hub", "desktop")):
-            repo_to_cat[repo] = "Platform & Services"
-        elif any(k in name_lower for k in ("data", "report", "analyt", "monitor", "explorer")):
-            repo_to_cat[repo] = "Data & Analytics"
-        elif any(k in name_lower for k in ("sentinai", "ai-layer", "ai-agent", "ml", "ai-kit")):
-            repo_to_cat[repo] = "AI & Machine Learning"
-        elif any(k in name_lower for k in ("auto", "bot", "agent", "script", "tool", "cli", "setup")):
-            repo_to_cat[repo] = "Automation & Tooling"
-        elif any(k in name_lower for k in ("game", "social", "nft", "market", "tokamon", "zodiac")):
-            repo_to_cat[repo] = "Gaming & Social"
-        elif any(k in name_lower for k in ("dao", "gov", "vote", "proposal")):
-            repo_to_cat[repo] = "Governance"
-        elif any(k in name_lower for k in ("research", "paper", "doc", "learn", "study", "whitepaper")):
-            repo_to_cat[repo] = "Research & Education"
-        else:
-            repo_to_cat[repo] = "Platform & Services"
+    # Repo -> category comes from the shared routing table; explicit entries first,
+    # then name heuristics, memoized per classification. Defaults are passed as the
+    # module constants so the default table is built once.
+    routes = get_routing_table(_NO_PROJECT_REPOS, classification or DEFAULT_CLASSIFICATION, desc)
 
     # Build result — only include repos with actual commits (> 0)
     result = {cat: [] for cat in CATEGORIES}  # type: Dict[str, List[Dict[str, Any]]]
@@ -223,15 +194,15 @@ def classify_repos_from_csv(
     for repo, commits in sorted(repo_commits.items(), key=lambda x: -x[1]):
         if commits <= 0:
             continue
-        cat = repo_to_cat.get(repo, "Platform & Services")
+        cat = routes.category(repo)
         if cat not in CATEGORIES:
-            cat = "Platform & Services"
+            cat = DEFAULT_CATEGORY
         if repo in seen:
             continue
         seen.add(repo)
         result[cat].append({
             "name": repo,
-            "description": desc.get(repo, _infer_description(repo)),
+            "description": routes.description(repo) or _infer_description(repo),
             "commits": commits,
         })
 
@@ -0,0 +1,137 @@
+"""
+Persistent LLM response cache.
+
+Completed generate_with_llm responses from Tokamak are stored in SQLite,
+keyed on model + prompt hash + max_tokens + temperature (Anthropic fallback
+answers are not stored). Re-running an identical
+prompt (re-clicking "generate", the ralph-loop script) returns the stored
+text instead of calling the provider again. Entries expire after a TTL and
+the least recently used ones are evicted once the stored text exceeds a
+size budget.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_LLM_CACHE_PATH = str(Path(__file__).resolve().parent / ".llm_cache.sqlite3")
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_LLM_CACHE_MAX_MB = 200
+
+# Request-scoped bypass: endpoints set this from their ``no_cache`` form field.
+bypass_llm_cache: ContextVar[bool] = ContextVar("bypass_llm_cache", default=False)
+
+
+def llm_cache_key(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = f"{model}\0{max_tokens}\0{temperature:.3f}\0{prompt_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL and size-based LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                max_tokens INTEGER NOT NULL,
+                temperature REAL NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return response
+
+    def put(self, key: str, model: str, max_tokens: int, temperature: float, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, max_tokens, temperature, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, max_tokens, temperature, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes, "ttl_seconds": self.ttl_seconds}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, ""))
+    except (TypeError, ValueError):
+        return default
+
+
+def cache_from_env() -> Optional[LLMResponseCache]:
+    """Build the cache from LLM_CACHE_* environment variables; None when disabled."""
+    if os.environ.get("LLM_CACHE_ENABLED", "true").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    ttl = max(1, _env_int("LLM_CACHE_TTL", DEFAULT_LLM_CACHE_TTL))
+    max_mb = max(1, _env_int("LLM_CACHE_MAX_MB", DEFAULT_LLM_CACHE_MAX_MB))
+    path = os.environ.get("LLM_CACHE_PATH", "") or DEFAULT_LLM_CACHE_PATH
+    try:
+        return LLMResponseCache(path, ttl, max_mb * 1024 * 1024)
+    except sqlite3.Error as exc:
+        print(f"LLM cache disabled, could not open {path}: {exc}")
+        return None
@@ -0,0 +1,519 @@
+"""
+Process-wide LLM concurrency governor.
+
+Every upstream LLM call (sections, highlight, reviews, improve, classify,
+podcast, translation) takes a slot from its provider's limiter and from its
+model's limiter before it is sent, so concurrent reports share one budget
+instead of each opening its own burst of connections. Waiting calls are
+served round-robin across flows (one flow per HTTP request or background
+job), so a 40-section report cannot starve a single review queued behind
+it. Current usage and queue depth are exposed through ``snapshot()``.
+
+Model limits for adaptive providers (Tokamak) are not fixed: an AIMD
+controller per model grows the limit by one slot per window of healthy
+calls and halves it on 429s, 5xx responses and timeouts, so large runs
+speed up while the gateway keeps up and back off as soon as it does not.
+
+Each provider/model also has a circuit breaker. After consecutive 5xx
+responses, timeouts or connection failures it opens, and calls fail at
+once with CircuitOpenError (callers fall back to Anthropic) instead of
+each waiting out the timeout. After a cooldown a single probe call is let
+through; its success closes the circuit again. A model's alternative API
+(Tokamak's responses endpoint) has a circuit of its own, so an outage there
+falls back to chat completions on the same model.
+"""
+
+import asyncio
+import itertools
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, List, Optional, Tuple
+
+# The model default covers one comprehensive report's full fan-out (15 section
+# workers plus the highlight), so an idle server never throttles a single report
+DEFAULT_LLM_PROVIDER_CONCURRENCY = 32
+DEFAULT_LLM_MODEL_CONCURRENCY = 16
+DEFAULT_LLM_MODEL_CONCURRENCY_MAX = 32
+DEFAULT_LLM_CIRCUIT_FAILURES = 5
+DEFAULT_LLM_CIRCUIT_COOLDOWN = 30
+ADAPTIVE_PROVIDERS = ("tokamak",)
+
+# Identifies the request (or job) an LLM call belongs to, for fair queuing
+llm_flow: ContextVar[Optional[Hashable]] = ContextVar("llm_flow", default=None)
+_flow_ids = itertools.count(1)
+
+
+def new_llm_flow(prefix: str = "request") -> str:
+    flow = f"{prefix}-{next(_flow_ids)}"
+    llm_flow.set(flow)
+    return flow
+
+
+class FairLimiter:
+    """Async concurrency limit whose waiters are granted slots round-robin by flow."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+    def set_limit(self, limit: int) -> None:
+        """Change the limit; a lower limit takes effect as active calls finish."""
+        self.limit = max(1, limit)
+        self._grant()
+
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    async def acquire(self, flow: Hashable) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(flow, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled; hand the slot on
+                self.release()
+            else:
+                queue = self._waiters.get(flow)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._waiters[flow]
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        while self._waiters and self.active < self.limit:
+            flow, queue = next(iter(self._waiters.items()))
+            waiter = queue.popleft()
+            # Rotate: this flow goes to the back of the line for its next waiter
+            del self._waiters[flow]
+            if queue:
+                self._waiters[flow] = queue
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider/model whose circuit breaker is open."""
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    """True for errors that mean the upstream is failing: 5xx, timeouts and dropped connections."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    # openai.APITimeoutError / APIConnectionError, without importing the SDK here
+    return type(exc).__name__ in ("APITimeoutError", "APIConnectionError")
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for errors that mean the upstream is saturated: 429 on top of the outage errors."""
+    return getattr(exc, "status_code", None) == 429 or is_outage_error(exc)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one provider/model.
+
+    ``failure_threshold`` consecutive outage errors open it; any other
+    outcome shows the upstream is reachable and resets the count. While
+    open, ``allow()`` refuses calls until ``cooldown`` seconds have passed,
+    then admits one probe (half-open): its success closes the circuit, its
+    failure opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def allow(self) -> Tuple[bool, bool]:
+        """Return (allowed, is_probe) for a new call."""
+        if self.state == self.CLOSED:
+            return True, False
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False, False
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.probing:
+            return False, False
+        self.probing = True
+        return True, True
+
+    def record_success(self) -> bool:
+        """Reset the breaker; True if it was not closed."""
+        reopened = self.state != self.CLOSED
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+        return reopened
+
+    def record_failure(self) -> bool:
+        """Count an outage error; True if this opened the circuit."""
+        self.failures += 1
+        if self.state == self.OPEN:
+            # A call that was in flight when the circuit opened; keep the original cooldown
+            return False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probing = False
+            self.trips += 1
+            return True
+        return False
+
+    def abandon_probe(self) -> None:
+        """The probe ended without an outcome (cancelled); let the next call probe instead."""
+        if self.state == self.HALF_OPEN:
+            self.probing = False
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease concurrency window for one model.
+
+    A successful call adds 1/window (one slot per window of calls) while the
+    smoothed latency stays within ``latency_tolerance`` of the best smoothed
+    latency seen; slower calls hold the window. Latency is tracked per size
+    class (``max_tokens`` rounded up to a power of two), so a short highlight
+    call does not set the baseline that 8000-token sections are judged
+    against. An overload error multiplies
+    it by ``backoff``, once per round trip: calls that were already in flight
+    when the window was cut do not cut it again.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        maximum: int,
+        minimum: int = 1,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.window = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        # size class -> [latency EWMA, baseline], seconds
+        self.latencies: Dict[int, List[float]] = {}
+        self.last_decrease = float("-inf")
+        self.overloads = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self.window)
+
+    @staticmethod
+    def size_class(max_tokens: int) -> int:
+        """Upper bound of the power-of-two bucket holding ``max_tokens`` (0 when unknown)."""
+        return 1 << (max_tokens - 1).bit_length() if max_tokens > 0 else 0
+
+    def on_success(self, latency: float, max_tokens: int = 0) -> None:
+        stats = self.latencies.get(self.size_class(max_tokens))
+        if stats is None:
+            stats = self.latencies[self.size_class(max_tokens)] = [latency, latency]
+        else:
+            stats[0] += 0.2 * (latency - stats[0])
+            # The baseline follows improvements at once and degradations slowly
+            stats[1] = min(stats[0], stats[1] + 0.01 * (stats[0] - stats[1]))
+        if stats[0] <= stats[1] * self.latency_tolerance:
+            self.window = min(float(self.maximum), self.window + 1.0 / self.window)
+
+    def on_overload(self, started_at: float) -> bool:
+        """Record an overload error for a call started at ``started_at``; True if the window was cut."""
+        self.overloads += 1
+        if started_at < self.last_decrease:
+            return False
+        self.window = max(float(self.minimum), self.window * self.backoff)
+        self.last_decrease = time.monotonic()
+        return True
+
+
+class LLMCall:
+    """Handle yielded by ``LLMGovernor.slot``; streaming callers mark when the response started."""
+
+    __slots__ = ("started_at", "responded_at", "max_tokens")
+
+    def __init__(self, max_tokens: int = 0) -> None:
+        self.max_tokens = max_tokens
+        self.started_at = time.monotonic()
+        self.responded_at: Optional[float] = None
+
+    def responded(self) -> None:
+        if self.responded_at is None:
+            self.responded_at = time.monotonic()
+
+
+class LLMGovernor:
+    """One FairLimiter per provider and per (provider, model), per event loop.
+
+    With ``adaptive_max`` set, model limits of ``adaptive_providers`` are driven
+    by an AIMDController starting at the configured limit and capped at
+    ``adaptive_max`` (or the configured limit, if higher). With
+    ``circuit_failures`` > 0 every provider/model gets a CircuitBreaker.
+    """
+
+    def __init__(
+        self,
+        provider_limit: int,
+        model_limit: int,
+        model_limits: Optional[Dict[str, int]] = None,
+        adaptive_max: Optional[int] = DEFAULT_LLM_MODEL_CONCURRENCY_MAX,
+        adaptive_providers: Tuple[str, ...] = ADAPTIVE_PROVIDERS,
+        circuit_failures: int = DEFAULT_LLM_CIRCUIT_FAILURES,
+        circuit_cooldown: float = DEFAULT_LLM_CIRCUIT_COOLDOWN,
+    ) -> None:
+        self.provider_limit = max(1, provider_limit)
+        self.model_limit = max(1, model_limit)
+        self.model_limits = {name.lower(): max(1, value) for name, value in (model_limits or {}).items()}
+        self.adaptive_max = adaptive_max
+        self.adaptive_providers = adaptive_providers
+        self.circuit_failures = circuit_failures
+        self.circuit_cooldown = circuit_cooldown
+        # Futures belong to a loop, so limiters are per loop; entries go away with their loop
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], FairLimiter]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._controllers: Dict[Tuple[str, str], AIMDController] = {}
+        self._breakers: Dict[Tuple[str, str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _configured_limit(self, model: str) -> int:
+        return self.model_limits.get(model.lower(), self.model_limit)
+
+    def _controller(self, provider: str, model: str) -> Optional[AIMDController]:
+        # Called with self._lock held
+        if not model or self.adaptive_max is None or provider not in self.adaptive_providers:
+            return None
+        controller = self._controllers.get((provider, model))
+        if controller is None:
+            initial = self._configured_limit(model)
+            controller = AIMDController(initial, max(initial, self.adaptive_max))
+            self._controllers[(provider, model)] = controller
+        return controller
+
+    def _breaker(self, provider: str, model: str, endpoint: str) -> Optional[CircuitBreaker]:
+        # Called with self._lock held
+        if self.circuit_failures <= 0:
+            return None
+        breaker = self._breakers.get((provider, model, endpoint))
+        if breaker is None:
+            breaker = CircuitBreaker(self.circuit_failures, self.circuit_cooldown)
+            self._breakers[(provider, model, endpoint)] = breaker
+        return breaker
+
+    def model_limit_for(self, provider: str, model: str) -> int:
+        """Concurrent calls currently allowed for provider/model (the AIMD window when adaptive)."""
+        with self._lock:
+            controller = self._controller(provider, model)
+            return controller.limit if controller is not None else self._configured_limit(model)
+
+    def circuit_open(self, provider: str, model: str, endpoint: str = "") -> bool:
+        """True while calls to provider/model are being refused (open, or half-open with a probe out)."""
+        with self._lock:
+            breaker = self._breakers.get((provider, model, endpoint))
+            return breaker is not None and breaker.state != CircuitBreaker.CLOSED
+
+    def _limiter(self, provider: str, model: str) -> FairLimiter:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            limiters = self._limiters.get(loop)
+            if limiters is None:
+                limiters = self._limiters[loop] = {}
+            limiter = limiters.get((provider, model))
+            if limiter is None:
+                controller = self._controller(provider, model)
+                if controller is not None:
+                    limit = controller.limit
+                elif model:
+                    limit = self._configured_limit(model)
+                else:
+                    limit = self.provider_limit
+                limiter = FairLimiter(limit)
+                limiters[(provider, model)] = limiter
+            return limiter
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str, max_tokens: int = 0, endpoint: str = "") -> AsyncIterator[LLMCall]:
+        """Hold a provider slot and a model slot for the duration of one upstream call.
+
+        ``max_tokens`` is the call's output budget; it picks the latency
+        baseline the AIMD controller judges the call against. ``endpoint``
+        names an alternative API of the same model that can fail on its own;
+        it gets its own circuit breaker but shares the model's slots.
+
+        Raises CircuitOpenError, before or after queuing for the slots, while
+        the provider/model circuit is open. The call's outcome and latency
+        (until ``LLMCall.responded()`` or the end of the block) feed the
+        circuit breaker and the model's AIMD controller, if it has one.
+        """
+        flow = llm_flow.get()
+        name = f"{provider}/{model}" + (f" {endpoint}" if endpoint else "")
+        with self._lock:
+            breaker = self._breaker(provider, model, endpoint)
+            allowed, probe = breaker.allow() if breaker is not None else (True, False)
+        if not allowed:
+            raise CircuitOpenError(f"{name} circuit is open after repeated failures")
+        model_limiter = self._limiter(provider, model)
+        provider_limiter = self._limiter(provider, "")
+        try:
+            # Always model first, then provider, so two calls never wait on each other in reverse
+            await model_limiter.acquire(flow)
+            try:
+                await provider_limiter.acquire(flow)
+                try:
+                    if not probe and self.circuit_open(provider, model, endpoint):
+                        # The circuit opened while this call was queued
+                        raise CircuitOpenError(f"{name} circuit is open after repeated failures")
+                    call = LLMCall(max_tokens)
+                    try:
+                        yield call
+                    except Exception as exc:
+                        self._observe(provider, model, endpoint, call, exc)
+                        raise
+                    else:
+                        self._observe(provider, model, endpoint, call, None)
+                finally:
+                    provider_limiter.release()
+            finally:
+                model_limiter.release()
+        finally:
+            if probe and breaker is not None:
+                with self._lock:
+                    breaker.abandon_probe()
+
+    def _observe(self, provider: str, model: str, endpoint: str, call: LLMCall, exc: Optional[BaseException]) -> None:
+        name = f"{provider}/{model}" + (f" {endpoint}" if endpoint else "")
+        with self._lock:
+            breaker = self._breaker(provider, model, endpoint)
+            if breaker is not None:
+                if exc is not None and is_outage_error(exc):
+                    if breaker.record_failure():
+                        print(f"[LLM] {name} circuit opened after {breaker.failures} failures; "
+                              f"failing fast for {breaker.cooldown:g}s")
+                elif breaker.record_success():
+                    print(f"[LLM] {name} circuit closed")
+            controller = self._controller(provider, model)
+            if controller is None:
+                return
+            before = controller.limit
+            if exc is None:
+                controller.on_success((call.responded_at or time.monotonic()) - call.started_at, call.max_tokens)
+            elif is_overload_error(exc):
+                controller.on_overload(call.started_at)
+            limit = controller.limit
+            if limit == before:
+                return
+            limiters = [
+                limiter
+                for per_loop in self._limiters.values()
+                for key, limiter in per_loop.items()
+                if key == (provider, model)
+            ]
+        if limit < before:
+            print(f"[LLM] {provider}/{model} concurrency {before} -> {limit} after {type(exc).__name__}: {exc}")
+        for limiter in limiters:
+            limiter.set_limit(limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Active calls, queued calls and limits per provider and model."""
+        with self._lock:
+            limiters = [item for per_loop in self._limiters.values() for item in per_loop.items()]
+        usage: Dict[str, Any] = {}
+        for (provider, model), limiter in limiters:
+            name = f"{provider}/{model}" if model else provider
+            entry = usage.setdefault(name, {"active": 0, "waiting": 0, "limit": limiter.limit})
+            entry["active"] += limiter.active
+            entry["waiting"] += limiter.waiting()
+        with self._lock:
+            for (provider, model), controller in self._controllers.items():
+                entry = usage.setdefault(f"{provider}/{model}", {"active": 0, "waiting": 0, "limit": controller.limit})
+                entry["adaptive"] = {
+                    "window": round(controller.window, 2),
+                    "max": controller.maximum,
+                    "latency_ms": {
+                        f"<={size}" if size else "unsized": {"latency": round(ewma * 1000), "baseline": round(baseline * 1000)}
+                        for size, (ewma, baseline) in sorted(controller.latencies.items())
+                    },
+                    "overloads": controller.overloads,
+                }
+            for (provider, model, endpoint), breaker in self._breakers.items():
+                entry = usage.setdefault(f"{provider}/{model}", {"active": 0, "waiting": 0, "limit": self._configured_limit(model)})
+                circuit = {"state": breaker.state, "failures": breaker.failures, "trips": breaker.trips}
+                if endpoint:
+                    entry.setdefault("endpoint_circuits", {})[endpoint] = circuit
+                else:
+                    entry["circuit"] = circuit
+        return {
+            "provider_limit": self.provider_limit,
+            "model_limit": self.model_limit,
+            "queued": sum(entry["waiting"] for name, entry in usage.items() if "/" not in name),
+            "usage": usage,
+        }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, ""))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_model_limits(raw: str) -> Dict[str, int]:
+    """Parse "model=limit,model=limit"; malformed entries are ignored."""
+    limits: Dict[str, int] = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            continue
+    return {name: value for name, value in limits.items() if name}
+
+
+def governor_from_env() -> LLMGovernor:
+    adaptive = os.environ.get("LLM_ADAPTIVE_CONCURRENCY", "1").strip().lower() not in ("0", "false", "no", "off")
+    return LLMGovernor(
+        _env_int("LLM_PROVIDER_CONCURRENCY", DEFAULT_LLM_PROVIDER_CONCURRENCY),
+        _env_int("LLM_MODEL_CONCURRENCY", DEFAULT_LLM_MODEL_CONCURRENCY),
+        _parse_model_limits(os.environ.get("LLM_MODEL_CONCURRENCY_OVERRIDES", "")),
+        adaptive_max=_env_int("LLM_MODEL_CONCURRENCY_MAX", DEFAULT_LLM_MODEL_CONCURRENCY_MAX) if adaptive else None,
+        circuit_failures=_env_int("LLM_CIRCUIT_FAILURES", DEFAULT_LLM_CIRCUIT_FAILURES),
+        circuit_cooldown=max(1, _env_int("LLM_CIRCUIT_COOLDOWN", DEFAULT_LLM_CIRCUIT_COOLDOWN)),
+    )
+
+
+class LLMFlowMiddleware:
+    """ASGI middleware giving each HTTP request its own llm_flow for fair queuing."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http":
+            new_llm_flow()
+        await self.app(scope, receive, send)
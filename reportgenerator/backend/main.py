@@ -10,17 +10,37 @@ if _backend_dir not in sys.path:
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import csv
-import io
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import json
 import os
 import re
-from collections import defaultdict
-from typing import Optional, Tuple, List, Dict, Set, Any, TypedDict
+from collections import OrderedDict, defaultdict
+from typing import Optional, Tuple, List, Dict, Set, Any, TypedDict, Union, AsyncIterator, Callable, Hashable
 from datetime import datetime
 from pathlib import Path
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from contextvars import ContextVar
+
+from csv_ingest import (
+    KIND_COMMIT,
+    KIND_PR,
+    ActivityExport,
+    ingest_csv,
+    ingest_stream,
+    ingest_stream_parallel,
+    record_json_default,
+)
+from dataset_cache import Dataset, DatasetCache
+from llm_cache import LLMResponseCache, bypass_llm_cache, cache_from_env, llm_cache_key
+from infographic import DEFAULT_CLASSIFICATION
+from repo_routing import RepoRoutingTable, get_routing_table
+from llm_governor import LLMFlowMiddleware, governor_from_env, new_llm_flow
+from report_jobs import JOB_SUCCEEDED, JobQueue, JobQueueFull, job_queue_from_env
+from request_cancellation import CancelOnDisconnectMiddleware
+from stage_graph import StageGraph
+from summary_aggregates import SummaryAggregate
 
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -37,12 +57,18 @@ except ImportError:
     HAS_ANTHROPIC = False
 
 try:
-    from openai import OpenAI  # type: ignore
+    from openai import AsyncOpenAI, OpenAI  # type: ignore
     HAS_OPENAI = True
 except ImportError:
+    AsyncOpenAI = None  # type: ignore
     OpenAI = None  # type: ignore
     HAS_OPENAI = False
 
+try:
+    import httpx  # type: ignore
+except ImportError:
+    httpx = None  # type: ignore
+
 app = FastAPI(title="Biweekly Report Generator API")
 
 # CORS for Next.js frontend
@@ -59,7 +85,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the browser reuse an upload's parsed dataset on later requests
+    expose_headers=["X-Dataset-Id"],
+)
+
+# Endpoints that spend LLM calls; their work is cancelled when the client disconnects
+app.add_middleware(
+    CancelOnDisconnectMiddleware,
+    paths=[
+        "/api/generate",
+        "/api/review",
+        "/api/improve",
+        "/api/classify",
+        "/api/generate-podcast-script",
+        "/api/generate-podcast-audio",
+    ],
 )
+app.add_middleware(LLMFlowMiddleware)
 
 # Project to Repository Mapping
 PROJECT_REPOS = {
@@ -167,8 +209,17 @@ DEFAULT_TOKAMAK_BASE_URL = "https://api.ai.tokamak.network"
 DEFAULT_TOKAMAK_MODEL = "gpt-5.2-pro"
 DEFAULT_TOKAMAK_MODELS = ["gpt-5.2-pro", "gpt-5.2", "gpt-5.2-codex", "deepseek-v3.2", "deepseek-chat", "gemini-3-pro", "gemini-3-flash"]
 DEFAULT_TOKAMAK_TIMEOUT = 30
+ANTHROPIC_FALLBACK_MODEL = "claude-sonnet-4.5"
+DEFAULT_DATASET_CACHE_SIZE = 8
+DEFAULT_MODEL_COMPARE_DEADLINE = 600  # Seconds for a whole multi-model comparison
+DEFAULT_LLM_STALL_TIMEOUT = 60  # Abort a streamed completion after this many seconds without a token
+DEFAULT_TOKAMAK_API_PROBE_TTL = 3600  # Seconds before a model's responses-vs-chat choice is probed again
 MAX_AI_REPO_LIMIT = 20
 MAX_COMPREHENSIVE_REPO_LIMIT = 100  # No practical limit for comprehensive mode
+MAX_SECTION_WORKERS = 15  # Repository-section executor width for comprehensive reports
+MAX_SECTION_WORKERS_DEFAULT = 8
+MAX_TRANSLATION_WORKERS = 6  # Concurrent Korean translations per report
+LLM_POOL_SIZE = MAX_SECTION_WORKERS + 1  # Keep-alive connections per LLM client
 
 # GitHub organization URL for generating repo links
 GITHUB_ORG_URL = "https://github.com/tokamak-network"
@@ -330,6 +381,51 @@ def get_tokamak_timeout() -> int:
     return max(5, value)
 
 
+def get_dataset_cache_size() -> int:
+    raw = os.environ.get("DATASET_CACHE_SIZE", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_DATASET_CACHE_SIZE
+    return max(1, value)
+
+
+def get_csv_parse_workers() -> int:
+    raw = os.environ.get("CSV_PARSE_WORKERS", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return os.cpu_count() or 1
+    return max(1, value)
+
+
+def get_llm_stall_timeout() -> int:
+    raw = os.environ.get("LLM_STALL_TIMEOUT", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_LLM_STALL_TIMEOUT
+    return max(5, value)
+
+
+def get_tokamak_api_probe_ttl() -> int:
+    raw = os.environ.get("TOKAMAK_API_PROBE_TTL", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_TOKAMAK_API_PROBE_TTL
+    return max(60, value)
+
+
+def get_model_compare_deadline() -> int:
+    raw = os.environ.get("MODEL_COMPARE_DEADLINE", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_MODEL_COMPARE_DEADLINE
+    return max(10, value)
+
+
 def get_model_timeout(model: Optional[str]) -> int:
     base = get_tokamak_timeout()
     if not model:
@@ -509,43 +605,178 @@ def has_tokamak_client(model: Optional[str] = None) -> bool:
     return bool(selected)
 
 
-def generate_with_tokamak(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None, errors: Optional[List[str]] = None) -> Optional[str]:
+# Shared concurrency budget for every upstream LLM call in this process
+llm_governor = governor_from_env()
+
+
+# Process-wide async LLM clients keyed by (provider, base_url, api_key, event loop).
+# Each keeps one keep-alive connection pool, so sections reuse TLS sessions
+# instead of handshaking on every call. httpx async pools are bound to the loop
+# that opened them, hence the loop id in the key. Every credential set keeps its
+# own client (sections use TOKAMAK_API_KEY, podcast TTS may use OPENAI_API_KEY),
+# least recently used first out once LLM_CLIENT_CACHE_SIZE is exceeded.
+LLM_CLIENT_CACHE_SIZE = 8
+_llm_clients: "OrderedDict[Tuple[str, str, str, int], Tuple[Any, asyncio.AbstractEventLoop]]" = OrderedDict()
+_llm_clients_lock = threading.Lock()
+_llm_client_closers: Set["asyncio.Future[Any]"] = set()
+
+
+def _pooled_http_client() -> Any:
+    if httpx is None:
+        return None
+    limits = httpx.Limits(
+        # Never fewer connections than the governor lets calls run at once
+        max_connections=max(LLM_POOL_SIZE, llm_governor.provider_limit),
+        max_keepalive_connections=max(LLM_POOL_SIZE, llm_governor.provider_limit),
+        keepalive_expiry=60,
+    )
+    return httpx.AsyncClient(limits=limits)
+
+
+def _close_llm_client(client: Any, loop: asyncio.AbstractEventLoop) -> None:
+    """Close a dropped client's connection pool on the loop that owns it."""
+    close = getattr(client, "close", None)
+    if close is None or loop.is_closed():
+        return
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if loop is current:
+        closer: "asyncio.Future[Any]" = loop.create_task(close())
+        _llm_client_closers.add(closer)
+        closer.add_done_callback(_llm_client_closers.discard)
+    else:
+        asyncio.run_coroutine_threadsafe(close(), loop)
+
+
+def _get_llm_client(provider: str, base_url: str, api_key: str, factory) -> Any:
+    loop = asyncio.get_running_loop()
+    key = (provider, base_url, api_key, id(loop))
+    dropped: List[Tuple[Any, asyncio.AbstractEventLoop]] = []
+    with _llm_clients_lock:
+        entry = _llm_clients.get(key)
+        if entry is not None and entry[1] is loop:
+            _llm_clients.move_to_end(key)
+            return entry[0]
+        # Clients whose loop has been closed can never be used again (their id may even be reused)
+        for stale_key in [k for k, (_, owner) in _llm_clients.items() if owner.is_closed()]:
+            dropped.append(_llm_clients.pop(stale_key))
+        client = factory()
+        _llm_clients[key] = (client, loop)
+        while len(_llm_clients) > LLM_CLIENT_CACHE_SIZE:
+            dropped.append(_llm_clients.popitem(last=False)[1])
+    for stale_client, owner in dropped:
+        _close_llm_client(stale_client, owner)
+    return client
+
+
+async def close_llm_clients() -> None:
+    """Close every pooled client owned by the running loop (on server shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _llm_clients_lock:
+        owned = [key for key, (_, owner) in _llm_clients.items() if owner is loop]
+        clients = [_llm_clients.pop(key)[0] for key in owned]
+    for client in clients:
+        close = getattr(client, "close", None)
+        if close is not None:
+            await close()
+
+
+def get_openai_client(base_url: str, api_key: str) -> Any:
+    # No client-wide timeout: Tokamak calls pass their own, TTS keeps the SDK default
+    return _get_llm_client(
+        "openai",
+        base_url,
+        api_key,
+        lambda: AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=_pooled_http_client()),
+    )
+
+
+def get_anthropic_client(api_key: str) -> Any:
+    return _get_llm_client(
+        "anthropic",
+        "",
+        api_key,
+        lambda: anthropic.AsyncAnthropic(api_key=api_key, http_client=_pooled_http_client()),
+    )
+
+
+TOKAMAK_RESPONSES_API = "responses"
+TOKAMAK_CHAT_API = "chat"
+
+# Which API each gpt-5.2 model last answered on: model -> (api, recorded_at).
+# A model whose gateway rejects the responses API goes straight to chat
+# completions until its entry is older than TOKAMAK_API_PROBE_TTL, when the
+# responses API is probed again.
+_tokamak_api_capabilities: Dict[str, Tuple[str, float]] = {}
+
+
+def uses_responses_api(model: str) -> bool:
+    if not model.startswith("gpt-5.2"):
+        return False
+    entry = _tokamak_api_capabilities.get(model)
+    if entry is None:
+        return True
+    api, recorded_at = entry
+    if time.monotonic() - recorded_at >= get_tokamak_api_probe_ttl():
+        _tokamak_api_capabilities.pop(model, None)
+        return True
+    return api == TOKAMAK_RESPONSES_API
+
+
+def record_tokamak_api(model: str, api: str) -> None:
+    previous = _tokamak_api_capabilities.get(model)
+    if previous is None or previous[0] != api:
+        print(f"[LLM] {model} answers on the {api} API")
+    _tokamak_api_capabilities[model] = (api, time.monotonic())
+
+
+async def generate_with_tokamak(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None, errors: Optional[List[str]] = None) -> Optional[str]:
     if not has_tokamak_client(model) or OpenAI is None:
         if errors is not None:
             errors.append("Tokamak client not available (missing API key or openai package)")
         return None
     selected_model = model or get_tokamak_model()
     timeout = timeout_override or get_model_timeout(selected_model)
-    client = OpenAI(base_url=get_tokamak_base_url(), api_key=get_tokamak_api_key(), timeout=timeout)
-    # Try responses API for gpt-5.2 first, fall back to chat completions
-    if selected_model.startswith("gpt-5.2"):
+    client = get_openai_client(get_tokamak_base_url(), get_tokamak_api_key())
+    # Try responses API for gpt-5.2 first (unless it is known not to work), fall back to chat completions.
+    # The responses endpoint has its own circuit, so an outage there still falls back to chat.
+    responses_failed = False
+    if uses_responses_api(selected_model):
         try:
             responses = getattr(client, "responses", None)
             if responses is not None:
-                response = responses.create(
-                    model=selected_model,
-                    input=prompt,
-                    max_output_tokens=max_tokens,
-                    temperature=get_model_temperature(selected_model),
-                    timeout=timeout,
-                )
+                async with llm_governor.slot("tokamak", selected_model, max_tokens, TOKAMAK_RESPONSES_API):
+                    response = await responses.create(
+                        model=selected_model,
+                        input=prompt,
+                        max_output_tokens=max_tokens,
+                        temperature=get_model_temperature(selected_model),
+                        timeout=timeout,
+                    )
                 text = getattr(response, "output_text", "")
                 if text:
+                    record_tokamak_api(selected_model, TOKAMAK_RESPONSES_API)
                     return text.strip()
         except Exception as exc:
-            print(f"Tokamak responses API failed for {selected_model}, trying chat completions: {exc}")
             if errors is not None:
                 errors.append(f"Tokamak responses API ({selected_model}): {exc}")
+            responses_failed = True
+            print(f"Tokamak responses API failed for {selected_model}, trying chat completions: {exc}")
 
     try:
         temperature = get_model_temperature(selected_model)
-        response = client.chat.completions.create(
-            model=selected_model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=temperature,
-            timeout=timeout,
-        )
+        async with llm_governor.slot("tokamak", selected_model, max_tokens):
+            response = await client.chat.completions.create(
+                model=selected_model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+            )
+        if responses_failed:
+            record_tokamak_api(selected_model, TOKAMAK_CHAT_API)
         content = response.choices[0].message.content if response.choices else None
         return content.strip() if content else None
     except Exception as exc:
@@ -555,18 +786,105 @@ def generate_with_tokamak(prompt: str, max_tokens: int, model: Optional[str] = N
         return None
 
 
-def generate_with_anthropic(prompt: str, max_tokens: int, errors: Optional[List[str]] = None) -> Optional[str]:
+class LLMStreamError(RuntimeError):
+    """A streamed completion failed or stalled after some tokens were already yielded."""
+
+
+# When set, generate_with_llm streams the completion and passes each text delta here
+llm_token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("llm_token_sink", default=None)
+# Called with the reason when a stream fails midway, so the consumer can discard the deltas it has seen
+llm_token_reset: ContextVar[Optional[Callable[[str], None]]] = ContextVar("llm_token_reset", default=None)
+
+
+async def _iter_with_stall_timeout(stream: Any, stall_timeout: int) -> AsyncIterator[Any]:
+    iterator = stream.__aiter__()
+    while True:
+        try:
+            item = await asyncio.wait_for(iterator.__anext__(), stall_timeout)
+        except StopAsyncIteration:
+            return
+        yield item
+
+
+async def stream_with_tokamak(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None) -> AsyncIterator[str]:
+    """Yield completion text deltas from Tokamak as they arrive.
+
+    Raises asyncio.TimeoutError when no token arrives for LLM_STALL_TIMEOUT
+    seconds, so stalled generations end early instead of running out the
+    request timeout. Yields nothing when no client is configured.
+    """
+    if not has_tokamak_client(model) or AsyncOpenAI is None:
+        return
+    selected_model = model or get_tokamak_model()
+    timeout = timeout_override or get_model_timeout(selected_model)
+    stall_timeout = get_llm_stall_timeout()
+    temperature = get_model_temperature(selected_model)
+    client = get_openai_client(get_tokamak_base_url(), get_tokamak_api_key())
+    yielded = False
+    responses_failed = False
+    # Try responses API for gpt-5.2 first (unless it is known not to work), fall back to chat completions
+    if uses_responses_api(selected_model) and getattr(client, "responses", None) is not None:
+        try:
+            async with llm_governor.slot("tokamak", selected_model, max_tokens, TOKAMAK_RESPONSES_API) as call:
+                stream = await asyncio.wait_for(
+                    client.responses.create(
+                        model=selected_model,
+                        input=prompt,
+                        max_output_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=timeout,
+                        stream=True,
+                    ),
+                    stall_timeout,
+                )
+                call.responded()
+                async for event in _iter_with_stall_timeout(stream, stall_timeout):
+                    if getattr(event, "type", "") == "response.output_text.delta" and event.delta:
+                        yielded = True
+                        yield event.delta
+            if yielded:
+                record_tokamak_api(selected_model, TOKAMAK_RESPONSES_API)
+                return
+        except Exception as exc:
+            if yielded:
+                raise
+            responses_failed = True
+            print(f"Tokamak responses stream failed for {selected_model}, trying chat completions: {exc}")
+
+    async with llm_governor.slot("tokamak", selected_model, max_tokens) as call:
+        stream = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=selected_model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+                stream=True,
+            ),
+            stall_timeout,
+        )
+        call.responded()
+        if responses_failed:
+            record_tokamak_api(selected_model, TOKAMAK_CHAT_API)
+        async for chunk in _iter_with_stall_timeout(stream, stall_timeout):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+
+async def generate_with_anthropic(prompt: str, max_tokens: int, errors: Optional[List[str]] = None) -> Optional[str]:
     if not HAS_ANTHROPIC or not os.environ.get('ANTHROPIC_API_KEY') or anthropic is None:
         if errors is not None:
             errors.append("Anthropic client not available (missing API key or anthropic package)")
         return None
-    client = anthropic.Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY'))
+    client = get_anthropic_client(os.environ.get('ANTHROPIC_API_KEY', ''))
     try:
-        response = client.messages.create(
-            model="claude-sonnet-4.5",
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        async with llm_governor.slot("anthropic", ANTHROPIC_FALLBACK_MODEL, max_tokens):
+            response = await client.messages.create(
+                model=ANTHROPIC_FALLBACK_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
         text = getattr(response.content[0], "text", "").strip()
         return text or None
     except Exception as exc:
@@ -575,147 +893,182 @@ def generate_with_anthropic(prompt: str, max_tokens: int, errors: Optional[List[
         return None
 
 
-def generate_with_llm(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None, errors: Optional[List[str]] = None) -> Optional[str]:
-    tokamak_response = generate_with_tokamak(prompt, max_tokens, model, timeout_override, errors)
-    if tokamak_response:
-        return tokamak_response
-    anthropic_response = generate_with_anthropic(prompt, max_tokens, errors)
-    if anthropic_response:
-        return anthropic_response
-    return None
+_llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_loaded = False
+_llm_response_cache_lock = threading.Lock()
 
 
-def get_project_for_repo(repo_name: str) -> Optional[str]:
-    for project, repos in PROJECT_REPOS.items():
-        if repo_name in repos:
-            return project
-    return None
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    global _llm_response_cache, _llm_response_cache_loaded
+    with _llm_response_cache_lock:
+        if not _llm_response_cache_loaded:
+            _llm_response_cache = cache_from_env()
+            _llm_response_cache_loaded = True
+        return _llm_response_cache
 
 
-def parse_timestamp(timestamp: str) -> Optional[datetime]:
-    if not timestamp:
-        return None
-    try:
-        return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-    except ValueError:
-        return None
+async def _llm_cache_lookup(prompt: str, max_tokens: int, model: Optional[str], use_cache: Optional[bool]) -> Tuple[Optional[LLMResponseCache], Optional[str], str, float, Optional[str]]:
+    """Return (cache, key, model, temperature, cached response) for a prompt.
 
+    SQLite access runs in a worker thread so concurrent sections do not block
+    the event loop on disk I/O.
+    """
+    cache = get_llm_response_cache()
+    selected_model = model or get_tokamak_model()
+    temperature = get_model_temperature(selected_model)
+    if cache is None:
+        return None, None, selected_model, temperature, None
+    cache_key = llm_cache_key(selected_model, prompt, max_tokens, temperature)
+    if use_cache is None:
+        use_cache = not bypass_llm_cache.get()
+    cached = await asyncio.to_thread(cache.get, cache_key) if use_cache else None
+    return cache, cache_key, selected_model, temperature, cached
+
+
+async def generate_with_llm(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None, errors: Optional[List[str]] = None, use_cache: Optional[bool] = None) -> Optional[str]:
+    """Generate text with Tokamak, falling back to Anthropic.
+
+    Responses are served from the persistent LLM cache when possible. ``use_cache``
+    defaults to the request-scoped ``bypass_llm_cache`` flag; a bypassed call
+    still stores its fresh response. Only Tokamak responses are stored: the
+    cache key names the requested Tokamak model, and an Anthropic fallback
+    answer must not be served later as that model's output.
+
+    When ``llm_token_sink`` is set the completion is streamed into it. If the
+    stream fails after deltas were delivered, ``llm_token_reset`` is called,
+    the prompt is retried without streaming (Tokamak, then Anthropic) and
+    the retried text is passed to the sink as a single delta.
+    """
+    sink = llm_token_sink.get()
+    if sink is not None:
+        chunks: List[str] = []
+        try:
+            async for delta in stream_with_llm(prompt, max_tokens, model, timeout_override, errors, use_cache):
+                chunks.append(delta)
+                sink(delta)
+        except LLMStreamError as exc:
+            reset = llm_token_reset.get()
+            if reset is not None:
+                reset(str(exc))
+            response = await _generate_without_stream(prompt, max_tokens, model, timeout_override, errors, use_cache)
+            if response:
+                sink(response)
+            return response
+        return "".join(chunks).strip() or None
+    return await _generate_without_stream(prompt, max_tokens, model, timeout_override, errors, use_cache)
+
+
+async def _generate_without_stream(prompt: str, max_tokens: int, model: Optional[str], timeout_override: Optional[int], errors: Optional[List[str]], use_cache: Optional[bool]) -> Optional[str]:
+    cache, cache_key, selected_model, temperature, cached = await _llm_cache_lookup(prompt, max_tokens, model, use_cache)
+    if cached is not None:
+        return cached
+
+    response = await generate_with_tokamak(prompt, max_tokens, model, timeout_override, errors)
+    if not response:
+        return await generate_with_anthropic(prompt, max_tokens, errors)
+    if cache is not None and cache_key is not None:
+        await asyncio.to_thread(cache.put, cache_key, selected_model, max_tokens, temperature, response)
+    return response
 
-def normalize_member_identity(member_name: str, member_email: str) -> Tuple[str, str]:
-    name = (member_name or "").strip('"').strip()
-    email = (member_email or "").strip('"').strip()
-    email_local = email.split("@")[0] if "@" in email else ""
 
-    use_name = bool(name) and name.isascii() and re.search(r"[A-Za-z]", name)
-    label = name if use_name else (email_local or name)
-    member_id = (email_local or label).lower().replace(" ", "-")
-    return member_id, label
+async def stream_with_llm(prompt: str, max_tokens: int, model: Optional[str] = None, timeout_override: Optional[int] = None, errors: Optional[List[str]] = None, use_cache: Optional[bool] = None) -> AsyncIterator[str]:
+    """Streaming counterpart of generate_with_llm.
 
+    A cached response is yielded in one piece. If Tokamak fails before the
+    first token the Anthropic fallback is yielded whole (and not cached); a
+    failure or stall after tokens were yielded raises LLMStreamError and
+    nothing is cached.
+    """
+    cache, cache_key, selected_model, temperature, cached = await _llm_cache_lookup(prompt, max_tokens, model, use_cache)
+    if cached is not None:
+        yield cached
+        return
 
-class ActivityGroup(TypedDict):
-    commits: List[Dict[str, Any]]
-    prs: List[Dict[str, Any]]
-    repos: Set[str]
+    chunks: List[str] = []
+    try:
+        async for delta in stream_with_tokamak(prompt, max_tokens, model, timeout_override):
+            chunks.append(delta)
+            yield delta
+    except Exception as exc:
+        reason = f"stalled for {get_llm_stall_timeout()}s" if isinstance(exc, asyncio.TimeoutError) else str(exc)
+        print(f"Tokamak stream failed for model {selected_model}: {reason}")
+        if errors is not None:
+            errors.append(f"Tokamak stream ({selected_model}): {reason}")
+        if chunks:
+            raise LLMStreamError(reason) from exc
 
+    response = "".join(chunks).strip()
+    if not response:
+        fallback = await generate_with_anthropic(prompt, max_tokens, errors)
+        if fallback:
+            yield fallback
+        return
+    if cache is not None and cache_key is not None:
+        await asyncio.to_thread(cache.put, cache_key, selected_model, max_tokens, temperature, response)
 
-def parse_csv_content(content: str) -> dict:
-    """Parse CSV content and return GitHub activities grouped by project, repo, and member."""
-    project_data: defaultdict[str, ActivityGroup] = defaultdict(lambda: {"commits": [], "prs": [], "repos": set()})
-    repo_data: defaultdict[str, ActivityGroup] = defaultdict(lambda: {"commits": [], "prs": [], "repos": set()})
-    individual_data: defaultdict[str, ActivityGroup] = defaultdict(lambda: {"commits": [], "prs": [], "repos": set()})
-    members: Dict[str, Dict[str, str]] = {}
-    timestamps: List[datetime] = []
 
-    reader = csv.DictReader(io.StringIO(content))
-    for row in reader:
-        if row.get('source') != 'github':
-            continue
+def repo_routes() -> RepoRoutingTable:
+    """Routing table for the current PROJECT_REPOS / classification / descriptions config."""
+    return get_routing_table(PROJECT_REPOS, DEFAULT_CLASSIFICATION, REPO_DESCRIPTIONS)
 
-        repo = row.get('repository', '').strip('"')
-        if not repo:
-            continue
 
-        timestamp = row.get('timestamp', '')
-        parsed_time = parse_timestamp(timestamp)
-        if parsed_time:
-            timestamps.append(parsed_time)
-
-        member_name = row.get('member_name', '').strip('"')
-        member_email = row.get('member_email', '').strip('"')
-        member_id, member_label = normalize_member_identity(member_name, member_email)
-        if member_id and member_id not in members:
-            members[member_id] = {
-                "id": member_id,
-                "label": member_label,
-                "name": member_name,
-                "email": member_email,
-            }
+def get_project_for_repo(repo_name: str) -> Optional[str]:
+    return repo_routes().project(repo_name)
+
+
+# Build the routing table at startup rather than on the first upload
+repo_routes()
+
 
-        project = get_project_for_repo(repo)
+def parse_csv_content(content: Union[str, ActivityExport]) -> dict:
+    """Group GitHub activities from CSV content (or an ingested export) by project, repo, and member."""
+    export = content if isinstance(content, ActivityExport) else ingest_csv(content)
+    project_data: defaultdict[str, SummaryAggregate] = defaultdict(SummaryAggregate)
+    repo_data: defaultdict[str, SummaryAggregate] = defaultdict(SummaryAggregate)
+    individual_data: defaultdict[str, SummaryAggregate] = defaultdict(SummaryAggregate)
 
-        entry_type = row.get('type', '')
-        message = (row.get('message') or '').strip('"')
-        title = (row.get('title') or '').strip('"')
-        sha = (row.get('sha') or '').strip('"')
-        pr_number = (row.get('pr_number') or '').strip('"')
-        additions = row.get('additions') or '0'
-        deletions = row.get('deletions') or '0'
-        state = (row.get('state') or '').strip('"')
+    repo_names = export.repo_names.values
+    member_ids = export.member_ids.values
+    routes = repo_routes()
+    repo_projects = [routes.project(repo) for repo in repo_names]
+    kinds, repos, row_members, texts = export.kind, export.repo, export.member, export.text
 
+    for i in range(len(export)):
+        repo_idx = repos[i]
+        repo = repo_names[repo_idx]
         repo_target = repo_data[repo]
-        repo_target["repos"].add(repo)
+        repo_target.add_repo(repo)
 
+        project = repo_projects[repo_idx]
         if project:
             target = project_data[project]
         else:
-            if not member_id:
+            member_idx = row_members[i]
+            if member_idx < 0:
                 continue
-            target = individual_data[member_id]
+            target = individual_data[member_ids[member_idx]]
 
-        target["repos"].add(repo)
+        target.add_repo(repo)
 
-        if entry_type == 'commit' and message:
-            if message.lower().startswith('merge '):
-                continue
-            entry = {
-                "repo": repo,
-                "message": message.split('\n')[0][:200],
-                "sha": sha[:8] if sha else "",
-                "timestamp": timestamp,
-                "additions": int(additions),
-                "deletions": int(deletions),
-                "member_id": member_id,
-            }
-            target["commits"].append(entry)
-            repo_target["commits"].append(entry)
-        elif entry_type == 'pull_request' and title:
-            entry = {
-                "repo": repo,
-                "title": title,
-                "pr_number": pr_number,
-                "state": state,
-                "timestamp": timestamp,
-                "member_id": member_id,
-            }
-            target["prs"].append(entry)
-            repo_target["prs"].append(entry)
-
-    def serialize_group(data_map: Dict[str, ActivityGroup]) -> Dict[str, Dict[str, Any]]:
-        result: Dict[str, Dict[str, Any]] = {}
-        for key, data in data_map.items():
-            result[key] = {
-                "commits": data["commits"],
-                "prs": data["prs"],
-                "repos": list(data["repos"]),
-            }
-        return result
+        kind = kinds[i]
+        if not texts[i]:
+            continue
+        if kind == KIND_COMMIT:
+            entry = export.commit_entry(i)
+            target.add_commit(entry, i)
+            repo_target.add_commit(entry, i)
+        elif kind == KIND_PR:
+            entry = export.pr_entry(i)
+            target.add_pr(entry, i)
+            repo_target.add_pr(entry, i)
 
     return {
-        "projects": serialize_group(project_data),
-        "repos": serialize_group(repo_data),
-        "individuals": serialize_group(individual_data),
-        "members": list(members.values()),
-        "timestamps": timestamps,
+        "projects": dict(project_data),
+        "repos": dict(repo_data),
+        "individuals": dict(individual_data),
+        "members": export.member_list(),
+        # Only the earliest and latest timestamps; enough for detect_scope_from_timestamps
+        "timestamps": export.timestamp_bounds(),
     }
 
 
@@ -841,56 +1194,26 @@ def build_report_headline(summaries: Dict[str, Dict[str, Any]], report_type: str
     return f"{themes['Ooo']}, {themes['Eco']}, and {themes['TRH']} Progress"
 
 
-def prepare_summary(project: str, data: Dict[str, Any]) -> dict:
-    """Prepare summary for a project or repository."""
-    commits = data['commits']
-    prs = data['prs']
-    repos = data['repos']
-    if isinstance(repos, set):
-        repos = list(repos)
-
-    commits_sorted = sorted(commits, key=lambda x: x['additions'] + x['deletions'], reverse=True)
-
-    # Calculate total lines added/deleted
-    total_additions = sum(c.get('additions', 0) for c in commits)
-    total_deletions = sum(c.get('deletions', 0) for c in commits)
-    total_changes = total_additions + total_deletions
-    net_change = total_additions - total_deletions
-
-    # Count unique contributors
-    contributors = set()
-    for c in commits:
-        # Check both 'member_id' (from CSV parsing) and 'author' (legacy) fields
-        author = c.get('member_id') or c.get('author', '')
-        if author:
-            contributors.add(author)
-
-    seen = set()
-    top_commits = []
-    for c in commits_sorted:
-        key = c['message'][:50].lower()
-        if key not in seen:
-            seen.add(key)
-            top_commits.append(c)
-        if len(top_commits) >= 30:
-            break
-
-    merged_prs = [p for p in prs if p['state'] == 'MERGED']
+def prepare_summary(project: str, aggregate: SummaryAggregate) -> dict:
+    """Prepare summary for a project or repository from its aggregate."""
+    total_additions = aggregate.lines_added
+    total_deletions = aggregate.lines_deleted
 
     return {
         "project": project,
-        "repos": repos,
-        "total_commits": len(commits),
-        "total_prs": len(prs),
-        "merged_prs": len(merged_prs),
-        "top_commits": top_commits,
-        "merged_pr_list": merged_prs[:15],
+        "repos": list(aggregate.repos),
+        "total_commits": aggregate.commit_count,
+        "total_prs": aggregate.pr_count,
+        "merged_prs": aggregate.merged_pr_count,
+        "top_commits": aggregate.top_commits(),
+        "merged_pr_list": aggregate.merged_prs(),
         "lines_added": total_additions,
         "lines_deleted": total_deletions,
-        "total_changes": total_changes,
-        "net_change": net_change,
-        "contributors": list(contributors),
-        "contributor_count": len(contributors),
+        "total_changes": total_additions + total_deletions,
+        "net_change": total_additions - total_deletions,
+        "contributors": list(aggregate.contributors),
+        "contributor_count": len(aggregate.contributors),
+        "daily_commits": aggregate.daily_histogram(),
         "github_url": f"{GITHUB_ORG_URL}/{project}" if project and project != "Other repos" else None,
     }
 
@@ -1740,7 +2063,7 @@ def build_raw_data_input(
     return "\n".join(lines).strip()
 
 
-def generate_full_report_with_ai(
+async def generate_full_report_with_ai(
     report_type: str,
     summaries: Dict[str, Dict[str, Any]],
     individual_summaries: Dict[str, Dict[str, Any]],
@@ -1833,7 +2156,7 @@ You are a Visionary Tech Evangelist at Tokamak Network. Your task is to generate
 {raw_data}
 """
 
-    return generate_with_llm(prompt, max_tokens=2000, model=model)
+    return await generate_with_llm(prompt, max_tokens=2000, model=model)
 
 
 def simplify_message_public(message: str) -> str:
@@ -1906,7 +2229,7 @@ def extract_deliverables(
     return deliverables
 
 
-def generate_technical_section(
+async def generate_technical_section(
     project: str,
     summary: dict,
     use_ai: bool = True,
@@ -1916,7 +2239,7 @@ def generate_technical_section(
     info = SECTION_INFO_TECHNICAL[project]
 
     if use_ai and has_tokamak_client(model):
-        section = generate_with_ai_technical(project, summary, info, model=model)
+        section = await generate_with_ai_technical(project, summary, info, model=model)
     else:
         section = generate_basic_technical(project, summary, info)
 
@@ -1926,7 +2249,7 @@ def generate_technical_section(
     return section
 
 
-def generate_public_section(
+async def generate_public_section(
     project: str,
     summary: dict,
     use_ai: bool = True,
@@ -1937,7 +2260,7 @@ def generate_public_section(
     info = SECTION_INFO_PUBLIC[project]
 
     if use_ai and has_tokamak_client(model):
-        section = generate_with_ai_public(project, summary, info, model=model, report_format=report_format)
+        section = await generate_with_ai_public(project, summary, info, model=model, report_format=report_format)
     else:
         section = generate_basic_public(project, summary, info)
 
@@ -1947,7 +2270,7 @@ def generate_public_section(
     return section
 
 
-def generate_repo_technical_section(
+async def generate_repo_technical_section(
     repo_name: str,
     summary: dict,
     use_ai: bool = True,
@@ -1960,7 +2283,7 @@ def generate_repo_technical_section(
         "overview_url": f"https://github.com/tokamak-network/{repo_name}",
     }
     if use_ai and has_tokamak_client(model):
-        section = generate_with_ai_technical(repo_name, summary, info, model=model)
+        section = await generate_with_ai_technical(repo_name, summary, info, model=model)
     else:
         section = generate_basic_technical(repo_name, summary, info)
     section = sanitize_repo_technical_section(section)
@@ -1969,7 +2292,7 @@ def generate_repo_technical_section(
     return generate_basic_technical(repo_name, summary, info)
 
 
-def generate_repo_public_section(
+async def generate_repo_public_section(
     repo_name: str,
     summary: dict,
     use_ai: bool = True,
@@ -1993,7 +2316,7 @@ def generate_repo_public_section(
     }
     print(f"[REPO PUBLIC] repo={repo_name}, use_ai={use_ai}, model={model}, format={report_format}, has_client={has_tokamak_client(model)}")
     if use_ai and has_tokamak_client(model):
-        section = generate_with_ai_public(repo_name, summary, info, model=model, report_format=report_format)
+        section = await generate_with_ai_public(repo_name, summary, info, model=model, report_format=report_format)
     else:
         section = generate_basic_public(repo_name, summary, info)
     if section:
@@ -2001,7 +2324,7 @@ def generate_repo_public_section(
     return generate_basic_public(repo_name, summary, info)
 
 
-def generate_with_ai_technical(project: str, summary: dict, info: dict, model: Optional[str] = None) -> str:
+async def generate_with_ai_technical(project: str, summary: dict, info: dict, model: Optional[str] = None) -> str:
     """Generate technical section using Tokamak API."""
     if not has_tokamak_client(model):
         return generate_basic_technical(project, summary, info)
@@ -2049,7 +2372,7 @@ Merged PRs:
 {pr_list}
 """
 
-    bullets = generate_with_llm(prompt, max_tokens=1500, model=model)
+    bullets = await generate_with_llm(prompt, max_tokens=1500, model=model)
     if not bullets:
         return generate_basic_technical(project, summary, info)
     return f"{bullets}\n"
@@ -2136,7 +2459,7 @@ Briefly mention what's planned next for this repository (1-2 sentences).
 ---"""
 
 
-def generate_comprehensive_headline(all_summaries: dict, date_range: dict, model: Optional[str] = None) -> str:
+async def generate_comprehensive_headline(all_summaries: dict, date_range: dict, model: Optional[str] = None) -> str:
     """Generate an impactful headline/executive summary for the comprehensive report."""
     total_commits = sum(s.get('total_commits', 0) for s in all_summaries.values())
     total_additions = sum(s.get('lines_added', 0) for s in all_summaries.values())
@@ -2192,7 +2515,7 @@ Tokamak Network: {fmt(total_changes)} Code Changes Across {total_repos} Projects
 
 """
 
-    response = generate_with_llm(prompt, max_tokens=800, model=model)
+    response = await generate_with_llm(prompt, max_tokens=800, model=model)
     if response:
         # Strip AI meta-text preambles
         import re as _re
@@ -2207,7 +2530,7 @@ Tokamak Network: {fmt(total_changes)} Code Changes Across {total_repos} Projects
     return f"# Tokamak Network Development Report\n\n**{date_range.get('start', 'N/A')} - {date_range.get('end', 'N/A')}**\n\n---\n\n"
 
 
-def generate_with_ai_comprehensive(project: str, summary: dict, info: dict, model: Optional[str] = None) -> str:
+async def generate_with_ai_comprehensive(project: str, summary: dict, info: dict, model: Optional[str] = None) -> str:
     """Generate comprehensive detailed section for a repository."""
     if not has_tokamak_client(model):
         return generate_basic_comprehensive(project, summary, info)
@@ -2267,7 +2590,7 @@ Description: {info.get('context', REPO_DESCRIPTIONS.get(project, 'A Tokamak Netw
 
 Generate the comprehensive section for {project}:"""
 
-    response = generate_with_llm(prompt, max_tokens=2000, model=model, timeout_override=180)
+    response = await generate_with_llm(prompt, max_tokens=2000, model=model, timeout_override=180)
     if response:
         # Strip AI meta-text preambles
         import re
@@ -2345,7 +2668,7 @@ def generate_basic_comprehensive(project: str, summary: dict, info: dict) -> str
 """
 
 
-def generate_with_ai_public(project: str, summary: dict, info: dict, model: Optional[str] = None, report_format: str = "concise") -> str:
+async def generate_with_ai_public(project: str, summary: dict, info: dict, model: Optional[str] = None, report_format: str = "concise") -> str:
     """Generate public section using Tokamak API."""
     if not has_tokamak_client(model):
         return generate_basic_public(project, summary, info)
@@ -2409,7 +2732,7 @@ Merged PRs:
 """
 
     print(f"[AI PUBLIC] Calling model={model} for project={project} format={report_format}")
-    bullets = generate_with_llm(prompt, max_tokens=1000, model=model)
+    bullets = await generate_with_llm(prompt, max_tokens=1000, model=model)
     if not bullets:
         print(f"[AI PUBLIC] LLM returned None for project={project}, falling back to basic")
         return generate_basic_public(project, summary, info)
@@ -2459,7 +2782,7 @@ def generate_basic_public(project: str, summary: dict, info: dict) -> str:
     return "\n".join(bullets) + "\n"
 
 
-def generate_individual_section(
+async def generate_individual_section(
     member_label: str,
     summary: dict,
     report_type: str,
@@ -2469,12 +2792,12 @@ def generate_individual_section(
     info = SECTION_INFO_INDIVIDUAL_TECHNICAL if report_type == "technical" else SECTION_INFO_INDIVIDUAL_PUBLIC
 
     if use_ai and has_tokamak_client(model):
-        return generate_with_ai_individual(member_label, summary, info, report_type, model=model)
+        return await generate_with_ai_individual(member_label, summary, info, report_type, model=model)
 
     return generate_basic_individual(member_label, summary, info, report_type)
 
 
-def generate_with_ai_individual(
+async def generate_with_ai_individual(
     member_label: str,
     summary: dict,
     info: dict,
@@ -2531,7 +2854,7 @@ Generate 4-6 bullet points:
 
 Output only the bullet points. Do not include analysis, reasoning, or meta commentary."""
 
-    bullets = generate_with_llm(prompt, max_tokens=1200, model=model)
+    bullets = await generate_with_llm(prompt, max_tokens=1200, model=model)
     if not bullets:
         return generate_basic_individual(member_label, summary, info, report_type)
     return f"{bullets}\n"
@@ -2558,7 +2881,7 @@ def generate_basic_individual(member_label: str, summary: dict, info: dict, repo
     return "Delivered targeted progress across individual initiatives"
 
 
-def generate_individuals_section(
+async def generate_individuals_section(
     individual_summaries: Dict[str, Dict[str, Any]],
     report_type: str,
     use_ai: bool = True,
@@ -2577,9 +2900,13 @@ def generate_individuals_section(
     top_entries = entries[:8]
     remaining = max(len(entries) - len(top_entries), 0)
 
+    details = await asyncio.gather(*(
+        generate_individual_section(label, summary, report_type, use_ai, model=model)
+        for _, label, summary in top_entries
+    ))
+
     lines = []
-    for _, label, summary in top_entries:
-        detail = generate_individual_section(label, summary, report_type, use_ai, model=model)
+    for (_, label, _), detail in zip(top_entries, details):
         if detail:
             lines.append(f"- {label}: {detail}.")
 
@@ -2589,7 +2916,7 @@ def generate_individuals_section(
     return "\n".join(lines) + "\n"
 
 
-def generate_highlight_with_ai(
+async def generate_highlight_with_ai(
     summaries: dict,
     report_type: str,
     total_commits: int,
@@ -2669,7 +2996,7 @@ Key development areas:
 {chr(10).join(achievements)}
 """
 
-        response = generate_with_llm(prompt, max_tokens=400, model=model)
+        response = await generate_with_llm(prompt, max_tokens=400, model=model)
         if response:
             cleaned = response.strip()
             if report_type == "technical" and re.match(r"^Total:\s*\d+", cleaned, flags=re.IGNORECASE):
@@ -2702,6 +3029,59 @@ def generate_basic_highlight(total_commits: int, total_prs: int, total_repos: in
         return "Delivered focused engineering progress across core systems and tooling."
 
 
+class ReportJSONResponse(JSONResponse):
+    """JSONResponse that serializes commit/PR records (nested in summaries) as dicts."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=record_json_default,
+        ).encode("utf-8")
+
+
+# Parsed uploads keyed by content hash, shared by every CSV endpoint
+dataset_cache = DatasetCache(get_dataset_cache_size())
+
+
+async def resolve_dataset(file: Optional[UploadFile], dataset_id: Optional[str]) -> Dataset:
+    """Return the cached dataset for an upload or a previously returned dataset_id."""
+    if file is not None:
+        # Hash and parse the spooled upload in fixed-size chunks instead of reading it whole;
+        # both are blocking, so keep them off the event loop. Large uploads are parsed on
+        # CSV_PARSE_WORKERS processes.
+        await file.seek(0)
+        workers = get_csv_parse_workers()
+        return await asyncio.to_thread(
+            dataset_cache.get_or_ingest_stream,
+            file.file,
+            lambda stream: ingest_stream_parallel(stream, workers),
+        )
+    if dataset_id:
+        dataset = dataset_cache.get(dataset_id.strip())
+        if dataset is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired dataset_id; upload the CSV again")
+        return dataset
+    raise HTTPException(status_code=400, detail="Either file or dataset_id is required")
+
+
+async def dataset_memo(dataset: Dataset, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """``dataset.memo`` off the event loop; the first computation scans the whole export."""
+    return await asyncio.to_thread(dataset.memo, key, factory)
+
+
+async def dataset_groups(dataset: Dataset) -> dict:
+    return await dataset_memo(dataset, "groups", lambda: parse_csv_content(dataset.export))
+
+
+async def dataset_summary(dataset: Dataset, group: str, key: str, data: Dict[str, Any]) -> dict:
+    """Return a fresh copy of the memoized prepare_summary result for one group entry."""
+    return dict(await dataset_memo(dataset, ("summary", group, key), lambda: prepare_summary(key, data)))
+
+
 @app.get("/")
 async def root():
     return {"message": "Biweekly Report Generator API", "version": "1.0.0"}
@@ -2709,30 +3089,32 @@ async def root():
 
 @app.post("/api/analyze")
 async def analyze_csv(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    dataset_id: Optional[str] = Form(None),
 ):
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
-
-        parsed = parse_csv_content(content_str)
-        scope, start_date, end_date, days = detect_scope_from_timestamps(parsed["timestamps"])
+        dataset = await resolve_dataset(file, dataset_id)
+        export = dataset.export
+        scope, start_date, end_date, days = detect_scope_from_timestamps(export.timestamp_bounds())
 
         return JSONResponse({
             "success": True,
+            "dataset_id": dataset.dataset_id,
             "detected_scope": scope,
             "date_range": {
                 "start": start_date,
                 "end": end_date,
                 "days": days,
             },
-            "members": parsed["members"],
+            "members": export.member_list(),
         })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def translate_report_to_korean(report_text: str, model: Optional[str] = None) -> Optional[str]:
+async def translate_report_to_korean(report_text: str, model: Optional[str] = None) -> Optional[str]:
     """Translate/regenerate a report in professional Korean (해요체)."""
     if not report_text or not has_tokamak_client(model):
         return None
@@ -2752,10 +3134,10 @@ def translate_report_to_korean(report_text: str, model: Optional[str] = None) ->
 
 한국어 번역:"""
 
-    return generate_with_llm(prompt, max_tokens=8000, model=model, timeout_override=300)
+    return await generate_with_llm(prompt, max_tokens=8000, model=model, timeout_override=300)
 
 
-def translate_highlight_to_korean(highlight_text: str, model: Optional[str] = None) -> Optional[str]:
+async def translate_highlight_to_korean(highlight_text: str, model: Optional[str] = None) -> Optional[str]:
     """Translate highlight text to Korean."""
     if not highlight_text or not has_tokamak_client(model):
         return None
@@ -2773,148 +3155,410 @@ def translate_highlight_to_korean(highlight_text: str, model: Optional[str] = No
 
 한국어 번역:"""
 
-    return generate_with_llm(prompt, max_tokens=2000, model=model, timeout_override=120)
+    return await generate_with_llm(prompt, max_tokens=2000, model=model, timeout_override=120)
 
 
-@app.post("/api/generate")
-async def generate_report(
-    file: UploadFile = File(...),
-    report_type: str = Form("technical"),
-    use_ai: bool = Form(True),
-    model: Optional[str] = Form(None),
-    models: Optional[str] = Form(None),
-    report_scope: str = Form("auto"),
-    project_filter: str = Form("all"),
-    member_filter: str = Form("all"),
-    include_individuals: bool = Form(True),
-    report_grouping: str = Form("project"),
-    repo_limit: int = Form(0),
-    report_format: str = Form("concise"),
-    output_format: str = Form("markdown"),
-    language: str = Form("en"),
-    report_number: int = Form(2),
-    report_title: str = Form(""),
-):
-    """Generate report from uploaded CSV file."""
-    try:
-        refresh_env()
-        content = await file.read()
-        content_str = content.decode('utf-8')
+async def translate_shared(
+    kind: str,
+    text: str,
+    model: Optional[str],
+    inflight: Dict[Tuple[str, str], "asyncio.Task[Optional[str]]"],
+) -> Tuple[Optional[str], bool]:
+    """Translate ``text``, sharing one call between identical texts in a report.
 
-        parsed = parse_csv_content(content_str)
-        project_data = parsed["projects"]
-        repo_data = parsed["repos"]
-        individual_data = parsed["individuals"]
-        members = parsed["members"]
+    ``inflight`` is per report. Repeats across reports are served by the
+    persistent LLM response cache, since identical English text builds an
+    identical translation prompt. Returns (translation, reused).
+    """
+    key = (kind, text)
+    task = inflight.get(key)
+    reused = task is not None
+    if task is None:
+        translator = translate_highlight_to_korean if kind == "highlight" else translate_report_to_korean
+        task = asyncio.ensure_future(translator(text, model=model))
+        inflight[key] = task
+    return await task, reused
+
+
+async def generate_model_reports(
+    requested_models: List[str],
+    report_type: str,
+    report_grouping: str,
+    report_format: str,
+    summaries: Dict[str, Dict[str, Any]],
+    individual_summaries: Dict[str, Dict[str, Any]],
+    project_keys: List[str],
+    include_individuals: bool,
+    scope: str,
+    date_range: dict,
+    total_commits: int,
+    total_prs: int,
+    total_repos: int,
+    highlight_use_ai: bool,
+    use_ai: bool,
+    deadline: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Generate a full candidate report per model for side-by-side comparison.
+
+    Models run concurrently, each with as many stages in flight as the LLM
+    governor currently allows that model (LLM_MODEL_CONCURRENCY, its
+    override, or the adaptive window). Models still running at ``deadline`` seconds are cancelled and
+    return the stages that finished, flagged ``partial``.
+    """
+    section_info = SECTION_INFO_TECHNICAL if report_type == "technical" else SECTION_INFO_PUBLIC
+    if deadline is None:
+        deadline = get_model_compare_deadline()
 
-        if not project_data and not repo_data and not individual_data:
-            raise HTTPException(status_code=400, detail="No valid GitHub data found in CSV")
+    entries = list(summaries.items())
+    if report_grouping == "repository":
+        other_repos = None
+        if "Other repos" in summaries:
+            entries = [(name, summary) for name, summary in entries if name != "Other repos"]
+            other_repos = ("Other repos", summaries["Other repos"])
+        entries.sort(key=lambda item: item[0].lower())
+        if other_repos:
+            entries.append(other_repos)
+    include_individual_section = report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}
+
+    def build_candidate_graph(candidate: str, completed: Dict[str, Any]) -> Tuple[StageGraph, List[str]]:
+        graph = StageGraph(llm_governor.model_limit_for("tokamak", candidate), on_complete=completed.__setitem__)
+
+        async def _full_report_stage():
+            return await generate_full_report_with_ai(
+                report_type,
+                summaries,
+                individual_summaries,
+                date_range,
+                total_commits,
+                total_prs,
+                total_repos,
+                report_grouping,
+                model=candidate,
+            )
 
-        detected_scope, start_date, end_date, days = detect_scope_from_timestamps(parsed["timestamps"])
-        scope = detected_scope if report_scope == "auto" else report_scope
+        def _repo_section_stage(repo_name, summary):
+            async def _stage():
+                trimmed = trim_summary_for_ai(summary, 12, 6)
+                if report_type == "technical":
+                    section = await generate_repo_technical_section(repo_name, trimmed, True, model=candidate)
+                else:
+                    section = await generate_repo_public_section(repo_name, trimmed, True, model=candidate, report_format=report_format)
+                return {"project": repo_name, "title": repo_name, "content": section}
+            return _stage
 
-        # Prepare summaries
-        summaries: Dict[str, Dict[str, Any]] = {}
-        project_keys = ["Ooo", "Eco", "TRH"]
-        if project_filter != "all":
-            project_keys = [project_filter]
+        def _project_section_stage(project):
+            async def _stage():
+                if report_type == "technical":
+                    section = await generate_technical_section(project, summaries[project], use_ai, model=candidate)
+                else:
+                    section = await generate_public_section(project, summaries[project], use_ai, model=candidate, report_format=report_format)
+                return {
+                    "project": project,
+                    "title": f"{section_info[project]['number']}. {section_info[project]['title']}",
+                    "content": section,
+                }
+            return _stage
+
+        async def _individuals_stage():
+            section = await generate_individuals_section(individual_summaries, report_type, use_ai, model=candidate)
+            if not section:
+                return None
+            return {
+                "project": "individuals",
+                "title": f"{SECTION_INFO_INDIVIDUAL_TECHNICAL['number']}. {SECTION_INFO_INDIVIDUAL_TECHNICAL['title']}",
+                "content": section,
+            }
 
-        repo_count_total = 0
-        repo_count_shown = 0
-        repo_limit_applied = False
+        async def _highlight_stage():
+            if highlight_use_ai:
+                return await generate_highlight_with_ai(
+                    summaries,
+                    report_type,
+                    total_commits,
+                    total_prs,
+                    total_repos,
+                    date_range,
+                    model=candidate,
+                )
+            if report_type == "public":
+                return generate_public_highlight(summaries, total_commits, total_prs, total_repos, scope)
+            return generate_technical_highlight(summaries, total_commits, total_prs, total_repos)
 
+        graph.add("full_report", _full_report_stage)
+        section_stages: List[str] = []
         if report_grouping == "repository":
-            effective_repo_limit = repo_limit
-            forced_limit_applied = False
-            # For comprehensive format, include ALL repositories (no limit)
-            if report_format == "comprehensive":
-                effective_repo_limit = 0  # 0 means no limit
-            elif use_ai:
-                if effective_repo_limit <= 0 or effective_repo_limit > MAX_AI_REPO_LIMIT:
-                    effective_repo_limit = MAX_AI_REPO_LIMIT
-                    forced_limit_applied = True
-
-            repo_entries = []
-            for repo_name, repo_payload in repo_data.items():
-                summary = prepare_summary(repo_name, repo_payload)
-                summary["start_date"] = start_date
-                summary["end_date"] = end_date
-                repo_entries.append((repo_name, summary))
-
-            repo_entries.sort(key=lambda item: repo_sort_key(item[1]), reverse=True)
-            repo_count_total = len(repo_entries)
-
-            if effective_repo_limit and effective_repo_limit > 0 and len(repo_entries) > effective_repo_limit:
-                selected = repo_entries[:effective_repo_limit]
-                remainder = repo_entries[effective_repo_limit:]
-                remainder_names = {name for name, _ in remainder}
-                other_group: ActivityGroup = {"commits": [], "prs": [], "repos": set()}
-                for repo_name in remainder_names:
-                    payload = repo_data.get(repo_name)
-                    if not payload:
-                        continue
-                    other_group["commits"].extend(payload.get("commits", []))
-                    other_group["prs"].extend(payload.get("prs", []))
-                    other_group["repos"].update(payload.get("repos", []))
-                summaries = {name: summary for name, summary in selected}
-                if other_group["commits"] or other_group["prs"]:
-                    other_summary = prepare_summary("Other repos", dict(other_group))
-                    other_summary["start_date"] = start_date
-                    other_summary["end_date"] = end_date
-                    summaries["Other repos"] = other_summary
-                repo_count_shown = len(summaries)
-                repo_limit_applied = True
-            else:
-                summaries = {name: summary for name, summary in repo_entries}
-                repo_count_shown = len(summaries)
-                if forced_limit_applied:
-                    repo_limit_applied = True
+            for idx, (repo_name, summary) in enumerate(entries):
+                section_stages.append(graph.add(f"section:{idx}", _repo_section_stage(repo_name, summary)))
         else:
             for project in project_keys:
-                if project in project_data:
-                    summary = prepare_summary(project, project_data[project])
-                    summary["start_date"] = start_date
-                    summary["end_date"] = end_date
-                    summaries[project] = summary
-
-        individual_summaries = {}
-        member_lookup = {m["id"]: m for m in members}
-        if report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}:
-            selected_members = list(individual_data.keys())
-            if member_filter != "all":
-                selected_members = [member_filter] if member_filter in individual_data else []
-
-            for member_id in selected_members:
-                data = individual_data.get(member_id)
-                if not data:
-                    continue
-                label = member_lookup.get(member_id, {}).get("label", member_id)
-                member_summary = prepare_summary(member_id, data)
-                member_summary["start_date"] = start_date
-                member_summary["end_date"] = end_date
-                individual_summaries[member_id] = {
-                    "label": label,
-                    "summary": member_summary,
-                }
+                if project in summaries:
+                    section_stages.append(graph.add(f"section:{project}", _project_section_stage(project)))
+        if include_individual_section:
+            section_stages.append(graph.add("section:individuals", _individuals_stage))
+        graph.add("highlight", _highlight_stage)
+        return graph, section_stages
+
+    completed: Dict[str, Dict[str, Any]] = {candidate: {} for candidate in requested_models}
+    graphs = {candidate: build_candidate_graph(candidate, completed[candidate]) for candidate in requested_models}
+    tasks = {candidate: asyncio.ensure_future(graph.run()) for candidate, (graph, _) in graphs.items()}
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    except asyncio.CancelledError:
+        # asyncio.wait leaves its tasks running; take them down with the report
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    model_reports: Dict[str, Dict[str, Any]] = {}
+    for candidate in requested_models:
+        graph, section_stages = graphs[candidate]
+        results = completed[candidate]
+        task = tasks[candidate]
+        report_payload: Dict[str, Any] = {}
+        if results.get("full_report"):
+            report_payload["full_report"] = results["full_report"]
+        if "highlight" in results:
+            report_payload["highlight"] = results["highlight"]
+        report_payload["sections"] = [results[stage] for stage in section_stages if results.get(stage)]
+        if task.cancelled() or task.exception() is not None:
+            report_payload["partial"] = True
+            report_payload["missing_stages"] = [name for name in graph.stage_names() if name not in results]
+            if task.cancelled():
+                print(f"[COMPARE] {candidate} missed the {deadline}s deadline; returning partial results")
+            else:
+                report_payload["error"] = str(task.exception())
+        model_reports[candidate] = report_payload
+    return model_reports
+
+
+# ============================================================
+# POST-PROCESSING: Kevin's branding rules for headline/summary
+# - "Repositories" → "Projects" in headline/title only
+# - Per-repo tables keep full detail (Commits, Contributors,
+#   Lines Added/Deleted, Net Change) — matches #2 format
+# ============================================================
+def postprocess_headline(text: str) -> str:
+    if not text:
+        return text
+    text = text.replace('Active Repositories', 'Active Projects')
+    text = text.replace('active repositories', 'active projects')
+    text = re.sub(r'(\d+) Repositories', r'\1 Projects', text)
+    text = re.sub(r'(\d+) repositories', r'\1 projects', text)
+    return text
 
-        # Calculate totals
-        total_commits = sum(s['total_commits'] for s in summaries.values())
-        total_prs = sum(s['merged_prs'] for s in summaries.values())
-        total_repos = sum(len(s['repos']) for s in summaries.values())
 
-        date_range = {
-            "start": start_date,
-            "end": end_date,
-        }
+ReportEmitter = Callable[[str, Dict[str, Any]], None]
+
+
+def _ignore_report_event(event: str, data: Dict[str, Any]) -> None:
+    return None
+
 
-        requested_models = resolve_requested_models(model, models) if use_ai else []
-        multi_model = len(requested_models) > 1
-        selected_model = requested_models[0] if requested_models else None
+async def _do_generate(
+    dataset: Dataset,
+    *,
+    report_type: str,
+    use_ai: bool,
+    model: Optional[str],
+    models: Optional[str],
+    report_scope: str,
+    project_filter: str,
+    member_filter: str,
+    include_individuals: bool,
+    report_grouping: str,
+    repo_limit: int,
+    report_format: str,
+    output_format: str,
+    language: str,
+    report_number: int,
+    report_title: str,
+    compare_deadline: int,
+    emit: Optional[ReportEmitter] = None,
+    stream_tokens: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Build the /api/generate payload. ``emit`` receives progress events as stages finish."""
+    # Section text is streamed token by token only when someone is listening
+    if stream_tokens is None:
+        stream_tokens = emit is not None
+    if emit is None:
+        emit = _ignore_report_event
+
+    parsed = await dataset_groups(dataset)
+    project_data = parsed["projects"]
+    repo_data = parsed["repos"]
+    individual_data = parsed["individuals"]
+    members = parsed["members"]
+
+    if not project_data and not repo_data and not individual_data:
+        raise HTTPException(status_code=400, detail="No valid GitHub data found in CSV")
+
+    detected_scope, start_date, end_date, days = detect_scope_from_timestamps(parsed["timestamps"])
+    scope = detected_scope if report_scope == "auto" else report_scope
+
+    # Prepare summaries
+    summaries: Dict[str, Dict[str, Any]] = {}
+    project_keys = ["Ooo", "Eco", "TRH"]
+    if project_filter != "all":
+        project_keys = [project_filter]
+
+    repo_count_total = 0
+    repo_count_shown = 0
+    repo_limit_applied = False
+
+    if report_grouping == "repository":
+        effective_repo_limit = repo_limit
+        forced_limit_applied = False
+        # For comprehensive format, include ALL repositories (no limit)
+        if report_format == "comprehensive":
+            effective_repo_limit = 0  # 0 means no limit
+        elif use_ai:
+            if effective_repo_limit <= 0 or effective_repo_limit > MAX_AI_REPO_LIMIT:
+                effective_repo_limit = MAX_AI_REPO_LIMIT
+                forced_limit_applied = True
+
+        repo_entries = []
+        for repo_name, repo_payload in repo_data.items():
+            summary = await dataset_summary(dataset, "repos", repo_name, repo_payload)
+            summary["start_date"] = start_date
+            summary["end_date"] = end_date
+            repo_entries.append((repo_name, summary))
+
+        repo_entries.sort(key=lambda item: repo_sort_key(item[1]), reverse=True)
+        repo_count_total = len(repo_entries)
+
+        if effective_repo_limit and effective_repo_limit > 0 and len(repo_entries) > effective_repo_limit:
+            selected = repo_entries[:effective_repo_limit]
+            remainder = repo_entries[effective_repo_limit:]
+            # Merge the remainder repos' aggregates instead of re-summarizing their commits
+            other_group = await asyncio.to_thread(
+                SummaryAggregate.combine, [repo_data[name] for name, _ in remainder]
+            )
+            summaries = {name: summary for name, summary in selected}
+            if not other_group.is_empty():
+                other_summary = await asyncio.to_thread(prepare_summary, "Other repos", other_group)
+                other_summary["start_date"] = start_date
+                other_summary["end_date"] = end_date
+                summaries["Other repos"] = other_summary
+            repo_count_shown = len(summaries)
+            repo_limit_applied = True
+        else:
+            summaries = {name: summary for name, summary in repo_entries}
+            repo_count_shown = len(summaries)
+            if forced_limit_applied:
+                repo_limit_applied = True
+    else:
+        for project in project_keys:
+            if project in project_data:
+                summary = await dataset_summary(dataset, "projects", project, project_data[project])
+                summary["start_date"] = start_date
+                summary["end_date"] = end_date
+                summaries[project] = summary
+
+    individual_summaries = {}
+    member_lookup = {m["id"]: m for m in members}
+    if report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}:
+        selected_members = list(individual_data.keys())
+        if member_filter != "all":
+            selected_members = [member_filter] if member_filter in individual_data else []
+
+        for member_id in selected_members:
+            data = individual_data.get(member_id)
+            if not data:
+                continue
+            label = member_lookup.get(member_id, {}).get("label", member_id)
+            member_summary = await dataset_summary(dataset, "individuals", member_id, data)
+            member_summary["start_date"] = start_date
+            member_summary["end_date"] = end_date
+            individual_summaries[member_id] = {
+                "label": label,
+                "summary": member_summary,
+            }
+
+    # Calculate totals
+    total_commits = sum(s['total_commits'] for s in summaries.values())
+    total_prs = sum(s['merged_prs'] for s in summaries.values())
+    total_repos = sum(len(s['repos']) for s in summaries.values())
+
+    date_range = {
+        "start": start_date,
+        "end": end_date,
+    }
+    report_totals = {
+        "total_commits": total_commits,
+        "total_prs": total_prs,
+        "total_repos": total_repos,
+        "total_lines_added": sum(s.get('lines_added', 0) for s in summaries.values()),
+        "total_lines_deleted": sum(s.get('lines_deleted', 0) for s in summaries.values()),
+        "total_changes": sum(s.get('total_changes', 0) for s in summaries.values()),
+        "net_change": sum(s.get('net_change', 0) for s in summaries.values()),
+        "total_contributors": len(set(c for s in summaries.values() for c in s.get('contributors', []))),
+    }
+    emit("stats", {
+        "dataset_id": dataset.dataset_id,
+        "report_scope": scope,
+        "date_range": {"start": start_date, "end": end_date, "days": days},
+        "stats": report_totals,
+        "repo_limit_applied": repo_limit_applied,
+        "repo_count_total": repo_count_total,
+        "repo_count_shown": repo_count_shown,
+    })
 
-        full_report = None
-        allow_full_report = use_ai and report_grouping != "repository"
-        if allow_full_report and not multi_model:
-            full_report = generate_full_report_with_ai(
+    requested_models = resolve_requested_models(model, models) if use_ai else []
+    multi_model = len(requested_models) > 1
+    selected_model = requested_models[0] if requested_models else None
+
+    # --- Language handling ---
+    # Normalize language parameter
+    if language not in ("en", "kr", "both"):
+        language = "en"
+    translate = language in ("kr", "both") and use_ai
+
+    allow_full_report = use_ai and report_grouping != "repository"
+    section_info = SECTION_INFO_TECHNICAL if report_type == "technical" else SECTION_INFO_PUBLIC
+    section_use_ai = use_ai
+    # Note: Gemini Flash model restriction for technical reports removed
+    # to ensure consistent AI generation across all report types
+    highlight_use_ai = use_ai
+    comprehensive_public = report_format == "comprehensive" and report_type == "public" and report_grouping == "repository"
+
+    # Stages run as a dependency graph; use more workers for comprehensive to speed up large reports
+    translation_stats = {"total": 0, "done": 0, "reused": 0}
+
+    section_positions: Dict[str, int] = {}
+
+    def _on_stage_complete(name, result):
+        if name.endswith(":kr"):
+            if result is None:
+                return
+            translation_stats["done"] += 1
+            label = result.get("title") if isinstance(result, dict) else name[:-3]
+            print(f"[TRANSLATE] {label} ready ({translation_stats['done']}/{translation_stats['total']})")
+            source = name[:-3]
+            if source in section_positions:
+                emit("translation", {"target": "section", "index": section_positions[source], "section": result})
+            else:
+                emit("translation", {"target": source, "content": postprocess_headline(result)})
+        elif name in section_positions:
+            if result is not None:
+                emit("section", {"index": section_positions[name], "section": result})
+        elif name in ("highlight", "full_report"):
+            emit(name, {"content": postprocess_headline(result)})
+        elif name == "model_reports":
+            emit("model_reports", {"model_reports": result})
+
+    graph = StageGraph(
+        MAX_SECTION_WORKERS if report_format == "comprehensive" else MAX_SECTION_WORKERS_DEFAULT,
+        pools={"translation": MAX_TRANSLATION_WORKERS},
+        on_complete=_on_stage_complete,
+    )
+
+    if allow_full_report and not multi_model:
+        async def _full_report_stage():
+            return await generate_full_report_with_ai(
                 report_type,
                 summaries,
                 individual_summaries,
@@ -2926,73 +3570,86 @@ async def generate_report(
                 model=selected_model,
             )
 
-        # Generate sections
-        sections = []
-        section_info = SECTION_INFO_TECHNICAL if report_type == "technical" else SECTION_INFO_PUBLIC
-        section_use_ai = use_ai
-        # Note: Gemini Flash model restriction for technical reports removed
-        # to ensure consistent AI generation across all report types
-        highlight_use_ai = use_ai
+        graph.add("full_report_ai", _full_report_stage)
 
-        if report_grouping == "repository":
-            entries = list(summaries.items())
-            # Sort alphabetically (Kevin's preference), keep "Other repos" at the end
-            other_repos = None
-            if "Other repos" in summaries:
-                entries = [(name, summary) for name, summary in entries if name != "Other repos"]
-                other_repos = ("Other repos", summaries["Other repos"])
-            entries.sort(key=lambda item: item[0].lower())
-            if other_repos:
-                entries.append(other_repos)
-
-            # Parallel generation for repository sections
-            def _gen_repo_section(repo_name_and_summary):
-                rn, sm = repo_name_and_summary
+    # Generate sections
+    section_stages: List[str] = []
+
+    def _stream_section_tokens(index):
+        # Runs inside the section's own task, so the sink only sees this section's LLM calls
+        if stream_tokens:
+            llm_token_sink.set(lambda delta: emit("section_delta", {"index": index, "delta": delta}))
+            llm_token_reset.set(lambda reason: emit("section_reset", {"index": index, "reason": reason}))
+    if report_grouping == "repository":
+        entries = list(summaries.items())
+        # Sort alphabetically (Kevin's preference), keep "Other repos" at the end
+        other_repos = None
+        if "Other repos" in summaries:
+            entries = [(name, summary) for name, summary in entries if name != "Other repos"]
+            other_repos = ("Other repos", summaries["Other repos"])
+        entries.sort(key=lambda item: item[0].lower())
+        if other_repos:
+            entries.append(other_repos)
+
+        def _repo_section_stage(index, rn, sm):
+            async def _stage():
+                _stream_section_tokens(index)
+                trimmed = sm
                 # For comprehensive format, keep more commits for detailed analysis
                 if report_format == "comprehensive":
-                    sm = trim_summary_for_ai(sm, 20, 10) if use_ai else sm
+                    trimmed = trim_summary_for_ai(sm, 20, 10) if use_ai else sm
                 else:
-                    sm = trim_summary_for_ai(sm, 12, 6) if use_ai else sm
+                    trimmed = trim_summary_for_ai(sm, 12, 6) if use_ai else sm
 
                 if report_type == "technical":
-                    content = generate_repo_technical_section(rn, sm, section_use_ai, model=selected_model)
+                    content = await generate_repo_technical_section(rn, trimmed, section_use_ai, model=selected_model)
                 elif report_format == "comprehensive" and section_use_ai:
                     # Use comprehensive generation for detailed reports (AI only)
                     info = {"context": REPO_DESCRIPTIONS.get(rn, ""), "title": rn}
-                    content = generate_with_ai_comprehensive(rn, sm, info, model=selected_model)
+                    content = await generate_with_ai_comprehensive(rn, trimmed, info, model=selected_model)
                 else:
-                    content = generate_repo_public_section(rn, sm, section_use_ai, model=selected_model, report_format=report_format)
+                    content = await generate_repo_public_section(rn, trimmed, section_use_ai, model=selected_model, report_format=report_format)
                 return {"project": rn, "title": rn, "content": content}
+            return _stage
 
-            # Use more workers for comprehensive to speed up large reports
-            max_workers = min(15, len(entries)) if report_format == "comprehensive" else min(8, len(entries))
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                sections = list(executor.map(_gen_repo_section, entries))
-        else:
-            for project in project_keys:
-                if project in summaries:
-                    if report_type == "technical":
-                        section = generate_technical_section(project, summaries[project], section_use_ai, model=selected_model)
-                    else:
-                        section = generate_public_section(project, summaries[project], section_use_ai, model=selected_model, report_format=report_format)
-                    sections.append({
-                        "project": project,
-                        "title": f"{section_info[project]['number']}. {section_info[project]['title']}",
-                        "content": section,
-                    })
-
-        if report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}:
-            section = generate_individuals_section(individual_summaries, report_type, use_ai, model=selected_model)
-            if section:
-                sections.append({
-                    "project": "individuals",
-                    "title": f"{SECTION_INFO_INDIVIDUAL_TECHNICAL['number']}. {SECTION_INFO_INDIVIDUAL_TECHNICAL['title']}",
+        for idx, (repo_name, summary) in enumerate(entries):
+            section_stages.append(graph.add(f"section:{idx}", _repo_section_stage(idx, repo_name, summary)))
+    else:
+        def _project_section_stage(index, project):
+            async def _stage():
+                _stream_section_tokens(index)
+                if report_type == "technical":
+                    section = await generate_technical_section(project, summaries[project], section_use_ai, model=selected_model)
+                else:
+                    section = await generate_public_section(project, summaries[project], section_use_ai, model=selected_model, report_format=report_format)
+                return {
+                    "project": project,
+                    "title": f"{section_info[project]['number']}. {section_info[project]['title']}",
                     "content": section,
-                })
+                }
+            return _stage
+
+        for project in project_keys:
+            if project in summaries:
+                section_stages.append(graph.add(f"section:{project}", _project_section_stage(len(section_stages), project)))
+
+    if report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}:
+        async def _individuals_stage():
+            section = await generate_individuals_section(individual_summaries, report_type, use_ai, model=selected_model)
+            if not section:
+                return None
+            return {
+                "project": "individuals",
+                "title": f"{SECTION_INFO_INDIVIDUAL_TECHNICAL['number']}. {SECTION_INFO_INDIVIDUAL_TECHNICAL['title']}",
+                "content": section,
+            }
+
+        section_stages.append(graph.add("section:individuals", _individuals_stage))
 
-        # Generate highlight
-        if highlight_use_ai and not full_report:
-            highlight = generate_highlight_with_ai(
+    # Generate highlight (falls back to the template highlight when a full AI report exists)
+    async def _highlight_stage(full_report_ai=None):
+        if highlight_use_ai and not full_report_ai:
+            return await generate_highlight_with_ai(
                 summaries,
                 report_type,
                 total_commits,
@@ -3001,307 +3658,471 @@ async def generate_report(
                 {"start": start_date, "end": end_date},
                 model=selected_model,
             )
-        else:
-            if report_type == "public":
-                highlight = generate_public_highlight(summaries, total_commits, total_prs, total_repos, scope)
-            else:
-                highlight = generate_technical_highlight(summaries, total_commits, total_prs, total_repos)
+        if report_type == "public":
+            return generate_public_highlight(summaries, total_commits, total_prs, total_repos, scope)
+        return generate_technical_highlight(summaries, total_commits, total_prs, total_repos)
 
-        # For comprehensive format, generate the full report with headline
-        if report_format == "comprehensive" and report_type == "public" and report_grouping == "repository":
-            comprehensive_headline = generate_comprehensive_headline(
+    graph.add("highlight", _highlight_stage, ["full_report_ai"] if "full_report_ai" in graph else [])
+
+    # For comprehensive format, generate the full report with headline
+    if comprehensive_public:
+        async def _headline_stage():
+            return await generate_comprehensive_headline(
                 summaries,
                 {"start": start_date, "end": end_date},
                 model=selected_model,
             )
+
+        async def _comprehensive_report_stage(headline_text, *section_results):
             # Assemble full comprehensive report
-            section_contents = [s.get("content", "") for s in sections]
-            full_report = comprehensive_headline + "\n".join(section_contents)
-
-        model_reports: Dict[str, Dict[str, Any]] = {}
-        if use_ai and multi_model:
-            for candidate in requested_models:
-                report_payload: Dict[str, Any] = {}
-                candidate_full_report = generate_full_report_with_ai(
-                    report_type,
-                    summaries,
-                    individual_summaries,
-                    date_range,
-                    total_commits,
-                    total_prs,
-                    total_repos,
-                    report_grouping,
-                    model=candidate,
-                )
-                if candidate_full_report:
-                    report_payload["full_report"] = candidate_full_report
-
-                candidate_sections = []
-                if report_grouping == "repository":
-                    entries = list(summaries.items())
-                    other_repos = None
-                    if "Other repos" in summaries:
-                        entries = [(name, summary) for name, summary in entries if name != "Other repos"]
-                        other_repos = ("Other repos", summaries["Other repos"])
-                    entries.sort(key=lambda item: item[0].lower())
-                    if other_repos:
-                        entries.append(other_repos)
-                    for repo_name, summary in entries:
-                        summary = trim_summary_for_ai(summary, 12, 6)
-                        if report_type == "technical":
-                            section = generate_repo_technical_section(repo_name, summary, True, model=candidate)
-                        else:
-                            section = generate_repo_public_section(repo_name, summary, True, model=candidate, report_format=report_format)
-                        candidate_sections.append({
-                            "project": repo_name,
-                            "title": repo_name,
-                            "content": section,
-                        })
-                else:
-                    for project in project_keys:
-                        if project in summaries:
-                            if report_type == "technical":
-                                section = generate_technical_section(project, summaries[project], use_ai, model=candidate)
-                            else:
-                                section = generate_public_section(project, summaries[project], use_ai, model=candidate, report_format=report_format)
-                            candidate_sections.append({
-                                "project": project,
-                                "title": f"{section_info[project]['number']}. {section_info[project]['title']}",
-                                "content": section,
-                            })
+            section_contents = [s.get("content", "") for s in section_results if s]
+            return headline_text + "\n".join(section_contents)
 
-                if report_grouping != "repository" and include_individuals and scope in {"monthly", "biweekly"}:
-                    section = generate_individuals_section(individual_summaries, report_type, use_ai, model=candidate)
-                    if section:
-                        candidate_sections.append({
-                            "project": "individuals",
-                            "title": f"{SECTION_INFO_INDIVIDUAL_TECHNICAL['number']}. {SECTION_INFO_INDIVIDUAL_TECHNICAL['title']}",
-                            "content": section,
-                        })
-
-                if highlight_use_ai:
-                    candidate_highlight = generate_highlight_with_ai(
-                        summaries,
-                        report_type,
-                        total_commits,
-                        total_prs,
-                        total_repos,
-                        {"start": start_date, "end": end_date},
-                        model=candidate,
-                    )
-                else:
-                    if report_type == "public":
-                        candidate_highlight = generate_public_highlight(
-                            summaries,
-                            total_commits,
-                            total_prs,
-                            total_repos,
-                            scope,
-                        )
-                    else:
-                        candidate_highlight = generate_technical_highlight(
-                            summaries,
-                            total_commits,
-                            total_prs,
-                            total_repos,
-                        )
-                report_payload.update({
-                    "highlight": candidate_highlight,
-                    "sections": candidate_sections,
-                })
-                model_reports[candidate] = report_payload
-
-        title = ""
-        headline = ""
-        if report_type != "public":
-            title = build_report_title(scope, start_date, end_date, days)
-            headline = build_report_headline(summaries, report_type)
-
-        # --- Language handling ---
-        # Normalize language parameter
-        if language not in ("en", "kr", "both"):
-            language = "en"
-
-        # Korean translations
-        sections_kr = None
-        highlight_kr = None
-        full_report_kr = None
-        sections_en = sections
-        highlight_en = highlight
-        full_report_en = full_report
-
-        if language in ("kr", "both") and use_ai:
-            # Translate full report to Korean
-            if full_report:
-                full_report_kr = translate_report_to_korean(full_report, model=selected_model)
-            # Translate highlight
-            if highlight:
-                highlight_kr = translate_highlight_to_korean(highlight, model=selected_model)
-            # Translate sections
-            if sections:
-                sections_kr_list = []
-                for sec in sections:
-                    kr_content = translate_report_to_korean(sec.get("content", ""), model=selected_model)
-                    sections_kr_list.append({
-                        "project": sec.get("project", ""),
-                        "title": sec.get("title", ""),
-                        "content": kr_content or sec.get("content", ""),
-                    })
-                sections_kr = sections_kr_list
-
-        # For kr-only mode, replace the main fields with Korean versions
-        if language == "kr":
-            if full_report_kr:
-                full_report = full_report_kr
-            if highlight_kr:
-                highlight = highlight_kr
-            if sections_kr:
-                sections = sections_kr
-
-        # HTML output: convert comprehensive markdown to styled HTML
-        html_report = ""
-        if output_format == "html" and report_format == "comprehensive" and report_type == "public":
-            from html_report import generate_html_report
-            report_stats = {
-                "total_commits": total_commits,
-                "total_repos": total_repos,
-                "total_lines_added": sum(s.get('lines_added', 0) for s in summaries.values()),
-                "total_lines_deleted": sum(s.get('lines_deleted', 0) for s in summaries.values()),
-                "total_changes": sum(s.get('total_changes', 0) for s in summaries.values()),
-                "net_change": sum(s.get('net_change', 0) for s in summaries.values()),
-                "total_contributors": len(set(c for s in summaries.values() for c in s.get('contributors', []))),
+        graph.add("headline", _headline_stage)
+        graph.add("full_report", _comprehensive_report_stage, ["headline", *section_stages])
+    elif "full_report_ai" in graph:
+        async def _passthrough(value):
+            return value
+
+        graph.add("full_report", _passthrough, ["full_report_ai"])
+
+    if use_ai and multi_model:
+        async def _model_reports_stage():
+            return await generate_model_reports(
+                requested_models,
+                report_type,
+                report_grouping,
+                report_format,
+                summaries,
+                individual_summaries,
+                project_keys,
+                include_individuals,
+                scope,
+                date_range,
+                total_commits,
+                total_prs,
+                total_repos,
+                highlight_use_ai,
+                use_ai,
+                deadline=compare_deadline or None,
+            )
+
+        graph.add("model_reports", _model_reports_stage)
+
+    # Korean translations start as soon as their English source is ready
+    if translate:
+        inflight_translations: Dict[Tuple[str, str], "asyncio.Task[Optional[str]]"] = {}
+
+        async def _translate(kind, text):
+            if not text:
+                return None
+            translated, reused = await translate_shared(kind, text, selected_model, inflight_translations)
+            if reused:
+                translation_stats["reused"] += 1
+            return translated
+
+        async def _translate_text(text):
+            return await _translate("report", text)
+
+        async def _translate_highlight(text):
+            return await _translate("highlight", text)
+
+        async def _translate_section(sec):
+            if not sec:
+                return None
+            kr_content = await _translate("report", sec.get("content", ""))
+            return {
+                "project": sec.get("project", ""),
+                "title": sec.get("title", ""),
+                "content": kr_content or sec.get("content", ""),
             }
-            html_report = generate_html_report(
-                summaries=summaries,
-                markdown_report=full_report_en or full_report,
-                markdown_report_kr=full_report_kr if language == "both" else None,
-                date_range={"start": start_date, "end": end_date},
+
+        if "full_report" in graph:
+            graph.add("full_report:kr", _translate_text, ["full_report"], pool="translation")
+        graph.add("highlight:kr", _translate_highlight, ["highlight"], pool="translation")
+        for stage in section_stages:
+            graph.add(f"{stage}:kr", _translate_section, [stage], pool="translation")
+        translation_stats["total"] = sum(1 for name in graph.stage_names() if name.endswith(":kr"))
+
+    section_positions.update({stage: idx for idx, stage in enumerate(section_stages)})
+
+    results = await graph.run()
+
+    full_report = results.get("full_report")
+    highlight = results["highlight"]
+    sections = [results[stage] for stage in section_stages if results[stage]]
+    model_reports: Dict[str, Dict[str, Any]] = results.get("model_reports", {})
+
+    title = ""
+    headline = ""
+    if report_type != "public":
+        title = build_report_title(scope, start_date, end_date, days)
+        headline = build_report_headline(summaries, report_type)
+
+    # Korean translations
+    sections_kr = None
+    highlight_kr = None
+    full_report_kr = None
+    sections_en = sections
+    highlight_en = highlight
+    full_report_en = full_report
+
+    if translate:
+        full_report_kr = results.get("full_report:kr")
+        highlight_kr = results.get("highlight:kr")
+        if sections:
+            sections_kr = [results[f"{stage}:kr"] for stage in section_stages if results[stage]]
+
+    # For kr-only mode, replace the main fields with Korean versions
+    if language == "kr":
+        if full_report_kr:
+            full_report = full_report_kr
+        if highlight_kr:
+            highlight = highlight_kr
+        if sections_kr:
+            sections = sections_kr
+
+    # HTML output: convert comprehensive markdown to styled HTML
+    html_report = ""
+    if output_format == "html" and report_format == "comprehensive" and report_type == "public":
+        from html_report import generate_html_report
+        report_stats = {
+            "total_commits": total_commits,
+            "total_repos": total_repos,
+            "total_lines_added": sum(s.get('lines_added', 0) for s in summaries.values()),
+            "total_lines_deleted": sum(s.get('lines_deleted', 0) for s in summaries.values()),
+            "total_changes": sum(s.get('total_changes', 0) for s in summaries.values()),
+            "net_change": sum(s.get('net_change', 0) for s in summaries.values()),
+            "total_contributors": len(set(c for s in summaries.values() for c in s.get('contributors', []))),
+        }
+        html_report = generate_html_report(
+            summaries=summaries,
+            markdown_report=full_report_en or full_report,
+            markdown_report_kr=full_report_kr if language == "both" else None,
+            date_range={"start": start_date, "end": end_date},
+            stats=report_stats,
+            language=language,
+            report_number=report_number,
+            report_title=report_title,
+        )
+
+    # S3 upload + Gmail-safe summary email
+    email_html = ""
+    report_url = ""
+    if html_report:
+        try:
+            from s3_upload import upload_html_to_s3
+            s3_key = "reports/biweekly-{}-{}-{}.html".format(
+                report_number, start_date, end_date
+            )
+            report_url = await asyncio.to_thread(
+                upload_html_to_s3,
+                html_content=html_report,
+                key=s3_key,
+            )
+            from html_report import generate_email_summary_html
+            email_html = generate_email_summary_html(
                 stats=report_stats,
-                language=language,
-                report_number=report_number,
+                date_range={"start": start_date, "end": end_date},
+                report_url=report_url,
                 report_title=report_title,
+                report_number=report_number,
+                markdown_report=full_report_en or full_report,
             )
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            # Non-fatal: report generation still succeeds without email summary
+            email_html = ""
+            report_url = f"S3 upload failed: {e}"
+        emit("html", {
+            "html_report": postprocess_headline(html_report),
+            "email_html": postprocess_headline(email_html),
+            "report_url": report_url,
+        })
+
+    # Build response
+    response_data = {
+        "success": True,
+        "dataset_id": dataset.dataset_id,
+        "report_type": report_type,
+        "report_format": report_format,
+        "report_scope": scope,
+        "report_grouping": report_grouping,
+        "language": language,
+        "model": selected_model,
+        "models": requested_models,
+        "model_reports": model_reports,
+        "date_range": {
+            "start": start_date,
+            "end": end_date,
+            "days": days,
+        },
+        "stats": report_totals,
+        "repo_limit_applied": repo_limit_applied,
+        "repo_count_total": repo_count_total,
+        "repo_count_shown": repo_count_shown,
+        "highlight": highlight,
+        "title": title,
+        "headline": headline,
+        "full_report": full_report,
+        "html_report": html_report,
+        "email_html": email_html,
+        "report_url": report_url,
+        "output_format": output_format,
+        "sections": sections,
+        "summaries": summaries,
+        "members": members,
+    }
+
+    # Add bilingual fields for "both" mode
+    if language == "both":
+        response_data["sections_en"] = sections_en
+        response_data["sections_kr"] = sections_kr
+        response_data["highlight_en"] = highlight_en
+        response_data["highlight_kr"] = highlight_kr
+        response_data["full_report_en"] = full_report_en
+        response_data["full_report_kr"] = full_report_kr
+    if translate:
+        response_data["translations"] = translation_stats
+
+    # Apply Kevin's branding rules to headline/title/highlight (not section content)
+    for key in ['full_report', 'highlight', 'headline', 'title',
+                 'html_report', 'email_html',
+                 'full_report_en', 'full_report_kr',
+                 'highlight_en', 'highlight_kr']:
+        if key in response_data and isinstance(response_data[key], str):
+            response_data[key] = postprocess_headline(response_data[key])
+    return response_data
+
 
-        # S3 upload + Gmail-safe summary email
-        email_html = ""
-        report_url = ""
-        if html_report:
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _sse_json_default(value: Any) -> Any:
+    try:
+        return record_json_default(value)
+    except TypeError:
+        return str(value)
+
+
+def sse_event(event: str, data: Any) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=_sse_json_default)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def stream_report_events(dataset: Dataset, options: Dict[str, Any]) -> AsyncIterator[str]:
+    """Run _do_generate and yield its progress as SSE, with keep-alive comments while idle."""
+    queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue()
+
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        queue.put_nowait((event, data))
+
+    async def run() -> None:
+        try:
+            emit("done", await _do_generate(dataset, emit=emit, **options))
+        except HTTPException as exc:
+            emit("error", {"status_code": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            import traceback
+            traceback.print_exc()
+            emit("error", {"status_code": 500, "detail": str(exc)})
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.ensure_future(run())
+    try:
+        while True:
             try:
-                from s3_upload import upload_html_to_s3
-                s3_key = "reports/biweekly-{}-{}-{}.html".format(
-                    report_number, start_date, end_date
-                )
-                report_url = upload_html_to_s3(
-                    html_content=html_report,
-                    key=s3_key,
-                )
-                from html_report import generate_email_summary_html
-                email_html = generate_email_summary_html(
-                    stats=report_stats,
-                    date_range={"start": start_date, "end": end_date},
-                    report_url=report_url,
-                    report_title=report_title,
-                    report_number=report_number,
-                    markdown_report=full_report_en or full_report,
-                )
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                # Non-fatal: report generation still succeeds without email summary
-                email_html = ""
-                report_url = f"S3 upload failed: {e}"
-
-        # Build response
-        response_data = {
-            "success": True,
+                item = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            yield sse_event(*item)
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _run_report_job(options: Dict[str, Any], dataset: Dataset, progress: ReportEmitter) -> Dict[str, Any]:
+    bypass_llm_cache.set(bool(options.get("no_cache")))
+    generate_options = {key: value for key, value in options.items() if key not in ("no_cache", "dataset_id")}
+    new_llm_flow("job")
+    return await _do_generate(dataset, emit=progress, stream_tokens=False, **generate_options)
+
+
+def _encode_report(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=record_json_default)
+
+
+_report_jobs: Optional[JobQueue] = None
+_report_jobs_lock = threading.Lock()
+
+
+def get_report_jobs() -> JobQueue:
+    global _report_jobs
+    with _report_jobs_lock:
+        if _report_jobs is None:
+            _report_jobs = job_queue_from_env(_run_report_job, _encode_report)
+        return _report_jobs
+
+
+@app.on_event("startup")
+async def start_report_jobs() -> None:
+    # Opening the SQLite store and failing interrupted jobs blocks; keep it off the loop
+    jobs = await asyncio.to_thread(get_report_jobs)
+    jobs.start()
+
+
+@app.on_event("shutdown")
+async def stop_report_jobs() -> None:
+    if _report_jobs is not None:
+        await _report_jobs.stop()
+
+
+@app.on_event("shutdown")
+async def close_pooled_llm_clients() -> None:
+    await close_llm_clients()
+
+
+@app.post("/api/generate")
+async def generate_report(
+    file: Optional[UploadFile] = File(None),
+    dataset_id: Optional[str] = Form(None),
+    report_type: str = Form("technical"),
+    use_ai: bool = Form(True),
+    model: Optional[str] = Form(None),
+    models: Optional[str] = Form(None),
+    report_scope: str = Form("auto"),
+    project_filter: str = Form("all"),
+    member_filter: str = Form("all"),
+    include_individuals: bool = Form(True),
+    report_grouping: str = Form("project"),
+    repo_limit: int = Form(0),
+    report_format: str = Form("concise"),
+    output_format: str = Form("markdown"),
+    language: str = Form("en"),
+    report_number: int = Form(2),
+    report_title: str = Form(""),
+    no_cache: bool = Form(False),
+    compare_deadline: int = Form(0),
+    stream: bool = Form(False),
+    background: bool = Form(False),
+):
+    """Generate report from uploaded CSV file.
+
+    With ``stream=true`` the report is delivered as Server-Sent Events: ``stats``
+    first, then ``section``/``highlight``/``full_report``/``translation``/
+    ``model_reports``/``html`` as they finish, and ``done`` with the full payload.
+    With ``background=true`` the report is queued as a job and a job id is
+    returned at once; see /api/jobs.
+    """
+    if compare_deadline < 0:
+        raise HTTPException(status_code=400, detail="compare_deadline must be 0 (server default) or a positive number of seconds")
+    try:
+        refresh_env()
+        bypass_llm_cache.set(no_cache)
+        dataset = await resolve_dataset(file, dataset_id)
+        options = {
             "report_type": report_type,
-            "report_format": report_format,
-            "report_scope": scope,
+            "use_ai": use_ai,
+            "model": model,
+            "models": models,
+            "report_scope": report_scope,
+            "project_filter": project_filter,
+            "member_filter": member_filter,
+            "include_individuals": include_individuals,
             "report_grouping": report_grouping,
-            "language": language,
-            "model": selected_model,
-            "models": requested_models,
-            "model_reports": model_reports,
-            "date_range": {
-                "start": start_date,
-                "end": end_date,
-                "days": days,
-            },
-            "stats": {
-                "total_commits": total_commits,
-                "total_prs": total_prs,
-                "total_repos": total_repos,
-                "total_lines_added": sum(s.get('lines_added', 0) for s in summaries.values()),
-                "total_lines_deleted": sum(s.get('lines_deleted', 0) for s in summaries.values()),
-                "total_changes": sum(s.get('total_changes', 0) for s in summaries.values()),
-                "net_change": sum(s.get('net_change', 0) for s in summaries.values()),
-                "total_contributors": len(set(c for s in summaries.values() for c in s.get('contributors', []))),
-            },
-            "repo_limit_applied": repo_limit_applied,
-            "repo_count_total": repo_count_total,
-            "repo_count_shown": repo_count_shown,
-            "highlight": highlight,
-            "title": title,
-            "headline": headline,
-            "full_report": full_report,
-            "html_report": html_report,
-            "email_html": email_html,
-            "report_url": report_url,
+            "repo_limit": repo_limit,
+            "report_format": report_format,
             "output_format": output_format,
-            "sections": sections,
-            "summaries": summaries,
-            "members": members,
+            "language": language,
+            "report_number": report_number,
+            "report_title": report_title,
+            "compare_deadline": compare_deadline,
         }
+        if background:
+            jobs = get_report_jobs()
+            try:
+                job_id = await jobs.submit({**options, "no_cache": no_cache, "dataset_id": dataset.dataset_id}, dataset)
+            except JobQueueFull as exc:
+                raise HTTPException(status_code=503, detail=str(exc))
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "job_id": job_id,
+                    "status": "queued",
+                    "dataset_id": dataset.dataset_id,
+                    "status_url": f"/api/jobs/{job_id}",
+                    "result_url": f"/api/jobs/{job_id}/result",
+                    "queue": jobs.depth(),
+                },
+            )
+        if stream:
+            return StreamingResponse(
+                stream_report_events(dataset, options),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        return ReportJSONResponse(await _do_generate(dataset, **options))
 
-        # Add bilingual fields for "both" mode
-        if language == "both":
-            response_data["sections_en"] = sections_en
-            response_data["sections_kr"] = sections_kr
-            response_data["highlight_en"] = highlight_en
-            response_data["highlight_kr"] = highlight_kr
-            response_data["full_report_en"] = full_report_en
-            response_data["full_report_kr"] = full_report_kr
-
-        # ============================================================
-        # POST-PROCESSING: Kevin's branding rules for headline/summary
-        # - "Repositories" → "Projects" in headline/title only
-        # - Per-repo tables keep full detail (Commits, Contributors,
-        #   Lines Added/Deleted, Net Change) — matches #2 format
-        # ============================================================
-        def _postprocess_headline(text: str) -> str:
-            if not text:
-                return text
-            import re
-            text = text.replace('Active Repositories', 'Active Projects')
-            text = text.replace('active repositories', 'active projects')
-            text = re.sub(r'(\d+) Repositories', r'\1 Projects', text)
-            text = re.sub(r'(\d+) repositories', r'\1 projects', text)
-            return text
-
-        # Apply only to headline/title/highlight (not section content)
-        for key in ['full_report', 'highlight', 'headline', 'title',
-                     'html_report', 'email_html',
-                     'full_report_en', 'full_report_kr',
-                     'highlight_en', 'highlight_kr']:
-            if key in response_data and isinstance(response_data[key], str):
-                response_data[key] = _postprocess_headline(response_data[key])
-
-        return JSONResponse(response_data)
-
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/jobs")
+async def list_report_jobs(limit: int = 20):
+    jobs = get_report_jobs()
+    listed = await asyncio.to_thread(jobs.store.list, max(1, min(limit, 200)))
+    return {"jobs": listed, "queue": jobs.depth()}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    job = await get_report_jobs().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    return job
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_report_job_result(job_id: str):
+    jobs = get_report_jobs()
+    job = await asyncio.to_thread(jobs.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    if job["status"] != JOB_SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Report job is {job['status']}" + (f": {job['error']}" if job["error"] else ""))
+    result = await asyncio.to_thread(jobs.store.result, job_id)
+    return Response(content=result or "{}", media_type="application/json")
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_report_job(job_id: str):
+    job = await get_report_jobs().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    return job
+
+
 @app.get("/api/health")
 async def health_check():
+    llm_cache = get_llm_response_cache()
     return {
         "status": "healthy",
         "anthropic_available": HAS_ANTHROPIC,
         "tokamak_available": has_tokamak_client(),
         "tokamak_models": get_tokamak_models() or [get_tokamak_model()],
         "api_key_set": bool(get_tokamak_api_key()),
+        "llm_cache": llm_cache.stats() if llm_cache is not None else None,
+        "llm_queue": llm_governor.snapshot(),
+        "tokamak_apis": {model: api for model, (api, _) in _tokamak_api_capabilities.items()},
     }
 
 
@@ -3330,9 +4151,11 @@ async def review_report(
     previous_score: Optional[int] = Form(None),
     previous_summary: Optional[str] = Form(None),
     is_improved: Optional[str] = Form(None),
+    no_cache: bool = Form(False),
 ):
     """Review a generated report using a virtual reviewer persona."""
     refresh_env()
+    bypass_llm_cache.set(no_cache)
 
     persona = None
     for p in REVIEWER_PERSONAS:
@@ -3476,7 +4299,7 @@ IMPORTANT:
     # Use higher token budget for reviews with original_text/revised_text fields
     review_max_tokens = 4500
     llm_errors: List[str] = []
-    response = generate_with_llm(prompt, max_tokens=review_max_tokens, model=selected_model, timeout_override=review_timeout, errors=llm_errors)
+    response = await generate_with_llm(prompt, max_tokens=review_max_tokens, model=selected_model, timeout_override=review_timeout, errors=llm_errors)
 
     if not response:
         error_detail = "; ".join(llm_errors) if llm_errors else "All AI providers failed"
@@ -3624,7 +4447,7 @@ Respond with this exact JSON format:
 
 Give 2-3 issues and 2 strengths. IMPORTANT: In original_text and revised_text, preserve all markdown syntax (#, **, *, [], (), - etc.) exactly as it appears in the report. Start with {{ end with }}."""
 
-        retry_response = generate_with_llm(retry_prompt, max_tokens=2000, model=selected_model, timeout_override=retry_timeout)
+        retry_response = await generate_with_llm(retry_prompt, max_tokens=2000, model=selected_model, timeout_override=retry_timeout)
         if retry_response:
             retry_cleaned = retry_response.strip()
             if "```" in retry_cleaned:
@@ -3675,6 +4498,32 @@ Give 2-3 issues and 2 strengths. IMPORTANT: In original_text and revised_text, p
     })
 
 
+IMPROVE_FAILED_MESSAGE = "Failed to improve report. The AI model may have timed out. Try again or use a different model."
+
+
+async def stream_improvement_events(prompt: str, max_tokens: int, model: str, timeout: int, reviews_applied: int) -> AsyncIterator[str]:
+    """Yield an improvement as SSE ``token`` events followed by ``done`` (or ``error``)."""
+    chunks: List[str] = []
+    try:
+        async for delta in stream_with_llm(prompt, max_tokens=max_tokens, model=model, timeout_override=timeout):
+            chunks.append(delta)
+            yield sse_event("token", {"delta": delta})
+    except LLMStreamError as exc:
+        yield sse_event("error", {"success": False, "error": f"Generation stopped mid-stream: {exc}"})
+        return
+
+    improved = "".join(chunks).strip()
+    if not improved:
+        yield sse_event("error", {"success": False, "error": IMPROVE_FAILED_MESSAGE})
+        return
+    yield sse_event("done", {
+        "success": True,
+        "improved_report": improved,
+        "model": model,
+        "reviews_applied": reviews_applied,
+    })
+
+
 @app.post("/api/improve")
 async def improve_report(
     report_text: str = Form(...),
@@ -3682,11 +4531,18 @@ async def improve_report(
     reviews_json: str = Form("[]"),
     model: Optional[str] = Form(None),
     report_format: str = Form("concise"),
+    no_cache: bool = Form(False),
+    stream: bool = Form(False),
 ):
-    """Improve a report based on reviewer feedback."""
+    """Improve a report based on reviewer feedback.
+
+    With ``stream=true`` the improved text is sent as SSE ``token`` events as it
+    is generated, ending with ``done`` or ``error``.
+    """
     import json as _json
 
     refresh_env()
+    bypass_llm_cache.set(no_cache)
 
     try:
         reviews = _json.loads(reviews_json)
@@ -3781,12 +4637,18 @@ You are a senior technical writer at a blockchain company. Your task is to impro
     # Use 5 minutes minimum to handle slower models
     improve_timeout = max(get_model_timeout(selected_model) * 4, 300)
     improve_max_tokens = 6000
-    improved = generate_with_llm(prompt, max_tokens=improve_max_tokens, model=selected_model, timeout_override=improve_timeout)
+    if stream:
+        return StreamingResponse(
+            stream_improvement_events(prompt, improve_max_tokens, selected_model, improve_timeout, len(reviews)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    improved = await generate_with_llm(prompt, max_tokens=improve_max_tokens, model=selected_model, timeout_override=improve_timeout)
 
     if not improved:
         return JSONResponse({
             "success": False,
-            "error": "Failed to improve report. The AI model may have timed out. Try again or use a different model.",
+            "error": IMPROVE_FAILED_MESSAGE,
         })
 
     return JSONResponse({
@@ -3805,9 +4667,11 @@ You are a senior technical writer at a blockchain company. Your task is to impro
 async def generate_podcast_script(
     report_text: str = Form(...),
     duration_minutes: int = Form(4),
+    no_cache: bool = Form(False),
 ):
     """Generate a 2-person podcast dialogue script from the report."""
     refresh_env()
+    bypass_llm_cache.set(no_cache)
 
     # Use Claude for script generation (better at creative dialogue)
     prompt = f"""You are a podcast script writer. Convert this blockchain development report into an engaging 2-person podcast dialogue.
@@ -3828,7 +4692,7 @@ async def generate_podcast_script(
 [Podcast Script]"""
 
     selected_model = get_tokamak_model()
-    script = generate_with_llm(prompt, max_tokens=3000, model=selected_model, timeout_override=120)
+    script = await generate_with_llm(prompt, max_tokens=3000, model=selected_model, timeout_override=120)
 
     if not script:
         return JSONResponse({
@@ -3869,7 +4733,7 @@ async def generate_podcast_audio(
 
     try:
         # Use Tokamak API endpoint for TTS
-        client = OpenAI(base_url=get_tokamak_base_url(), api_key=api_key)
+        client = get_openai_client(get_tokamak_base_url(), api_key)
 
         # Parse script into speaker segments
         lines = script.strip().split('\n')
@@ -3899,12 +4763,15 @@ async def generate_podcast_audio(
             if not text:
                 continue
             try:
-                response = client.audio.speech.create(
-                    model="tts-1",
-                    voice=voice,
-                    input=text,
-                    response_format="mp3"
-                )
+                # Audio has its own provider budget and no AIMD window, so slow speech
+                # synthesis never holds back or shrinks the chat models' concurrency
+                async with llm_governor.slot("tokamak-tts", "tts-1"):
+                    response = await client.audio.speech.create(
+                        model="tts-1",
+                        voice=voice,
+                        input=text,
+                        response_format="mp3"
+                    )
                 audio_chunks.append(response.content)
             except Exception as e:
                 print(f"[PODCAST] TTS error for segment: {e}")
@@ -3951,8 +4818,8 @@ VERIFY_STOP_WORDS = {
 }
 
 
-def _parse_csv_ground_truth(content: str, report_grouping: str) -> Dict[str, Dict[str, Any]]:
-    """Parse CSV into per-repo (or per-project) ground truth."""
+def _parse_csv_ground_truth(export: ActivityExport, report_grouping: str) -> Dict[str, Dict[str, Any]]:
+    """Build per-repo (or per-project) ground truth from an ingested export."""
     groups: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
         "commits": 0,
         "contributors": set(),
@@ -3960,43 +4827,27 @@ def _parse_csv_ground_truth(content: str, report_grouping: str) -> Dict[str, Dic
         "lines_added": 0,
         "lines_deleted": 0,
     })
-    reader = csv.DictReader(io.StringIO(content))
-    for row in reader:
-        if row.get("source") != "github":
-            continue
-        repo = row.get("repository", "").strip('"')
-        if not repo:
-            continue
-        entry_type = row.get("type", "")
-        if entry_type != "commit":
-            continue
-        message = (row.get("message") or "").strip('"')
-        if message.lower().startswith("merge "):
-            continue
-
-        if report_grouping == "repository":
-            key = repo
-        else:
-            key = get_project_for_repo(repo) or repo
-
-        member_name = row.get("member_name", "").strip('"')
-        member_email = row.get("member_email", "").strip('"')
-        mid, mlabel = normalize_member_identity(member_name, member_email)
+    repo_names = export.repo_names.values
+    if report_grouping == "repository":
+        group_keys = list(repo_names)
+    else:
+        routes = repo_routes()
+        group_keys = [routes.project(repo) or repo for repo in repo_names]
+    member_ids = export.member_ids.values
 
-        g = groups[key]
+    for i in range(len(export)):
+        if export.kind[i] != KIND_COMMIT:
+            continue
+        g = groups[group_keys[export.repo[i]]]
         g["commits"] += 1
-        if mid:
-            g["contributors"].add(mid)
+        member_idx = export.member[i]
+        if member_idx >= 0:
+            g["contributors"].add(member_ids[member_idx])
+        message = export.text[i]
         if message:
-            g["messages"].append(message.split("\n")[0][:200].lower())
-        try:
-            g["lines_added"] += int(row.get("additions") or 0)
-        except (ValueError, TypeError):
-            pass
-        try:
-            g["lines_deleted"] += int(row.get("deletions") or 0)
-        except (ValueError, TypeError):
-            pass
+            g["messages"].append(message.lower())
+        g["lines_added"] += export.additions[i]
+        g["lines_deleted"] += export.deletions[i]
 
     # Convert sets to counts for JSON serialization
     result: Dict[str, Dict[str, Any]] = {}
@@ -4087,16 +4938,19 @@ def _check_phantom_feature(bullet: str, messages: List[str]) -> bool:
 
 @app.post("/api/verify")
 async def verify_report(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     report_text: str = Form(...),
     report_grouping: str = Form("repository"),
+    dataset_id: Optional[str] = Form(None),
 ):
     """Verify a generated report against the source CSV for hallucinations."""
     try:
-        content = await file.read()
-        content_str = content.decode("utf-8")
-
-        ground_truth = _parse_csv_ground_truth(content_str, report_grouping)
+        dataset = await resolve_dataset(file, dataset_id)
+        ground_truth = await dataset_memo(
+            dataset,
+            ("ground_truth", report_grouping),
+            lambda: _parse_csv_ground_truth(dataset.export, report_grouping),
+        )
         report_sections = _parse_report_sections(report_text)
 
         details = []
@@ -4181,6 +5035,7 @@ async def verify_report(
 
         return JSONResponse({
             "success": True,
+            "dataset_id": dataset.dataset_id,
             "summary": {
                 "total_repos_checked": total_repos_checked,
                 "repos_with_stat_issues": repos_with_stat_issues,
@@ -4192,6 +5047,8 @@ async def verify_report(
             "details": details,
             "overall_grade": grade,
         })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4274,31 +5131,30 @@ Include ALL repositories. Generate 3-6 synergies. Be specific and actionable in
 
 @app.post("/api/classify")
 async def classify_ecosystem(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     model: Optional[str] = Form(None),
+    dataset_id: Optional[str] = Form(None),
+    no_cache: bool = Form(False),
 ):
     """Classify all repos from CSV into domains, identify synergies, and generate a blueprint."""
     global _classification_cache
     try:
         refresh_env()
-        content = await file.read()
-        content_str = content.decode("utf-8")
-
-        parsed = parse_csv_content(content_str)
-        repo_data = parsed["repos"]
+        bypass_llm_cache.set(no_cache)
+        dataset = await resolve_dataset(file, dataset_id)
+        repo_messages = await dataset_memo(dataset, "commit_messages", dataset.export.commit_messages_by_repo)
 
-        if not repo_data:
+        if not repo_messages:
             raise HTTPException(status_code=400, detail="No repository data found in CSV")
 
         # Build per-repo activity summary
         repo_activity = []
-        for repo_name, payload in repo_data.items():
-            commits = payload.get("commits", [])
+        for repo_name, commit_messages in repo_messages.items():
             messages = []
-            for c in commits:
-                msg = (c.get("message") or "").strip()
+            for msg in commit_messages:
+                msg = msg.strip()
                 if msg and not msg.lower().startswith("merge "):
-                    messages.append(msg.split("\n")[0][:120])
+                    messages.append(msg[:120])
             commit_count = len(messages)
             repo_activity.append({
                 "name": repo_name,
@@ -4315,7 +5171,7 @@ async def classify_ecosystem(
         import json as _json
 
         errors: List[str] = []
-        response = generate_with_llm(
+        response = await generate_with_llm(
             prompt,
             max_tokens=8000,
             model=selected_model,
@@ -4392,6 +5248,7 @@ async def classify_ecosystem(
             "blueprint": result["blueprint"],
             "model": selected_model,
             "repo_count": len(repo_activity),
+            "dataset_id": dataset.dataset_id,
         }
 
         return JSONResponse(_classification_cache)
@@ -4427,9 +5284,9 @@ async def get_cached_domains():
 
     # Add other known repos
     other_repos = []
+    routes = repo_routes()
     for repo, desc in REPO_DESCRIPTIONS.items():
-        found = any(repo in repos for repos in PROJECT_REPOS.values())
-        if not found:
+        if routes.project(repo) is None:
             other_repos.append({"name": repo, "description": desc, "activity_level": "unknown"})
 
     domains = []
@@ -4452,8 +5309,9 @@ async def get_cached_domains():
 
 @app.post("/api/infographic")
 async def generate_infographic(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     classification: Optional[str] = Form(None),
+    dataset_id: Optional[str] = Form(None),
 ):
     """Generate an ecosystem infographic HTML page from CSV data.
 
@@ -4462,33 +5320,16 @@ async def generate_infographic(
       - ``synergies``: list of synergy objects (see infographic module)
       - ``blueprint``: roadmap/blueprint object (see infographic module)
     If omitted, built-in defaults are used for all three layers.
+    Either ``file`` or a ``dataset_id`` from an earlier upload is required.
     """
     from infographic import classify_repos_from_csv, generate_infographic_html, DEFAULT_DESCRIPTIONS
+    import json
     try:
-        content = await file.read()
-        content_str = content.decode("utf-8")
-
-        # Parse CSV to get repo commit counts and contributors
-        repo_commits: Dict[str, int] = defaultdict(int)
-        repo_contributors: Dict[str, Set[str]] = defaultdict(set)
-        reader = csv.DictReader(io.StringIO(content_str))
-        for row in reader:
-            if row.get("source") != "github":
-                continue
-            repo = row.get("repository", "").strip('"')
-            if not repo:
-                continue
-            if row.get("type") == "commit":
-                msg = (row.get("message") or "").strip('"')
-                if msg and not msg.lower().startswith("merge "):
-                    repo_commits[repo] += 1
-                    member = (row.get("member_name") or "").strip()
-                    if member:
-                        repo_contributors[repo].add(member)
-        # Convert sets to sorted lists
-        repo_contribs_list: Dict[str, List[str]] = {
-            repo: sorted(contribs) for repo, contribs in repo_contributors.items()
-        }
+        # Repo commit counts, contributors and date range all come from one ingestion pass
+        dataset = await resolve_dataset(file, dataset_id)
+        export = dataset.export
+        repo_commits = await dataset_memo(dataset, "repo_commit_counts", export.repo_commit_counts)
+        repo_contribs_list = await dataset_memo(dataset, "repo_contributor_names", export.repo_contributor_names)
 
         # Parse optional classification (may contain domains, synergies, blueprint)
         cat_map = None
@@ -4510,8 +5351,7 @@ async def generate_infographic(
                 pass
 
         # Detect date range
-        parsed = parse_csv_content(content_str)
-        _, start_date, end_date, _ = detect_scope_from_timestamps(parsed["timestamps"])
+        _, start_date, end_date, _ = detect_scope_from_timestamps(export.timestamp_bounds())
         date_range = {"start": start_date, "end": end_date}
 
         # Classify and generate
@@ -4525,7 +5365,9 @@ async def generate_infographic(
         )
 
         from fastapi.responses import HTMLResponse
-        return HTMLResponse(content=html)
+        return HTMLResponse(content=html, headers={"X-Dataset-Id": dataset.dataset_id})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,115 @@
+"""
+Member identity resolution.
+
+The same person often commits under several identities: a work and a
+personal email, or a GitHub noreply address. IdentityResolver links those
+aliases with a union-find index seeded from github_members.json
+(member_id -> GitHub username), so every alias resolves to one member_id.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+GITHUB_MEMBERS_PATH = os.path.join(os.path.dirname(__file__), "github_members.json")
+
+_NOREPLY_EMAIL = re.compile(r"^(?:\d+\+)?(?P<user>[^@]+)@users\.noreply\.github\.com$")
+
+
+def load_github_members(path: str = GITHUB_MEMBERS_PATH) -> Dict[str, str]:
+    """Load the member_id -> GitHub username mapping, {} when missing or invalid."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+GITHUB_MEMBERS: Dict[str, str] = load_github_members()
+
+
+class IdentityResolver:
+    """Union-find over member ids, email addresses and GitHub usernames.
+
+    Nodes are "id:<member_id>", "email:<address>" and "gh:<username>". Each
+    set's canonical member_id is the seeded one when the set contains a
+    github_members.json entry, otherwise the first member_id added to it.
+    Aliases are linked only through email addresses and GitHub usernames
+    (noreply addresses, or an email local part that is a seeded username);
+    display names are never compared, so two people who share a first name
+    stay apart.
+    """
+
+    def __init__(self, github_members: Optional[Dict[str, str]] = None) -> None:
+        self._parent: Dict[str, str] = {}
+        self._canonical: Dict[str, Optional[str]] = {}  # root -> canonical member_id
+        self._seeded: set = set()
+        self._order: Dict[str, int] = {}  # member_id -> insertion order, for the tie-break
+        self._usernames: set = set()  # seeded GitHub usernames
+        for member_id, username in (GITHUB_MEMBERS if github_members is None else github_members).items():
+            member_id = member_id.lower()
+            self._seeded.add(member_id)
+            self._usernames.add(username.lower())
+            self._union(self._id_node(member_id), f"gh:{username.lower()}")
+
+    def _id_node(self, member_id: str) -> str:
+        node = f"id:{member_id}"
+        if node not in self._parent:
+            self._parent[node] = node
+            self._canonical[node] = member_id
+            self._order[member_id] = len(self._order)
+        return node
+
+    def _node(self, node: str) -> str:
+        if node not in self._parent:
+            self._parent[node] = node
+            self._canonical[node] = None
+        return node
+
+    def _find(self, node: str) -> str:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(self._node(a)), self._find(self._node(b))
+        if root_a == root_b:
+            return
+        canon_a, canon_b = self._canonical[root_a], self._canonical[root_b]
+        # Keep the root whose canonical id is seeded, else the one whose id was added first
+        if self._canonical_rank(canon_b) < self._canonical_rank(canon_a):
+            root_a, root_b = root_b, root_a
+            canon_a, canon_b = canon_b, canon_a
+        self._parent[root_b] = root_a
+        self._canonical[root_a] = canon_a
+        del self._canonical[root_b]
+
+    def _canonical_rank(self, member_id: Optional[str]) -> Tuple[int, int]:
+        if member_id is None:
+            return (2, 0)
+        return (0 if member_id in self._seeded else 1, self._order[member_id])
+
+    def add(self, member_id: str, member_name: str, member_email: str) -> None:
+        """Record one (name, email) identity that normalized to ``member_id`` and link its aliases."""
+        if not member_id:
+            return
+        node = self._id_node(member_id)
+        email = (member_email or "").strip('"').strip().lower()
+        if email:
+            self._union(node, f"email:{email}")
+            noreply = _NOREPLY_EMAIL.match(email)
+            if noreply:
+                self._union(node, f"gh:{noreply.group('user')}")
+        # An email local part that is exactly a seeded GitHub username
+        local = email.split("@")[0] if "@" in email else ""
+        if local in self._usernames:
+            self._union(node, f"gh:{local}")
+
+    def canonical_id(self, member_id: str) -> str:
+        node = f"id:{member_id}"
+        if node not in self._parent:
+            return member_id
+        return self._canonical[self._find(node)] or member_id
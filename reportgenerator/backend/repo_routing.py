@@ -0,0 +1,121 @@
+"""
+Repository routing table.
+
+Maps a repository name to its report project, infographic category and
+description with one dict lookup. Tables are built once per configuration
+(PROJECT_REPOS, a domain classification, a description map) and reused while
+the same config objects are passed in; repos that are not listed explicitly
+are classified by name heuristics once and memoized. Configs are compared by
+identity, so code that edits one in place must call clear_routing_tables().
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_CATEGORY = "Platform & Services"
+
+# Name heuristics for repos missing from the classification, checked in order
+CATEGORY_KEYWORDS: Sequence[Tuple[str, Tuple[str, ...]]] = (
+    ("Privacy & ZK", ("zk", "priv", "proof", "snark")),
+    ("DeFi & Staking", ("stak", "ton-", "swap", "defi", "bridge", "airdrop")),
+    ("Core Infrastructure", ("thanos", "rollup", "node", "geth", "l1", "fraud", "dispute")),
+    ("Platform & Services", ("trh", "platform", "hub", "desktop")),
+    ("Data & Analytics", ("data", "report", "analyt", "monitor", "explorer")),
+    ("AI & Machine Learning", ("sentinai", "ai-layer", "ai-agent", "ml", "ai-kit")),
+    ("Automation & Tooling", ("auto", "bot", "agent", "script", "tool", "cli", "setup")),
+    ("Gaming & Social", ("game", "social", "nft", "market", "tokamon", "zodiac")),
+    ("Governance", ("dao", "gov", "vote", "proposal")),
+    ("Research & Education", ("research", "paper", "doc", "learn", "study", "whitepaper")),
+)
+
+MAX_ROUTING_TABLES = 8
+
+
+def heuristic_category(repo_name: str) -> str:
+    name_lower = repo_name.lower()
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(k in name_lower for k in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+
+class RepoRoute(NamedTuple):
+    project: Optional[str]
+    category: str
+    description: Optional[str]
+
+
+class RepoRoutingTable:
+    """Reverse index of repo -> RepoRoute for one configuration."""
+
+    def __init__(
+        self,
+        project_repos: Dict[str, List[str]],
+        classification: Optional[Dict[str, List[str]]] = None,
+        descriptions: Optional[Dict[str, str]] = None,
+    ) -> None:
+        # First listing wins, matching the order the config is written in
+        self._projects: Dict[str, str] = {}
+        for project, repos in project_repos.items():
+            for repo in repos:
+                self._projects.setdefault(repo, project)
+        self._categories: Dict[str, str] = {}
+        for category, repos in (classification or {}).items():
+            for repo in repos:
+                self._categories.setdefault(repo, category)
+        self._descriptions = dict(descriptions or {})
+        self._routes: Dict[str, RepoRoute] = {}
+
+    def route(self, repo_name: str) -> RepoRoute:
+        route = self._routes.get(repo_name)
+        if route is None:
+            category = self._categories.get(repo_name)
+            route = RepoRoute(
+                self._projects.get(repo_name),
+                category if category is not None else heuristic_category(repo_name),
+                self._descriptions.get(repo_name),
+            )
+            self._routes[repo_name] = route
+        return route
+
+    def project(self, repo_name: str) -> Optional[str]:
+        return self._projects.get(repo_name)
+
+    def category(self, repo_name: str) -> str:
+        return self.route(repo_name).category
+
+    def description(self, repo_name: str) -> Optional[str]:
+        return self._descriptions.get(repo_name)
+
+
+# (id(project_repos), id(classification), id(descriptions)) -> (those configs, table). The configs
+# are kept so their ids cannot be reused by other objects while the entry lives.
+_tables: "OrderedDict[Tuple[int, int, int], Tuple[Tuple[Any, ...], RepoRoutingTable]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def get_routing_table(
+    project_repos: Dict[str, List[str]],
+    classification: Optional[Dict[str, List[str]]] = None,
+    descriptions: Optional[Dict[str, str]] = None,
+) -> RepoRoutingTable:
+    """Return the table for these config objects, building it only the first time they are seen."""
+    config = (project_repos, classification, descriptions)
+    key = (id(project_repos), id(classification), id(descriptions))
+    with _tables_lock:
+        entry = _tables.get(key)
+        if entry is not None:
+            _tables.move_to_end(key)
+            return entry[1]
+        table = RepoRoutingTable(project_repos, classification, descriptions)
+        _tables[key] = (config, table)
+        while len(_tables) > MAX_ROUTING_TABLES:
+            _tables.popitem(last=False)
+        return table
+
+
+def clear_routing_tables() -> None:
+    """Drop every cached table; call after editing a routing config in place."""
+    with _tables_lock:
+        _tables.clear()
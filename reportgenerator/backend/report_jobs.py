@@ -0,0 +1,347 @@
+"""
+Background report jobs.
+
+A comprehensive bilingual report can take many minutes, longer than a proxy
+will hold an HTTP request open. Jobs decouple the two: submitting returns a
+job id immediately, a bounded pool of workers on the server's event loop
+runs the report, and clients poll for status/progress, fetch the result or
+cancel. Job state, throttled progress and results are persisted to SQLite,
+so they outlive the submitting client and can be read from another
+process; jobs that were still queued or running when the server stopped
+are marked failed on the next start.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional
+
+DEFAULT_REPORT_JOBS_PATH = str(Path(__file__).resolve().parent / ".report_jobs.sqlite3")
+DEFAULT_REPORT_JOB_WORKERS = 2
+DEFAULT_REPORT_JOB_QUEUE_SIZE = 32
+DEFAULT_REPORT_JOB_TTL = 7 * 24 * 3600
+PROGRESS_FLUSH_SECONDS = 2.0  # Persist progress at most this often, plus once per new stage
+CANCEL_WAIT_SECONDS = 5.0  # How long cancel() waits for a running job to unwind
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+JobRunner = Callable[[Dict[str, Any], Any, ProgressCallback], Awaitable[Any]]
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+def _create_isolated_task(loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, Any]) -> "asyncio.Task[Any]":
+    """Create a task that starts from an empty contextvars.Context instead of the caller's.
+
+    create_task copies the current context; running it inside a fresh Context
+    gives the same result as Python 3.11's ``context=`` argument on 3.9.
+    """
+    return contextvars.Context().run(loop.create_task, coro)
+
+
+class JobStore:
+    """SQLite table of jobs: options, status, progress and the JSON-encoded result."""
+
+    def __init__(self, path: str, ttl_seconds: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS report_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                options TEXT NOT NULL,
+                progress TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_report_jobs_created ON report_jobs(created_at)")
+        self._conn.commit()
+
+    def create(self, job_id: str, options: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO report_jobs (id, status, options, progress, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, json.dumps(options, ensure_ascii=False), "{}", now),
+            )
+            self._conn.execute(
+                "DELETE FROM report_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        if "progress" in fields:
+            fields["progress"] = json.dumps(fields["progress"], ensure_ascii=False)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE report_jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, options, progress, error, created_at, started_at, finished_at, result IS NOT NULL "
+                "FROM report_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def result(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM report_jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def list(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, status, options, progress, error, created_at, started_at, finished_at, result IS NOT NULL "
+                "FROM report_jobs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def mark_interrupted(self) -> int:
+        """Fail jobs left queued or running by a previous server process."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE report_jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (JOB_FAILED, "Interrupted by a server restart", time.time(), JOB_QUEUED, JOB_RUNNING),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> Dict[str, Any]:
+        job_id, status, options, progress, error, created_at, started_at, finished_at, has_result = row
+        return {
+            "job_id": job_id,
+            "status": status,
+            "options": json.loads(options),
+            "progress": json.loads(progress),
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "has_result": bool(has_result),
+        }
+
+
+class JobQueue:
+    """FIFO of jobs served by ``workers`` tasks on the running event loop.
+
+    ``runner(options, payload, progress)`` produces a job's result and
+    ``encode`` turns it into the JSON text that is stored. Call ``start()``
+    from the server's startup hook. JobStore calls block on SQLite, so the
+    queue makes them through ``asyncio.to_thread``. Workers and jobs run in fresh
+    ``contextvars.Context`` objects, so they inherit nothing from the request
+    that submitted them, and each job has its own task, so cancelling it
+    never touches the worker or other jobs.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: JobRunner,
+        encode: Callable[[Any], str],
+        workers: int = DEFAULT_REPORT_JOB_WORKERS,
+        max_queued: int = DEFAULT_REPORT_JOB_QUEUE_SIZE,
+    ) -> None:
+        self.store = store
+        self.runner = runner
+        self.encode = encode
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self._queue: Optional["asyncio.Queue[str]"] = None
+        self._payloads: Dict[str, Any] = {}
+        self._order: List[str] = []  # queued job ids, oldest first
+        self._submitting = 0  # submissions waiting for their row to be created
+        self._tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._workers: List["asyncio.Task[None]"] = []
+
+    def start(self) -> None:
+        """Start the worker tasks on the running loop; a no-op once started."""
+        if self._queue is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._workers = [_create_isolated_task(loop, self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers and running jobs (on server shutdown)."""
+        tasks = [*self._workers, *self._tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, options: Dict[str, Any], payload: Any) -> str:
+        """Queue a job and return its id. Raises JobQueueFull when the backlog is at capacity."""
+        # Normally already started by the startup hook; start() gives workers a fresh context either way
+        self.start()
+        queue = self._queue
+        assert queue is not None
+        if len(self._order) + self._submitting >= self.max_queued:
+            raise JobQueueFull(f"{len(self._order)} report jobs already queued")
+        job_id = uuid.uuid4().hex
+        self._submitting += 1
+        try:
+            await asyncio.to_thread(self.store.create, job_id, options)
+        finally:
+            self._submitting -= 1
+        self._payloads[job_id] = payload
+        self._order.append(job_id)
+        queue.put_nowait(job_id)
+        return job_id
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        if job_id in self._progress:
+            job["progress"] = self._progress[job_id]
+        if job["status"] == JOB_QUEUED and job_id in self._order:
+            job["queue_position"] = self._order.index(job_id) + 1
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job and return its final state; finished jobs are returned unchanged."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return job
+        if job_id in self._order:
+            self._order.remove(job_id)
+            self._payloads.pop(job_id, None)
+            await asyncio.to_thread(self.store.update, job_id, status=JOB_CANCELLED, finished_at=time.time())
+        task = self._tasks.get(job_id)
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait([task], timeout=CANCEL_WAIT_SECONDS)
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is not None and job["status"] not in FINISHED_STATES:
+            # Cancelled before its first step ran, or still unwinding: record it ourselves
+            await asyncio.to_thread(self.store.update, job_id, status=JOB_CANCELLED, finished_at=time.time())
+            job = await asyncio.to_thread(self.store.get, job_id)
+        return job
+
+    def depth(self) -> Dict[str, int]:
+        return {"queued": len(self._order), "running": len(self._tasks), "workers": self.workers}
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            if job_id not in self._order:
+                continue  # cancelled while queued
+            self._order.remove(job_id)
+            task = _create_isolated_task(asyncio.get_running_loop(), self._run(job_id, self._payloads.pop(job_id)))
+            self._tasks[job_id] = task
+            try:
+                await asyncio.wait([task])
+            finally:
+                self._tasks.pop(job_id, None)
+                self._progress.pop(job_id, None)
+
+    async def _run(self, job_id: str, payload: Any) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return
+        progress: Dict[str, Any] = {"stage": "started", "events": {}}
+        self._progress[job_id] = progress
+        await asyncio.to_thread(
+            self.store.update, job_id, status=JOB_RUNNING, started_at=time.time(), progress=_snapshot(progress)
+        )
+        flushed_at = time.monotonic()
+        flushing: Optional["asyncio.Future[None]"] = None
+
+        def report_progress(event: str, data: Dict[str, Any]) -> None:
+            nonlocal flushed_at, flushing
+            new_stage = event not in progress["events"]
+            progress["stage"] = event
+            progress["events"][event] = progress["events"].get(event, 0) + 1
+            progress["updated_at"] = time.time()
+            # Keep the stored copy current for other processes and restarts without a write per event;
+            # the write runs in a thread, at most one at a time, from a snapshot the loop won't mutate
+            if flushing is not None and not flushing.done():
+                return
+            if new_stage or time.monotonic() - flushed_at >= PROGRESS_FLUSH_SECONDS:
+                flushing = asyncio.ensure_future(
+                    asyncio.to_thread(self.store.update, job_id, progress=_snapshot(progress))
+                )
+                flushed_at = time.monotonic()
+
+        async def finish(**fields: Any) -> None:
+            # Let an in-flight progress write land first so it cannot overwrite the final state
+            if flushing is not None:
+                await asyncio.gather(flushing, return_exceptions=True)
+            await asyncio.to_thread(
+                self.store.update, job_id, finished_at=time.time(), progress=_snapshot(progress), **fields
+            )
+
+        try:
+            result = await self.runner(job["options"], payload, report_progress)
+            encoded = await asyncio.to_thread(self.encode, result)
+        except asyncio.CancelledError:
+            await finish(status=JOB_CANCELLED)
+            raise
+        except Exception as exc:
+            detail = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+            await finish(status=JOB_FAILED, error=str(detail))
+            return
+        progress["stage"] = "done"
+        await finish(status=JOB_SUCCEEDED, result=encoded)
+
+
+def _snapshot(progress: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(progress, events=dict(progress["events"]))
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, ""))
+    except (TypeError, ValueError):
+        return default
+
+
+def job_queue_from_env(runner: JobRunner, encode: Callable[[Any], str]) -> JobQueue:
+    """Build the queue from REPORT_JOB_* environment variables, failing over to an in-memory store."""
+    path = os.environ.get("REPORT_JOBS_PATH", "") or DEFAULT_REPORT_JOBS_PATH
+    ttl = max(60, _env_int("REPORT_JOB_TTL", DEFAULT_REPORT_JOB_TTL))
+    try:
+        store = JobStore(path, ttl)
+    except sqlite3.Error as exc:
+        print(f"Report jobs will not survive restarts, could not open {path}: {exc}")
+        store = JobStore(":memory:", ttl)
+    interrupted = store.mark_interrupted()
+    if interrupted:
+        print(f"[JOBS] Marked {interrupted} interrupted report job(s) as failed")
+    return JobQueue(
+        store,
+        runner,
+        encode,
+        workers=_env_int("REPORT_JOB_WORKERS", DEFAULT_REPORT_JOB_WORKERS),
+        max_queued=_env_int("REPORT_JOB_QUEUE_SIZE", DEFAULT_REPORT_JOB_QUEUE_SIZE),
+    )
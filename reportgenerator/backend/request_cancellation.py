@@ -0,0 +1,73 @@
+"""
+Cancel request handlers whose client has gone away.
+
+Starlette keeps running a handler after the browser tab closes, so a
+report's section, translation and review calls would keep spending tokens
+and worker slots for a response nobody reads. CancelOnDisconnectMiddleware
+listens for the ASGI ``http.disconnect`` message once the request body has
+been read and cancels the handler task; the cancellation propagates through
+StageGraph, asyncio.gather and every awaited SDK call, which aborts the
+upstream HTTP requests.
+
+Background jobs are not affected: they run in their own tasks, detached
+from the request that submitted them.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, MutableMapping
+
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Dict[str, Any], Receive, Send], Awaitable[None]]
+
+
+class CancelOnDisconnectMiddleware:
+    """ASGI middleware that cancels handlers for ``paths`` when their client disconnects."""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        body_read = asyncio.Event()
+        disconnected = asyncio.Event()
+
+        async def app_receive() -> Message:
+            # Once the body is in, the watcher owns the real receive channel
+            if body_read.is_set():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        handler = asyncio.ensure_future(self.app(scope, app_receive, send))
+
+        async def watch() -> None:
+            await body_read.wait()
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    break
+            disconnected.set()
+            if not handler.done():
+                print(f"[CANCEL] Client disconnected from {scope.get('path')}; cancelling in-flight work")
+                handler.cancel()
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            # Only swallow the cancellation we caused; a server shutdown must still propagate
+            if not disconnected.is_set() or not handler.cancelled():
+                raise
+        finally:
+            watcher.cancel()
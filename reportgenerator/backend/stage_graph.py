@@ -0,0 +1,92 @@
+"""
+Dependency-graph scheduler for report generation stages.
+
+generate_report declares each stage (full report, sections, highlight,
+headline, translations, ...) together with the stages it reads from. Stages
+start as soon as their inputs are ready and run concurrently under one global
+cap, so a report takes as long as its critical path rather than the sum of
+its stages.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+StageFunc = Callable[..., Awaitable[Any]]
+CompletionCallback = Callable[[str, Any], None]
+
+
+class StageGraph:
+    """A DAG of async stages. Each stage receives its dependencies' results positionally.
+
+    ``pools`` caps named subsets of stages (e.g. translations) below the global
+    limit. ``on_complete`` is called with (name, result) as each stage finishes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        pools: Optional[Dict[str, int]] = None,
+        on_complete: Optional[CompletionCallback] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.pools = {name: max(1, limit) for name, limit in (pools or {}).items()}
+        self.on_complete = on_complete
+        self._stages: Dict[str, StageFunc] = {}
+        self._deps: Dict[str, List[str]] = {}
+        self._pool: Dict[str, Optional[str]] = {}
+
+    def add(self, name: str, func: StageFunc, deps: Sequence[str] = (), pool: Optional[str] = None) -> str:
+        """Register a stage. Dependencies must already be registered, which keeps the graph acyclic."""
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(missing)}")
+        if pool is not None and pool not in self.pools:
+            raise ValueError(f"Stage {name} uses unknown pool: {pool}")
+        self._stages[name] = func
+        self._deps[name] = list(deps)
+        self._pool[name] = pool
+        return name
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def stage_names(self) -> List[str]:
+        return list(self._stages)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage and return their results by name.
+
+        The first failing stage cancels the rest and its exception propagates.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pool_semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.pools.items()}
+        tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+        async def run_stage(name: str) -> Any:
+            inputs = [await tasks[dep] for dep in self._deps[name]]
+            pool = self._pool[name]
+            # Take the pool slot first so a stage waiting on its pool does not hold a global slot
+            if pool is not None:
+                async with pool_semaphores[pool], semaphore:
+                    result = await self._stages[name](*inputs)
+            else:
+                async with semaphore:
+                    result = await self._stages[name](*inputs)
+            if self.on_complete is not None:
+                self.on_complete(name, result)
+            return result
+
+        # Registration order is a topological order, so every dependency task exists already
+        for name in self._stages:
+            tasks[name] = asyncio.ensure_future(run_stage(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,149 @@
+"""
+Mergeable summary aggregates.
+
+A SummaryAggregate holds everything prepare_summary reports for a group of
+commits and PRs: counts, line sums, contributor and repo sets, a per-day
+commit histogram, a bounded top-k of the largest commits (one per message
+prefix) and the first merged PRs. Aggregates can be built per CSV chunk and
+merged, so shards parsed in separate processes combine into the same result
+as a single pass, and "Other repos" is a merge of the remainder repos.
+
+Every commit/PR is added with an ``order`` key (its CSV position, or any
+comparable stand-in such as (chunk, row)); ties are broken by it.
+"""
+
+import heapq
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from csv_ingest import MISSING_TIMESTAMP, SECONDS_PER_DAY, CommitRecord, PRRecord, format_day
+
+TOP_COMMIT_LIMIT = 30
+MERGED_PR_LIMIT = 15
+MESSAGE_PREFIX_LENGTH = 50  # Commits sharing this many leading (lowercased) characters count as duplicates
+
+
+class SummaryAggregate:
+    """Mergeable per-group statistics behind prepare_summary."""
+
+    __slots__ = (
+        "commit_count",
+        "pr_count",
+        "merged_pr_count",
+        "lines_added",
+        "lines_deleted",
+        "contributors",
+        "repos",
+        "daily_commits",
+        "top_limit",
+        "merged_pr_limit",
+        "_top",
+        "_merged_prs",
+    )
+
+    def __init__(self, top_limit: int = TOP_COMMIT_LIMIT, merged_pr_limit: int = MERGED_PR_LIMIT) -> None:
+        self.commit_count = 0
+        self.pr_count = 0
+        self.merged_pr_count = 0
+        self.lines_added = 0
+        self.lines_deleted = 0
+        self.contributors: set = set()
+        self.repos: set = set()
+        self.daily_commits: Counter = Counter()  # epoch day -> commits
+        self.top_limit = top_limit
+        self.merged_pr_limit = merged_pr_limit
+        # message prefix -> (size, order, commit) for the largest commit seen with that prefix
+        self._top: Dict[str, Tuple[int, Any, CommitRecord]] = {}
+        self._merged_prs: List[Tuple[Any, PRRecord]] = []
+
+    @classmethod
+    def from_records(cls, commits: Iterable[CommitRecord], prs: Iterable[PRRecord], repos: Iterable[str] = ()) -> "SummaryAggregate":
+        aggregate = cls()
+        for repo in repos:
+            aggregate.add_repo(repo)
+        for order, commit in enumerate(commits):
+            aggregate.add_commit(commit, order)
+        for order, pr in enumerate(prs):
+            aggregate.add_pr(pr, order)
+        return aggregate
+
+    def add_repo(self, repo: str) -> None:
+        self.repos.add(repo)
+
+    def add_commit(self, commit: CommitRecord, order: Any) -> None:
+        self.commit_count += 1
+        self.lines_added += commit.additions
+        self.lines_deleted += commit.deletions
+        if commit.member_id:
+            self.contributors.add(commit.member_id)
+        if commit.epoch != MISSING_TIMESTAMP:
+            self.daily_commits[commit.epoch // SECONDS_PER_DAY] += 1
+
+        size = commit.additions + commit.deletions
+        key = commit.message[:MESSAGE_PREFIX_LENGTH].lower()
+        current = self._top.get(key)
+        if current is None or size > current[0] or (size == current[0] and order < current[1]):
+            self._top[key] = (size, order, commit)
+            if len(self._top) > 4 * self.top_limit:
+                self._compact()
+
+    def add_pr(self, pr: PRRecord, order: Any) -> None:
+        self.pr_count += 1
+        if pr.state != "MERGED":
+            return
+        self.merged_pr_count += 1
+        if len(self._merged_prs) < self.merged_pr_limit or order < self._merged_prs[-1][0]:
+            self._merged_prs.append((order, pr))
+            if len(self._merged_prs) > 1 and order < self._merged_prs[-2][0]:
+                self._merged_prs.sort(key=lambda item: item[0])
+            del self._merged_prs[self.merged_pr_limit:]
+
+    def merge(self, other: "SummaryAggregate") -> "SummaryAggregate":
+        """Fold ``other`` into this aggregate (``other`` is left untouched) and return self."""
+        self.commit_count += other.commit_count
+        self.pr_count += other.pr_count
+        self.merged_pr_count += other.merged_pr_count
+        self.lines_added += other.lines_added
+        self.lines_deleted += other.lines_deleted
+        self.contributors |= other.contributors
+        self.repos |= other.repos
+        self.daily_commits.update(other.daily_commits)
+        for key, candidate in other._top.items():
+            current = self._top.get(key)
+            if current is None or (-candidate[0], candidate[1]) < (-current[0], current[1]):
+                self._top[key] = candidate
+        self._compact()
+        self._merged_prs = heapq.nsmallest(
+            self.merged_pr_limit, self._merged_prs + other._merged_prs, key=lambda item: item[0]
+        )
+        return self
+
+    @classmethod
+    def combine(cls, aggregates: Iterable["SummaryAggregate"]) -> "SummaryAggregate":
+        combined = cls()
+        for aggregate in aggregates:
+            combined.merge(aggregate)
+        return combined
+
+    def _compact(self) -> None:
+        # Exact: a prefix's best only grows and the k-th best never shrinks, so an
+        # evicted prefix can never re-enter the top k.
+        if len(self._top) <= self.top_limit:
+            return
+        kept = heapq.nsmallest(self.top_limit, self._top.items(), key=lambda item: (-item[1][0], item[1][1]))
+        self._top = dict(kept)
+
+    def top_commits(self) -> List[CommitRecord]:
+        """Largest commits by additions + deletions, one per message prefix, largest first."""
+        ranked = heapq.nsmallest(self.top_limit, self._top.values(), key=lambda item: (-item[0], item[1]))
+        return [commit for _, _, commit in ranked]
+
+    def merged_prs(self) -> List[PRRecord]:
+        return [pr for _, pr in self._merged_prs]
+
+    def daily_histogram(self) -> Dict[str, int]:
+        return {format_day(day): count for day, count in sorted(self.daily_commits.items())}
+
+    def is_empty(self) -> bool:
+        return not self.commit_count and not self.pr_count
+
@@ -0,0 +1,204 @@
+import csv
+import io
+import json
+import random
+
+import pytest
+
+import csv_ingest
+from csv_ingest import (
+    KIND_COMMIT,
+    KIND_PR,
+    MISSING_TIMESTAMP,
+    CommitRecord,
+    PRRecord,
+    _next_record_start,
+    find_record_boundaries,
+    ingest_stream,
+    ingest_stream_parallel,
+    parse_epoch_seconds,
+    parse_timestamp,
+    record_json_default,
+    to_epoch_seconds,
+)
+
+HEADER = [
+    "source", "type", "member_name", "member_email", "timestamp", "repository", "message",
+    "additions", "deletions", "sha", "title", "state", "pr_number", "pr_title", "review_state", "body",
+]
+
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        member = ("Jake", "jake@tokamak.network") if i % 3 else ("jake", "12345+jake@users.noreply.github.com")
+        timestamp = f"2026-02-{1 + i % 14:02d} {i % 24:02d}:{i % 60:02d}:00"
+        repo = f"repo-{i % 5}"
+        if i % 4 == 3:
+            body = f'Closes #{i}\n\n"Quoted" review, with commas\nand ""doubled"" quotes'
+            rows.append(["github", "pull_request", *member, timestamp, repo, "", "", "", "", f"PR {i}, part two",
+                         "merged" if i % 8 == 7 else "open", str(i), "", "", body])
+        else:
+            # Multi-line bodies with escaped quotes and embedded newlines, so cut targets land inside them
+            message = f'Fix "edge" case {i}\n\nBody line with, comma\n""quoted"" line\n' + "x" * (i % 37)
+            rows.append(["github", "commit", *member, timestamp, repo, message, str(i), str(i % 7), f"{i:08x}",
+                         "", "", "", "", "", ""])
+    rows.append(["slack", "message", "Kevin", "kevin@tokamak.network", "2026-02-03 10:00:00", "", "hi", "", "", "", "", "", "", "", "", ""])
+    return rows
+
+
+def encode(rows, lineterminator):
+    """Return the CSV bytes and the byte offset at which every data record starts."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator=lineterminator, quoting=csv.QUOTE_ALL)
+    writer.writerow(HEADER)
+    starts = []
+    for row in rows:
+        starts.append(len(out.getvalue().encode("utf-8")))
+        writer.writerow(row)
+    return out.getvalue().encode("utf-8"), starts
+
+
+def snapshot(export):
+    rows = []
+    for i in range(len(export)):
+        if export.kind[i] == KIND_COMMIT:
+            rows.append(export.commit_entry(i).to_dict())
+        elif export.kind[i] == KIND_PR:
+            rows.append(export.pr_entry(i).to_dict())
+        else:
+            rows.append((export.repo_names[export.repo[i]], export.timestamp[i]))
+    return {
+        "rows": rows,
+        "members": export.member_list(),
+        "days": export.daily_row_counts(),
+        "bounds": export.timestamp_bounds(),
+        "contributors": export.repo_contributor_names(),
+    }
+
+
+@pytest.mark.parametrize("lineterminator", ["\n", "\r\n"])
+def test_boundaries_only_fall_on_record_starts(lineterminator):
+    data, starts = encode(make_rows(60), lineterminator)
+    header_end = _next_record_start(data, 0, len(data), False)
+    assert header_end == starts[0]
+    valid = set(starts) | {len(data)}
+    for chunk_bytes in range(1, 400, 7):
+        bounds = find_record_boundaries(data, header_end, len(data), chunk_bytes)
+        assert bounds[0] == header_end and bounds[-1] == len(data)
+        assert bounds == sorted(set(bounds))
+        assert set(bounds) <= valid, chunk_bytes
+
+
+def test_next_record_start_skips_newlines_inside_quotes():
+    data = b'"a","multi\nline ""quoted""\nbody"\n"next","row"\n'
+    assert _next_record_start(data, 0, len(data), False) == data.index(b'"next"')
+    # Starting inside the quoted field, with the quote state known
+    assert _next_record_start(data, data.index(b"line"), len(data), True) == data.index(b'"next"')
+
+
+@pytest.mark.parametrize("lineterminator", ["\n", "\r\n"])
+def test_parallel_parse_matches_serial(tmp_path, lineterminator):
+    data, _ = encode(make_rows(400), lineterminator)
+    path = tmp_path / "export.csv"
+    path.write_bytes(data)
+
+    with open(path, "rb") as f:
+        serial = ingest_stream(f)
+    with open(path, "rb") as f:
+        parallel = ingest_stream_parallel(f, workers=2, chunk_bytes=2048, min_bytes=0)
+
+    assert len(parallel) == len(serial) == 400
+    assert snapshot(parallel) == snapshot(serial)
+
+
+def test_parallel_parse_falls_back_for_in_memory_uploads():
+    data, _ = encode(make_rows(40), "\n")
+    parallel = ingest_stream_parallel(io.BytesIO(data), workers=4, chunk_bytes=256, min_bytes=0)
+    assert snapshot(parallel) == snapshot(ingest_stream(io.BytesIO(data)))
+
+
+def test_records_behave_like_read_only_dicts():
+    commit = CommitRecord("repo", "Fix it", "abc123", parse_epoch_seconds("2026-02-03 04:05:06"), 10, 2, "jake")
+    assert commit["repo"] == "repo" and commit["timestamp"] == "2026-02-03 04:05:06"
+    assert commit.get("sha") == "abc123"
+    assert commit.get("title") is None and commit.get("title", "-") == "-"
+    assert "message" in commit and "epoch" not in commit
+    with pytest.raises(KeyError):
+        commit["epoch"]
+    assert list(commit.keys()) == ["repo", "message", "sha", "timestamp", "additions", "deletions", "member_id"]
+    assert dict(commit) == commit.to_dict()
+    assert not hasattr(commit, "__dict__")
+
+    pr = PRRecord("repo", "Add it", "7", "merged", parse_epoch_seconds(""), "jake")
+    assert pr.to_dict() == {
+        "repo": "repo", "title": "Add it", "pr_number": "7", "state": "merged", "timestamp": "", "member_id": "jake",
+    }
+
+
+def test_records_serialize_as_dicts():
+    pr = PRRecord("repo", "Add it", "7", "open", parse_epoch_seconds("2026-02-03 04:05:06"), "jake")
+    assert json.loads(json.dumps({"prs": [pr]}, default=record_json_default)) == {"prs": [pr.to_dict()]}
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=record_json_default)
+
+
+def test_export_records_share_interned_strings():
+    data, _ = encode(make_rows(20), "\n")
+    export = ingest_stream(io.BytesIO(data))
+    commits = [export.commit_entry(i) for i in range(len(export)) if export.kind[i] == KIND_COMMIT]
+    same_repo = [commit for commit in commits if commit.repo == "repo-0"]
+    assert len(same_repo) > 1
+    assert all(commit.repo is same_repo[0].repo for commit in same_repo)
+    assert commits[0]["additions"] == 0 and commits[0]["deletions"] == 0
+
+
+def slow_epoch_seconds(timestamp):
+    parsed = parse_timestamp(timestamp)
+    return to_epoch_seconds(parsed) if parsed else MISSING_TIMESTAMP
+
+
+@pytest.mark.parametrize("timestamp", [
+    "2026-02-03 04:05:06",
+    "1970-01-01 00:00:00",
+    "2024-02-29 23:59:59",
+    "2026-02-29 12:00:00",
+    "2026-13-01 00:00:00",
+    "2026-02-03 24:00:00",
+    "2026-02-03 23:60:00",
+    "2026-02-03 23:59:60",
+    "2026-2-3 4:05:06",
+    "2026/02/03 04:05:06",
+    "2026-02-03T04:05:06",
+    "2026-02-03 04:05:06 ",
+    "２０２６-02-03 04:05:06",
+    "2026-02-03 0４:05:06",
+    "2026-0a-03 04:05:06",
+    "",
+    "not a timestamp",
+])
+def test_parse_epoch_seconds_matches_strptime(timestamp):
+    assert parse_epoch_seconds(timestamp) == slow_epoch_seconds(timestamp)
+
+
+def test_parse_epoch_seconds_matches_strptime_on_random_timestamps():
+    rng = random.Random(7)
+    for _ in range(2000):
+        timestamp = (
+            f"{rng.randint(1999, 2030)}-{rng.randint(0, 13):02d}-{rng.randint(0, 32):02d} "
+            f"{rng.randint(0, 25):02d}:{rng.randint(0, 61):02d}:{rng.randint(0, 61):02d}"
+        )
+        assert parse_epoch_seconds(timestamp) == slow_epoch_seconds(timestamp), timestamp
+
+
+def test_day_cache_is_reused_and_bounded(monkeypatch):
+    monkeypatch.setattr(csv_ingest, "_day_epochs", {})
+    monkeypatch.setattr(csv_ingest, "_MAX_CACHED_DAYS", 3)
+    parse_epoch_seconds("2026-02-01 00:00:00")
+    parse_epoch_seconds("2026-02-01 13:00:00")
+    parse_epoch_seconds("2026-02-31 00:00:00")
+    assert csv_ingest._day_epochs == {"2026-02-01": slow_epoch_seconds("2026-02-01 00:00:00"), "2026-02-31": None}
+    parse_epoch_seconds("2026-02-02 00:00:00")
+    parse_epoch_seconds("2026-02-03 00:00:00")
+    assert list(csv_ingest._day_epochs) == ["2026-02-03"]
+    assert parse_epoch_seconds("2026-02-01 01:00:00") == slow_epoch_seconds("2026-02-01 01:00:00")
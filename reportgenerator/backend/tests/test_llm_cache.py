@@ -0,0 +1,102 @@
+import pytest
+
+import llm_cache
+from llm_cache import LLMResponseCache, cache_from_env, llm_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", fake)
+    return fake
+
+
+def make_cache(ttl=60, max_bytes=1000):
+    return LLMResponseCache(":memory:", ttl, max_bytes)
+
+
+def test_key_covers_every_generation_parameter():
+    base = llm_cache_key("gpt-5.2-pro", "prompt", 500, 0.7)
+    assert base == llm_cache_key("gpt-5.2-pro", "prompt", 500, 0.7)
+    assert len({
+        base,
+        llm_cache_key("gpt-5.2", "prompt", 500, 0.7),
+        llm_cache_key("gpt-5.2-pro", "prompt!", 500, 0.7),
+        llm_cache_key("gpt-5.2-pro", "prompt", 501, 0.7),
+        llm_cache_key("gpt-5.2-pro", "prompt", 500, 0.2),
+    }) == 5
+
+
+def test_put_then_get(clock):
+    cache = make_cache()
+    assert cache.get("k") is None
+    cache.put("k", "m", 100, 0.7, "안녕 response")
+    assert cache.get("k") == "안녕 response"
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == len("안녕 response".encode("utf-8"))
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = make_cache(ttl=60)
+    cache.put("k", "m", 100, 0.7, "old")
+    clock.now += 60
+    assert cache.get("k") == "old"
+    clock.now += 1
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_reading_does_not_extend_the_ttl(clock):
+    cache = make_cache(ttl=60)
+    cache.put("k", "m", 100, 0.7, "v")
+    clock.now += 50
+    cache.get("k")
+    clock.now += 20
+    assert cache.get("k") is None
+
+
+def test_put_drops_expired_entries(clock):
+    cache = make_cache(ttl=60)
+    cache.put("old", "m", 100, 0.7, "x")
+    clock.now += 61
+    cache.put("new", "m", 100, 0.7, "y")
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(clock):
+    cache = make_cache(max_bytes=30)
+    for key in ("a", "b", "c"):
+        cache.put(key, "m", 100, 0.7, "x" * 10)
+        clock.now += 1
+    cache.get("a")  # now the most recently used
+    clock.now += 1
+    cache.put("d", "m", 100, 0.7, "x" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in ("a", "c", "d")] == [True, True, True]
+    assert cache.stats()["bytes"] <= 30
+
+
+def test_clear(clock):
+    cache = make_cache()
+    cache.put("k", "m", 100, 0.7, "v")
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_cache_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    assert cache_from_env() is None
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE_TTL", "0")
+    monkeypatch.setenv("LLM_CACHE_MAX_MB", "2")
+    cache = cache_from_env()
+    assert cache.ttl_seconds == 1 and cache.max_bytes == 2 * 1024 * 1024
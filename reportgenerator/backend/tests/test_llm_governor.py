@@ -0,0 +1,450 @@
+import asyncio
+import gc
+
+import pytest
+
+import llm_governor
+from llm_governor import FairLimiter, LLMGovernor, _parse_model_limits, llm_flow
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# FairLimiter
+
+
+def test_limiter_grants_immediately_below_the_limit():
+    async def scenario():
+        limiter = FairLimiter(2)
+        await limiter.acquire("a")
+        await limiter.acquire("a")
+        assert limiter.active == 2
+        waiter = asyncio.ensure_future(limiter.acquire("a"))
+        await settle()
+        assert not waiter.done() and limiter.waiting() == 1
+        limiter.release()
+        await waiter
+        assert limiter.active == 2 and limiter.waiting() == 0
+
+    run(scenario())
+
+
+def test_limiter_serves_flows_round_robin():
+    async def scenario():
+        limiter = FairLimiter(1)
+        await limiter.acquire("holder")
+        granted = []
+
+        async def request(flow, name):
+            await limiter.acquire(flow)
+            granted.append(name)
+
+        tasks = []
+        for flow, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("c", "c1")]:
+            tasks.append(asyncio.ensure_future(request(flow, name)))
+            await settle()
+        for _ in tasks:
+            limiter.release()
+            await settle()
+        await asyncio.gather(*tasks)
+        return granted
+
+    # One big report (flow a) cannot starve the single calls queued behind it
+    assert run(scenario()) == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = FairLimiter(1)
+        await limiter.acquire("a")
+        waiter = asyncio.ensure_future(limiter.acquire("b"))
+        await settle()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.waiting() == 0
+        limiter.release()
+        assert limiter.active == 0
+
+    run(scenario())
+
+
+def test_slot_granted_to_a_cancelled_waiter_is_handed_on():
+    async def scenario():
+        limiter = FairLimiter(1)
+        await limiter.acquire("a")
+        first = asyncio.ensure_future(limiter.acquire("b"))
+        second = asyncio.ensure_future(limiter.acquire("c"))
+        await settle()
+        # Grant the slot to `first`, then cancel it before it gets to run
+        limiter.release()
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.wait_for(second, 1)
+        assert limiter.active == 1 and limiter.waiting() == 0
+
+    run(scenario())
+
+
+def test_raising_the_limit_wakes_waiters():
+    async def scenario():
+        limiter = FairLimiter(1)
+        await limiter.acquire("a")
+        waiters = [asyncio.ensure_future(limiter.acquire("b")) for _ in range(2)]
+        await settle()
+        limiter.set_limit(3)
+        await asyncio.wait_for(asyncio.gather(*waiters), 1)
+        assert limiter.active == 3
+        limiter.set_limit(1)
+        for _ in range(3):
+            limiter.release()
+        assert limiter.active == 0
+
+    run(scenario())
+
+
+def test_limiter_never_leaks_slots_under_cancellation():
+    async def scenario():
+        limiter = FairLimiter(3)
+        peak = 0
+
+        async def worker(flow):
+            nonlocal peak
+            await limiter.acquire(flow)
+            try:
+                peak = max(peak, limiter.active)
+                await asyncio.sleep(0.001)
+            finally:
+                limiter.release()
+
+        tasks = [asyncio.ensure_future(worker(i % 4)) for i in range(60)]
+        await asyncio.sleep(0.002)
+        for task in tasks[::3]:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert limiter.active == 0 and limiter.waiting() == 0
+        assert peak <= 3
+
+    run(scenario())
+
+
+# LLMGovernor slots
+
+
+def test_slots_respect_model_and_provider_limits():
+    async def scenario():
+        governor = LLMGovernor(3, 2, {"small": 1}, adaptive_max=None, circuit_failures=0)
+        active = {"big": 0, "small": 0, "provider": 0}
+        peak = dict(active)
+
+        async def call(model, flow):
+            llm_flow.set(flow)
+            async with governor.slot("tokamak", model):
+                for key in (model, "provider"):
+                    active[key] += 1
+                    peak[key] = max(peak[key], active[key])
+                await asyncio.sleep(0.005)
+                for key in (model, "provider"):
+                    active[key] -= 1
+
+        await asyncio.gather(*[call("big" if i % 2 else "small", f"r{i % 3}") for i in range(20)])
+        usage = governor.snapshot()["usage"]
+        return peak, usage
+
+    peak, usage = run(scenario())
+    assert peak == {"big": 2, "small": 1, "provider": 3}
+    assert usage["tokamak/small"]["limit"] == 1
+    assert all(entry["active"] == 0 and entry["waiting"] == 0 for entry in usage.values())
+
+
+def test_model_limit_overrides_are_parsed_leniently():
+    assert _parse_model_limits("gpt-5.2-pro=4, gemini-3-pro = 6,broken,=3,x=y") == {"gpt-5.2-pro": 4, "gemini-3-pro": 6}
+
+
+def test_governor_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER_CONCURRENCY", "5")
+    monkeypatch.setenv("LLM_MODEL_CONCURRENCY", "nope")
+    monkeypatch.setenv("LLM_MODEL_CONCURRENCY_OVERRIDES", "m=2")
+    governor = llm_governor.governor_from_env()
+    assert governor.provider_limit == 5
+    assert governor.model_limit == llm_governor.DEFAULT_LLM_MODEL_CONCURRENCY
+    assert governor.model_limits == {"m": 2}
+
+
+# AIMDController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_governor, "time", fake)
+    return fake
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def test_aimd_grows_one_slot_per_window_of_healthy_calls():
+    controller = llm_governor.AIMDController(4, 32)
+    for _ in range(4):
+        controller.on_success(1.0, 1000)
+    assert controller.limit == 4
+    controller.on_success(1.0, 1000)
+    assert controller.limit == 5
+    for _ in range(1000):
+        controller.on_success(1.0, 1000)
+    assert controller.limit == 32
+
+
+def test_aimd_holds_when_latency_degrades():
+    controller = llm_governor.AIMDController(4, 32)
+    controller.on_success(1.0, 1000)
+    window = controller.window
+    for _ in range(10):
+        controller.on_success(10.0, 1000)
+    assert controller.window < window + 0.5
+
+
+def test_aimd_judges_each_size_class_against_its_own_baseline():
+    controller = llm_governor.AIMDController(4, 32)
+    controller.on_success(0.2, 400)  # a short highlight call
+    for _ in range(20):
+        controller.on_success(8.0, 8000)  # long sections are healthy for their size
+    assert controller.limit >= 7
+    assert set(controller.latencies) == {512, 8192}
+
+
+def test_aimd_halves_once_per_round_trip(clock):
+    controller = llm_governor.AIMDController(16, 32)
+    in_flight_start = clock.now
+    clock.now += 1
+    assert controller.on_overload(in_flight_start)
+    assert controller.limit == 8
+    # Other calls that were already in flight when the window was cut do not cut it again
+    assert not controller.on_overload(in_flight_start)
+    assert controller.limit == 8
+    clock.now += 1
+    assert controller.on_overload(clock.now)
+    assert controller.limit == 4
+    for _ in range(5):
+        clock.now += 1
+        controller.on_overload(clock.now)
+    assert controller.limit == 1
+
+
+def test_overload_classification():
+    assert llm_governor.is_overload_error(RateLimited())
+    assert llm_governor.is_overload_error(asyncio.TimeoutError())
+    assert not llm_governor.is_overload_error(BadRequest())
+    assert not llm_governor.is_outage_error(RateLimited())
+
+
+def test_governor_applies_the_adaptive_window_to_its_limiters(clock):
+    async def scenario():
+        governor = LLMGovernor(64, 4, adaptive_max=16, circuit_failures=0)
+        with pytest.raises(RateLimited):
+            async with governor.slot("tokamak", "m", 1000):
+                clock.now += 1
+                raise RateLimited()
+        assert governor.model_limit_for("tokamak", "m") == 2
+        # A client error says nothing about load
+        with pytest.raises(BadRequest):
+            async with governor.slot("tokamak", "m", 1000):
+                raise BadRequest()
+        usage = governor.snapshot()["usage"]["tokamak/m"]
+        assert usage["limit"] == 2 and usage["adaptive"]["overloads"] == 1
+        for _ in range(10):
+            async with governor.slot("tokamak", "m", 1000):
+                pass
+        return governor.model_limit_for("tokamak", "m")
+
+    assert run(scenario()) > 2
+
+
+def test_non_adaptive_providers_keep_fixed_limits():
+    async def scenario():
+        governor = LLMGovernor(64, 4, circuit_failures=0)
+        with pytest.raises(RateLimited):
+            async with governor.slot("anthropic", "claude", 1000):
+                raise RateLimited()
+        return governor.model_limit_for("anthropic", "claude")
+
+    assert run(scenario()) == 4
+
+
+# CircuitBreaker
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+def test_breaker_opens_after_consecutive_outage_errors(clock):
+    breaker = llm_governor.CircuitBreaker(3, 30)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == breaker.OPEN and breaker.trips == 1
+    assert breaker.allow() == (False, False)
+
+
+def test_breaker_success_resets_the_failure_count():
+    breaker = llm_governor.CircuitBreaker(3, 30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+
+
+def test_breaker_half_open_admits_one_probe(clock):
+    breaker = llm_governor.CircuitBreaker(1, 30)
+    breaker.record_failure()
+    clock.now += 29
+    assert breaker.allow() == (False, False)
+    clock.now += 1
+    assert breaker.allow() == (True, True)
+    assert breaker.state == breaker.HALF_OPEN
+    assert breaker.allow() == (False, False)
+
+
+def test_breaker_probe_success_closes(clock):
+    breaker = llm_governor.CircuitBreaker(1, 30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    assert breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.allow() == (True, False)
+
+
+def test_breaker_probe_failure_reopens_for_another_cooldown(clock):
+    breaker = llm_governor.CircuitBreaker(5, 30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    # A single failed probe reopens it, whatever the threshold
+    assert breaker.record_failure()
+    assert breaker.state == breaker.OPEN and breaker.trips == 2
+    clock.now += 29
+    assert breaker.allow() == (False, False)
+    clock.now += 1
+    assert breaker.allow() == (True, True)
+
+
+def test_breaker_abandoned_probe_lets_the_next_call_probe(clock):
+    breaker = llm_governor.CircuitBreaker(1, 30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow() == (True, True)
+    breaker.abandon_probe()
+    assert breaker.allow() == (True, True)
+
+
+def test_breaker_in_flight_failures_do_not_extend_the_cooldown(clock):
+    breaker = llm_governor.CircuitBreaker(1, 30)
+    breaker.record_failure()
+    clock.now += 20
+    assert not breaker.record_failure()
+    assert breaker.trips == 1
+    clock.now += 10
+    assert breaker.allow() == (True, True)
+
+
+def test_outage_classification():
+    assert llm_governor.is_outage_error(ServerError())
+    assert llm_governor.is_outage_error(APIConnectionError())
+    assert llm_governor.is_outage_error(asyncio.TimeoutError())
+    assert not llm_governor.is_outage_error(BadRequest())
+    assert llm_governor.is_overload_error(ServerError())
+
+
+def test_governor_slot_refuses_calls_while_the_circuit_is_open(clock):
+    async def scenario():
+        governor = LLMGovernor(8, 4, adaptive_max=None, circuit_failures=2, circuit_cooldown=30)
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                async with governor.slot("tokamak", "m"):
+                    raise ServerError()
+        assert governor.circuit_open("tokamak", "m")
+        with pytest.raises(llm_governor.CircuitOpenError):
+            async with governor.slot("tokamak", "m"):
+                pass
+        # Other models of the provider are unaffected
+        async with governor.slot("tokamak", "other"):
+            pass
+        clock.now += 30
+        async with governor.slot("tokamak", "m"):
+            pass
+        return governor.circuit_open("tokamak", "m")
+
+    assert run(scenario()) is False
+
+
+def test_endpoint_circuits_are_independent_of_the_model_circuit(clock):
+    async def scenario():
+        governor = LLMGovernor(8, 4, adaptive_max=None, circuit_failures=1, circuit_cooldown=30)
+        with pytest.raises(ServerError):
+            async with governor.slot("tokamak", "m", 0, "responses"):
+                raise ServerError()
+        assert governor.circuit_open("tokamak", "m", "responses")
+        assert not governor.circuit_open("tokamak", "m")
+        with pytest.raises(llm_governor.CircuitOpenError):
+            async with governor.slot("tokamak", "m", 0, "responses"):
+                pass
+        async with governor.slot("tokamak", "m"):
+            pass
+        return governor.snapshot()["usage"]["tokamak/m"]
+
+    usage = run(scenario())
+    assert usage["circuit"]["state"] == "closed"
+    assert usage["endpoint_circuits"]["responses"]["state"] == "open"
+
+
+def test_limiters_are_per_loop_and_released_with_it():
+    governor = LLMGovernor(8, 4, adaptive_max=None, circuit_failures=0)
+
+    async def call():
+        async with governor.slot("tokamak", "m"):
+            pass
+
+    for _ in range(3):
+        run(call())
+    gc.collect()
+    assert len(governor._limiters) == 0
+
+
+def test_other_providers_do_not_share_the_adaptive_window(clock):
+    async def scenario():
+        governor = LLMGovernor(64, 4, adaptive_max=16, circuit_failures=0)
+        with pytest.raises(RateLimited):
+            async with governor.slot("tokamak-tts", "tts-1"):
+                raise RateLimited()
+        return governor.model_limit_for("tokamak-tts", "tts-1"), governor.snapshot()["usage"]
+
+    limit, usage = run(scenario())
+    assert limit == 4
+    assert "tokamak" not in usage and "tokamak-tts" in usage
@@ -0,0 +1,92 @@
+import itertools
+
+from member_identity import IdentityResolver
+
+SEEDED = {"thomas": "shinthom", "jake": "JehyukJang"}
+
+
+def resolve(identities, github_members=None):
+    resolver = IdentityResolver(github_members or {})
+    for member_id, name, email in identities:
+        resolver.add(member_id, name, email)
+    return {member_id: resolver.canonical_id(member_id) for member_id, _, _ in identities}
+
+
+def test_same_email_merges_into_the_first_id_added():
+    canonical = resolve([
+        ("alice", "Alice", "alice@x.com"),
+        ("alice-w", "Alice W", '"Alice@X.com"'),
+    ])
+    assert canonical == {"alice": "alice", "alice-w": "alice"}
+
+
+def test_noreply_addresses_link_through_the_github_username():
+    canonical = resolve([
+        ("bob", "Bob", "bob@corp.com"),
+        ("bob-personal", "Bob", "bob@corp.com"),
+        ("12345+bobdev", "Bob", "12345+bobdev@users.noreply.github.com"),
+        ("bobdev", "Bob", "bobdev@users.noreply.github.com"),
+    ])
+    assert canonical["bob-personal"] == "bob"
+    assert canonical["12345+bobdev"] == canonical["bobdev"] == "12345+bobdev"
+
+
+def test_seeded_id_wins_over_earlier_ids():
+    canonical = resolve(
+        [
+            ("thomas.shin", "Thomas Shin", "thomas.shin@corp.com"),
+            ("thomas.shin", "Thomas Shin", "shinthom@gmail.com"),
+            ("1+jehyukjang", "Jake", "1+JehyukJang@users.noreply.github.com"),
+        ],
+        SEEDED,
+    )
+    assert canonical == {"thomas.shin": "thomas", "1+jehyukjang": "jake"}
+
+
+def test_display_names_do_not_merge_people():
+    canonical = resolve(
+        [
+            ("alex.kim", "alex", "alex.kim@a.com"),
+            ("alex.park", "alex", "alex.park@b.com"),
+            ("dev1", "thomas", "dev1@c.com"),
+            ("dev2", "shinthom", "dev2@d.com"),
+        ],
+        SEEDED,
+    )
+    assert canonical == {"alex.kim": "alex.kim", "alex.park": "alex.park", "dev1": "dev1", "dev2": "dev2"}
+
+
+def test_noreply_usernames_do_not_claim_unrelated_emails():
+    canonical = resolve([
+        ("carol", "Carol", "carol@users.noreply.github.com"),
+        ("carol-x", "Carol", "carol@other.com"),
+    ])
+    assert canonical["carol-x"] == "carol-x"
+
+
+def test_canonical_id_does_not_depend_on_how_links_are_discovered():
+    # Three aliases of one person; whichever rows link them, the first id added wins
+    rows = [
+        ("dana", "Dana", "dana@a.com"),
+        ("dana-b", "Dana", "dana@b.com"),
+        ("dana-c", "Dana", "dana@c.com"),
+    ]
+    links = [("dana-b", "Dana", "dana@c.com"), ("dana-c", "Dana", "dana@a.com")]
+    for order in itertools.permutations(links):
+        canonical = resolve(rows + list(order))
+        assert set(canonical.values()) == {"dana"}
+
+
+def test_seeded_canonical_id_is_independent_of_row_order():
+    rows = [
+        ("thomas.shin", "Thomas", "thomas.shin@corp.com"),
+        ("thomas.shin", "Thomas", "thomas.shin@home.com"),
+        ("shinthom", "Thomas", "shinthom@gmail.com"),
+        ("shinthom", "Thomas", "thomas.shin@home.com"),
+    ]
+    for order in itertools.permutations(rows):
+        assert set(resolve(list(order), SEEDED).values()) == {"thomas"}
+
+
+def test_unknown_id_resolves_to_itself():
+    assert IdentityResolver({}).canonical_id("nobody") == "nobody"
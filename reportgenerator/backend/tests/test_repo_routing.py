@@ -0,0 +1,51 @@
+import repo_routing
+from repo_routing import DEFAULT_CATEGORY, RepoRoutingTable, clear_routing_tables, get_routing_table, heuristic_category
+
+PROJECTS = {"TRH": ["trh-sdk", "shared"], "Eco": ["shared", "ton-staking-v2"]}
+CLASSIFICATION = {"Core Infrastructure": ["trh-sdk"], "Governance": ["trh-sdk", "dao-v2"]}
+DESCRIPTIONS = {"trh-sdk": "Rollup hub SDK"}
+
+
+def test_route_combines_project_category_and_description():
+    table = RepoRoutingTable(PROJECTS, CLASSIFICATION, DESCRIPTIONS)
+    route = table.route("trh-sdk")
+    assert route == ("TRH", "Core Infrastructure", "Rollup hub SDK")
+    assert table.route("trh-sdk") is route
+
+
+def test_first_listing_wins():
+    table = RepoRoutingTable(PROJECTS, CLASSIFICATION)
+    assert table.project("shared") == "TRH"
+    assert table.category("trh-sdk") == "Core Infrastructure"
+
+
+def test_unlisted_repos_fall_back_to_name_heuristics():
+    table = RepoRoutingTable(PROJECTS, CLASSIFICATION)
+    assert table.project("zk-mafia") is None
+    assert table.category("zk-mafia") == heuristic_category("zk-mafia") == "Privacy & ZK"
+    assert table.category("misc") == DEFAULT_CATEGORY
+    assert table.description("misc") is None
+
+
+def test_tables_are_reused_for_the_same_config_objects():
+    clear_routing_tables()
+    table = get_routing_table(PROJECTS, CLASSIFICATION, DESCRIPTIONS)
+    assert get_routing_table(PROJECTS, CLASSIFICATION, DESCRIPTIONS) is table
+    assert get_routing_table(PROJECTS, CLASSIFICATION) is not table
+
+
+def test_clear_picks_up_in_place_edits():
+    projects = {"TRH": ["trh-sdk"]}
+    assert get_routing_table(projects).project("new-repo") is None
+    projects["TRH"].append("new-repo")
+    clear_routing_tables()
+    assert get_routing_table(projects).project("new-repo") == "TRH"
+
+
+def test_cache_is_bounded():
+    clear_routing_tables()
+    configs = [{"P": [f"repo-{i}"]} for i in range(repo_routing.MAX_ROUTING_TABLES + 3)]
+    for config in configs:
+        get_routing_table(config)
+    assert len(repo_routing._tables) == repo_routing.MAX_ROUTING_TABLES
+    assert get_routing_table(configs[-1]).project(f"repo-{len(configs) - 1}") == "P"
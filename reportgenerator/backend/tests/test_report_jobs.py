@@ -0,0 +1,220 @@
+import asyncio
+import contextvars
+import json
+
+import pytest
+
+from report_jobs import JobQueue, JobQueueFull, JobStore
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class GatedRunner:
+    """Runner whose jobs report progress, then wait until the test releases them."""
+
+    def __init__(self):
+        self.started = {}
+        self.release = {}
+        self.contexts = []
+
+    async def __call__(self, options, payload, progress):
+        name = options["name"]
+        self.started.setdefault(name, asyncio.Event()).set()
+        self.contexts.append(request_id.get())
+        progress("sections", {"done": 1})
+        await self.release.setdefault(name, asyncio.Event()).wait()
+        if payload == "boom":
+            raise RuntimeError("upstream failed")
+        return {"report": f"# {name}"}
+
+    async def wait_started(self, name):
+        await asyncio.wait_for(self.started.setdefault(name, asyncio.Event()).wait(), 1)
+
+    def finish(self, name):
+        self.release.setdefault(name, asyncio.Event()).set()
+
+
+def make_queue(runner, workers=1, max_queued=8):
+    return JobQueue(JobStore(":memory:", 3600), runner, json.dumps, workers=workers, max_queued=max_queued)
+
+
+async def wait_finished(queue, job_id):
+    for _ in range(100):
+        job = await queue.status(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_runs_and_stores_its_result():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        job_id = await queue.submit({"name": "a"}, None)
+        await runner.wait_started("a")
+        runner.finish("a")
+        job = await wait_finished(queue, job_id)
+        await queue.stop()
+        return job, queue.store.result(job_id)
+
+    job, result = run(scenario())
+    assert job["status"] == "succeeded" and job["has_result"]
+    assert job["progress"]["stage"] == "done"
+    assert json.loads(result) == {"report": "# a"}
+
+
+def test_progress_is_persisted_while_running():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        job_id = await queue.submit({"name": "a"}, None)
+        await runner.wait_started("a")
+        # Progress is written from a worker thread; give it a moment to land
+        for _ in range(100):
+            stored = queue.store.get(job_id)
+            if stored["progress"]["stage"] == "sections":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return stored
+
+    stored = run(scenario())
+    assert stored["status"] == "running"
+    assert stored["progress"]["stage"] == "sections"
+    assert stored["progress"]["events"] == {"sections": 1}
+
+
+def test_failure_is_recorded():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        job_id = await queue.submit({"name": "a"}, "boom")
+        runner.finish("a")
+        job = await wait_finished(queue, job_id)
+        await queue.stop()
+        return job
+
+    job = run(scenario())
+    assert job["status"] == "failed"
+    assert job["error"] == "upstream failed"
+    assert not job["has_result"]
+
+
+def test_cancel_queued_job():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        first = await queue.submit({"name": "a"}, None)
+        second = await queue.submit({"name": "b"}, None)
+        await runner.wait_started("a")
+        assert (await queue.status(second))["queue_position"] == 1
+        cancelled = await queue.cancel(second)
+        runner.finish("a")
+        await wait_finished(queue, first)
+        await asyncio.sleep(0.01)
+        depth = queue.depth()
+        await queue.stop()
+        return cancelled, depth, runner
+
+    cancelled, depth, runner = run(scenario())
+    assert cancelled["status"] == "cancelled"
+    assert depth["queued"] == 0 and depth["running"] == 0
+    assert list(runner.started) == ["a"]
+
+
+def test_cancel_running_job_leaves_the_worker_serving():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        first = await queue.submit({"name": "a"}, None)
+        second = await queue.submit({"name": "b"}, None)
+        await runner.wait_started("a")
+        cancelled = await queue.cancel(first)
+        await runner.wait_started("b")
+        runner.finish("b")
+        job = await wait_finished(queue, second)
+        await queue.stop()
+        return cancelled, job
+
+    cancelled, job = run(scenario())
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["progress"]["stage"] == "sections"
+    assert job["status"] == "succeeded"
+
+
+def test_cancel_finished_job_returns_it_unchanged():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        job_id = await queue.submit({"name": "a"}, None)
+        runner.finish("a")
+        await wait_finished(queue, job_id)
+        job = await queue.cancel(job_id)
+        unknown = await queue.cancel("missing")
+        await queue.stop()
+        return job, unknown
+
+    job, unknown = run(scenario())
+    assert job["status"] == "succeeded"
+    assert unknown is None
+
+
+def test_submit_refuses_beyond_max_queued():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner, max_queued=2)
+        await queue.submit({"name": "a"}, None)
+        await runner.wait_started("a")
+        await queue.submit({"name": "b"}, None)
+        await queue.submit({"name": "c"}, None)
+        with pytest.raises(JobQueueFull):
+            await queue.submit({"name": "d"}, None)
+        await queue.stop()
+
+    run(scenario())
+
+
+def test_concurrent_submissions_respect_max_queued():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner, max_queued=3)
+        results = await asyncio.gather(
+            *(queue.submit({"name": str(i)}, None) for i in range(6)), return_exceptions=True
+        )
+        await queue.stop()
+        return results
+
+    results = run(scenario())
+    assert sum(isinstance(result, JobQueueFull) for result in results) == 3
+
+
+def test_jobs_do_not_inherit_the_submitting_context():
+    async def scenario():
+        runner = GatedRunner()
+        queue = make_queue(runner)
+        request_id.set("request-1")
+        job_id = await queue.submit({"name": "a"}, None)
+        runner.finish("a")
+        await wait_finished(queue, job_id)
+        await queue.stop()
+        return runner.contexts
+
+    assert run(scenario()) == [None]
+
+
+def test_mark_interrupted_fails_unfinished_jobs():
+    store = JobStore(":memory:", 3600)
+    store.create("queued", {})
+    store.create("running", {})
+    store.update("running", status="running")
+    store.create("done", {})
+    store.update("done", status="succeeded")
+    assert store.mark_interrupted() == 2
+    assert store.get("queued")["status"] == "failed"
+    assert store.get("running")["error"] == "Interrupted by a server restart"
+    assert store.get("done")["status"] == "succeeded"
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from stage_graph import StageGraph
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_dependencies_are_passed_positionally_after_they_finish():
+    order = []
+
+    async def stage(name, value):
+        order.append(name)
+        return value
+
+    async def combine(a, b):
+        order.append("combine")
+        return a + b
+
+    graph = StageGraph(4)
+    graph.add("a", lambda: stage("a", 1))
+    graph.add("b", lambda: stage("b", 2))
+    graph.add("combine", combine, ["a", "b"])
+
+    results = run(graph.run())
+
+    assert results == {"a": 1, "b": 2, "combine": 3}
+    assert order.index("combine") > max(order.index("a"), order.index("b"))
+
+
+def test_global_and_pool_limits_are_respected():
+    active = {"all": 0, "translation": 0}
+    peak = {"all": 0, "translation": 0}
+
+    def stage(pool):
+        async def _stage():
+            for key in ("all", pool):
+                if key:
+                    active[key] += 1
+                    peak[key] = max(peak[key], active[key])
+            await asyncio.sleep(0.01)
+            for key in ("all", pool):
+                if key:
+                    active[key] -= 1
+        return _stage
+
+    graph = StageGraph(3, pools={"translation": 1})
+    for i in range(6):
+        graph.add(f"section:{i}", stage(None))
+        graph.add(f"section:{i}:kr", stage("translation"), pool="translation")
+
+    run(graph.run())
+
+    assert peak["all"] == 3
+    assert peak["translation"] == 1
+
+
+def test_on_complete_sees_each_stage_as_it_finishes():
+    seen = []
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    graph = StageGraph(2, on_complete=lambda name, result: seen.append((name, result)))
+    graph.add("slow", slow)
+    graph.add("fast", fast)
+
+    run(graph.run())
+
+    assert seen == [("fast", "fast"), ("slow", "slow")]
+
+
+def test_first_failure_cancels_the_rest_and_propagates():
+    cancelled = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def long_running():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("long")
+            raise
+
+    async def dependent(_):
+        return "never"
+
+    graph = StageGraph(4)
+    graph.add("fail", fail)
+    graph.add("long", long_running)
+    graph.add("dependent", dependent, ["fail"])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run(graph.run())
+    assert cancelled == ["long"]
+
+
+@pytest.mark.parametrize(
+    "name, deps, pool, message",
+    [
+        ("a", (), None, "Duplicate stage"),
+        ("b", ("missing",), None, "unknown stages"),
+        ("c", (), "nope", "unknown pool"),
+    ],
+)
+def test_add_rejects_invalid_stages(name, deps, pool, message):
+    async def stage(*_):
+        return None
+
+    graph = StageGraph(1)
+    graph.add("a", stage)
+    with pytest.raises(ValueError, match=message):
+        graph.add(name, stage, deps, pool=pool)
@@ -0,0 +1,123 @@
+import random
+from collections import Counter
+
+import pytest
+
+from csv_ingest import MISSING_TIMESTAMP, SECONDS_PER_DAY, CommitRecord, PRRecord, format_day
+from summary_aggregates import MERGED_PR_LIMIT, TOP_COMMIT_LIMIT, SummaryAggregate
+
+DAY = 20500 * SECONDS_PER_DAY
+
+
+def baseline_top_commits(commits):
+    """The original prepare_summary selection: stable sort by size, then dedupe by message prefix."""
+    commits_sorted = sorted(commits, key=lambda c: c.additions + c.deletions, reverse=True)
+    seen = set()
+    top_commits = []
+    for c in commits_sorted:
+        key = c.message[:50].lower()
+        if key not in seen:
+            seen.add(key)
+            top_commits.append(c)
+        if len(top_commits) >= 30:
+            break
+    return top_commits
+
+
+def baseline_merged_prs(prs):
+    return [p for p in prs if p.state == "MERGED"][:15]
+
+
+def make_commits(rng, count):
+    # Few distinct prefixes and sizes, so duplicates and ties are common
+    prefixes = [f"Fix module {i}" for i in range(60)]
+    commits = []
+    for i in range(count):
+        message = rng.choice(prefixes) + ("" if rng.random() < 0.5 else f" ({i})" * 20)
+        if rng.random() < 0.2:
+            message = message.upper()
+        epoch = MISSING_TIMESTAMP if rng.random() < 0.05 else DAY + rng.randint(0, 14 * SECONDS_PER_DAY)
+        commits.append(CommitRecord(
+            f"repo-{rng.randint(0, 4)}", message, f"{i:08x}", epoch,
+            rng.randint(0, 20), rng.randint(0, 20), rng.choice(["jake", "ale", "", "zena"]),
+        ))
+    return commits
+
+
+def make_prs(rng, count):
+    return [
+        PRRecord(f"repo-{i % 5}", f"PR {i}", str(i), rng.choice(["MERGED", "OPEN", "CLOSED"]), DAY, "jake")
+        for i in range(count)
+    ]
+
+
+def assert_matches_baseline(aggregate, commits, prs):
+    assert aggregate.top_commits() == baseline_top_commits(commits)
+    assert aggregate.merged_prs() == baseline_merged_prs(prs)
+    assert aggregate.commit_count == len(commits)
+    assert aggregate.pr_count == len(prs)
+    assert aggregate.merged_pr_count == sum(p.state == "MERGED" for p in prs)
+    assert aggregate.lines_added == sum(c.additions for c in commits)
+    assert aggregate.lines_deleted == sum(c.deletions for c in commits)
+    assert aggregate.contributors == {c.member_id for c in commits if c.member_id}
+    days = Counter(format_day(c.epoch // SECONDS_PER_DAY) for c in commits if c.epoch != MISSING_TIMESTAMP)
+    assert aggregate.daily_histogram() == dict(sorted(days.items()))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_pass_matches_sort_and_dedupe(seed):
+    rng = random.Random(seed)
+    commits = make_commits(rng, rng.randint(0, 600))
+    prs = make_prs(rng, rng.randint(0, 60))
+    assert_matches_baseline(SummaryAggregate.from_records(commits, prs), commits, prs)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_merged_shards_match_a_single_pass(seed):
+    rng = random.Random(seed)
+    commits = make_commits(rng, rng.randint(0, 600))
+    prs = make_prs(rng, rng.randint(0, 60))
+    cuts = sorted(rng.sample(range(len(commits) + 1), 3))
+    pr_cuts = sorted(rng.randint(0, len(prs)) for _ in range(3))
+    bounds = list(zip([0] + cuts, cuts + [len(commits)]))
+    pr_bounds = list(zip([0] + pr_cuts, pr_cuts + [len(prs)]))
+    shards = []
+    for (start, end), (pr_start, pr_end) in zip(bounds, pr_bounds):
+        shard = SummaryAggregate()
+        for order in range(start, end):
+            shard.add_commit(commits[order], order)
+        for order in range(pr_start, pr_end):
+            shard.add_pr(prs[order], order)
+        shards.append(shard)
+    rng.shuffle(shards)
+    assert_matches_baseline(SummaryAggregate.combine(shards), commits, prs)
+
+
+def test_compaction_bounds_the_candidates():
+    rng = random.Random(1)
+    aggregate = SummaryAggregate()
+    for order in range(5000):
+        commit = CommitRecord("r", f"unique message {order}", "", DAY, rng.randint(0, 1000), 0, "jake")
+        aggregate.add_commit(commit, order)
+        assert len(aggregate._top) <= 4 * TOP_COMMIT_LIMIT
+    assert len(aggregate.top_commits()) == TOP_COMMIT_LIMIT
+
+
+def test_merge_leaves_the_other_aggregate_untouched():
+    rng = random.Random(3)
+    commits = make_commits(rng, 100)
+    prs = make_prs(rng, 40)
+    other = SummaryAggregate.from_records(commits, prs, ["repo-x"])
+    before = (other.top_commits(), other.merged_prs(), other.commit_count, set(other.repos))
+    combined = SummaryAggregate().merge(other)
+    assert (other.top_commits(), other.merged_prs(), other.commit_count, set(other.repos)) == before
+    assert combined.repos == {"repo-x"}
+    assert len(combined.merged_prs()) <= MERGED_PR_LIMIT
+
+
+def test_empty():
+    aggregate = SummaryAggregate()
+    assert aggregate.is_empty()
+    assert aggregate.top_commits() == [] and aggregate.merged_prs() == []
+    aggregate.add_pr(PRRecord("r", "t", "1", "OPEN", DAY, "jake"), 0)
+    assert not aggregate.is_empty()
@@ -0,0 +1,111 @@
+import asyncio
+import types
+
+import pytest
+
+import main
+from llm_governor import LLMGovernor
+
+MODEL = "gpt-5.2-pro"
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class FakeTokamak:
+    """OpenAI-style client whose responses endpoint fails with ``responses_error`` (if set)."""
+
+    def __init__(self, responses_error=None):
+        self.responses_error = responses_error
+        self.calls = []
+        self.responses = types.SimpleNamespace(create=self._responses)
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._chat))
+
+    async def _responses(self, **kwargs):
+        self.calls.append("responses")
+        if self.responses_error is not None:
+            raise self.responses_error
+        return types.SimpleNamespace(output_text="from responses")
+
+    async def _chat(self, **kwargs):
+        self.calls.append("chat")
+        message = types.SimpleNamespace(content="from chat")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def tokamak(monkeypatch):
+    monkeypatch.setattr(main, "ENV_PATH", None)
+    monkeypatch.setenv("TOKAMAK_API_KEY", "test-key")
+    monkeypatch.setattr(main, "_tokamak_api_capabilities", {})
+    monkeypatch.setattr(main, "llm_governor", LLMGovernor(8, 4, adaptive_max=None, circuit_failures=1))
+
+    def install(client):
+        monkeypatch.setattr(main, "get_openai_client", lambda *args, **kwargs: client)
+        return client
+
+    return install
+
+
+def generate():
+    return asyncio.run(main.generate_with_tokamak("prompt", 100, MODEL))
+
+
+def test_only_gpt_5_2_models_try_the_responses_api(tokamak):
+    assert main.uses_responses_api(MODEL)
+    assert not main.uses_responses_api("deepseek-v3.2")
+
+
+def test_a_model_that_answers_on_responses_keeps_using_it(tokamak):
+    client = tokamak(FakeTokamak())
+    assert generate() == "from responses"
+    assert generate() == "from responses"
+    assert client.calls == ["responses", "responses"]
+    assert main._tokamak_api_capabilities[MODEL][0] == main.TOKAMAK_RESPONSES_API
+
+
+def test_a_model_that_rejects_responses_goes_straight_to_chat(tokamak):
+    client = tokamak(FakeTokamak(BadRequest("unsupported")))
+    assert generate() == "from chat"
+    assert generate() == "from chat"
+    assert client.calls == ["responses", "chat", "chat"]
+    assert not main.uses_responses_api(MODEL)
+
+
+def test_responses_is_probed_again_after_the_ttl(tokamak, monkeypatch):
+    monkeypatch.setenv("TOKAMAK_API_PROBE_TTL", "60")
+    main.record_tokamak_api(MODEL, main.TOKAMAK_CHAT_API)
+    assert not main.uses_responses_api(MODEL)
+    recorded_at = main._tokamak_api_capabilities[MODEL][1]
+    main._tokamak_api_capabilities[MODEL] = (main.TOKAMAK_CHAT_API, recorded_at - 61)
+    assert main.uses_responses_api(MODEL)
+    assert MODEL not in main._tokamak_api_capabilities
+
+
+def test_a_responses_outage_falls_back_to_chat(tokamak):
+    client = tokamak(FakeTokamak(ServerError("gateway down")))
+    errors = []
+    assert asyncio.run(main.generate_with_tokamak("prompt", 100, MODEL, errors=errors)) == "from chat"
+    assert client.calls == ["responses", "chat"]
+    assert "gateway down" in errors[0]
+    assert main.llm_governor.circuit_open("tokamak", MODEL, main.TOKAMAK_RESPONSES_API)
+    assert not main.llm_governor.circuit_open("tokamak", MODEL)
+
+
+def test_nothing_is_returned_while_the_model_circuit_is_open(tokamak):
+    client = tokamak(FakeTokamak(ServerError("gateway down")))
+
+    async def fail_chat(**kwargs):
+        client.calls.append("chat")
+        raise ServerError("chat down too")
+
+    client.chat.completions.create = fail_chat
+    assert generate() is None
+    calls = len(client.calls)
+    assert generate() is None
+    assert len(client.calls) == calls